@@ -0,0 +1,578 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import asyncio
+import datetime
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import Any, Callable, List, Optional, TypeVar
+from urllib.parse import urljoin
+
+from requests import Request, Response
+from requests.cookies import MockRequest, MockResponse, get_cookie_header
+from requests.exceptions import TooManyRedirects
+from requests.structures import CaseInsensitiveDict
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.entity.order import Order
+from amazonorders.entity.transaction import Transaction
+from amazonorders.exception import AmazonOrdersError, AmazonOrdersNotFoundError
+from amazonorders.orders import AmazonOrders, _get_next_page
+from amazonorders.session import AmazonSession, AmazonSessionResponse, IODefault
+from amazonorders.transactions import _parse_transaction_form_tag
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncAmazonSession:
+    """
+    An :mod:`asyncio` counterpart to :class:`~amazonorders.session.AmazonSession`. Requests are executed
+    concurrently on the running event loop (up to the ``max_workers`` config value at once) with ``aiohttp``, which
+    must be installed with ``pip install amazon-orders[async]``. CPU-bound work, like parsing, should be passed to
+    :func:`run_in_executor` so it does not block the event loop.
+
+    Authentication and cookie persistence are delegated to an underlying
+    :class:`~amazonorders.session.AmazonSession`, so both share the same cookies, and a session authenticated by
+    either can be used by the other.
+    """
+
+    def __init__(self,
+                 username: Optional[str],
+                 password: Optional[str],
+                 debug: bool = False,
+                 io: IODefault = IODefault(),
+                 config: Optional[AmazonOrdersConfig] = None,
+                 auth_forms: Optional[List] = None,
+                 amazon_session: Optional[AmazonSession] = None) -> None:
+        if aiohttp is None:
+            raise AmazonOrdersError("aiohttp is required to use AsyncAmazonSession, "
+                                    "install it with `pip install amazon-orders[async]`.")  # pragma: no cover
+
+        if not amazon_session:
+            amazon_session = AmazonSession(username,
+                                           password,
+                                           debug=debug,
+                                           io=io,
+                                           config=config,
+                                           auth_forms=auth_forms)
+
+        #: The underlying AmazonSession, used for authentication and cookie persistence.
+        self.amazon_session: AmazonSession = amazon_session
+        #: The AmazonOrdersConfig to use.
+        self.config: AmazonOrdersConfig = amazon_session.config
+        #: The executor that CPU-bound work is offloaded to.
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+
+        self._client_session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncAmazonSession":
+        return self
+
+    async def __aexit__(self,
+                        *args: Any) -> None:
+        await self.close()
+
+    @property
+    def is_authenticated(self) -> bool:
+        """
+        If :func:`login` has been executed and successfully logged in the session.
+        """
+        return self.amazon_session.is_authenticated
+
+    @is_authenticated.setter
+    def is_authenticated(self,
+                         value: bool) -> None:
+        self.amazon_session.is_authenticated = value
+
+    async def run_in_executor(self,
+                              func: Callable[..., T],
+                              *args: Any) -> T:
+        """
+        Run the given function in ``executor``, so CPU-bound work does not block the event loop.
+
+        :param func: The function to run.
+        :param args: The ``args`` will be passed to ``func``.
+        :return: The return value from ``func``.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      **kwargs: Any) -> AmazonSessionResponse:
+        """
+        Execute the request against Amazon with base headers, persisting response cookies. The returned response
+        is scoped to this request, and is parsed on first access of its ``parsed`` property, which should be done
+        with :func:`run_in_executor`.
+
+        As with :func:`~amazonorders.session.AmazonSession.scoped_request`, GET requests are served from the
+        session's ``response_cache`` when possible, and when ``debug`` is enabled, pages are captured with its
+        ``page_capture``. If ``session_freshness`` is set in the config and the request is redirected to sign-in,
+        the session is logged in again, and the request is retried once.
+
+        :param method: The request method to execute.
+        :param url: The URL to execute ``method`` on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`aiohttp.ClientSession.request`.
+        :return: The response from the executed request.
+        """
+        if "headers" not in kwargs:
+            kwargs["headers"] = {}
+        kwargs["headers"].update(self.config.constants.BASE_HEADERS)
+
+        transport = self.amazon_session.transport
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(sock_connect=transport.timeout[0],
+                                                           sock_read=transport.timeout[1]))
+
+        login_count = self.amazon_session._login_count
+        auth_cookies = self.amazon_session._get_auth_cookies()
+
+        response = await self._request_cached(method, url, **kwargs)
+
+        if self.amazon_session._should_revalidate(url, response):
+            await self.run_in_executor(self.amazon_session._revalidate, login_count, auth_cookies)
+
+            response = await self._request_cached(method, url, **kwargs)
+
+        return AmazonSessionResponse(response, self.config.bs4_parser)
+
+    async def get(self,
+                  url: str,
+                  **kwargs: Any) -> AmazonSessionResponse:
+        """
+        Perform a GET request.
+
+        :param url: The URL to GET on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AsyncAmazonSession.request`.
+        :return: The response from the executed GET request.
+        """
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self,
+                   url: str,
+                   **kwargs: Any) -> AmazonSessionResponse:
+        """
+        Perform a POST request.
+
+        :param url: The URL to POST on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AsyncAmazonSession.request`.
+        :return: The response from the executed POST request.
+        """
+        return await self.request("POST", url, **kwargs)
+
+    async def visit(self,
+                    url: str,
+                    **kwargs: Any) -> Optional[AmazonSessionResponse]:
+        """
+        Perform a GET request of a landing page, unless it was already visited within ``session_freshness``. See
+        :func:`~amazonorders.session.AmazonSession.visit`.
+
+        :param url: The URL of the landing page to GET on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AsyncAmazonSession.request`.
+        :return: The response from the executed GET request, or ``None`` if it was skipped.
+        """
+        session_state = self.amazon_session.session_state
+        if session_state.was_visited(url):
+            logger.debug(f"{url} was already visited, skipping")
+
+            return None
+
+        page_response = await self.get(url, **kwargs)
+
+        if page_response.response.ok and not self.amazon_session._is_sign_in_redirect(url, page_response.response):
+            session_state.mark_visited(url)
+
+        return page_response
+
+    def auth_cookies_stored(self) -> bool:
+        return self.amazon_session.auth_cookies_stored()
+
+    async def login(self) -> None:
+        """
+        Execute an Amazon login process with :func:`~amazonorders.session.AmazonSession.login`. The auth flow
+        may prompt for input, so it is run in ``executor``.
+        """
+        await self.run_in_executor(self.amazon_session.login)
+
+    async def logout(self) -> None:
+        """
+        Logout and close the existing Amazon session and clear cookies.
+        """
+        await self.close()
+        await self.run_in_executor(self.amazon_session.logout)
+
+    async def close(self) -> None:
+        """
+        Close the underlying ``aiohttp`` session, and shut down ``executor``, waiting for any work running in it to
+        complete.
+        """
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+        self._semaphore = None
+
+        # Replaced, like the aiohttp session, so the session can still be used (for instance, to login again) after
+        # it's closed, and its threads are only started if it is
+        executor = self.executor
+        self.executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def _request_cached(self,
+                              method: str,
+                              url: str,
+                              **kwargs: Any) -> Response:
+        # The same response cache and page capture as the underlying AmazonSession's requests
+        amazon_session = self.amazon_session
+        url_class = amazon_session._get_url_class(url) if method == "GET" else None
+        cache = amazon_session.response_cache \
+            if amazon_session.response_cache and amazon_session.response_cache.is_cacheable(url_class) else None
+        if cache and url_class:
+            cached_response = await self.run_in_executor(cache.get, url, url_class, amazon_session.username or "")
+            if cached_response is not None:
+                return cached_response
+
+        response = await self._request_with_retries(method, url, **kwargs)
+
+        # Only cache the page that was requested, not, for instance, a redirect to sign-in
+        if cache and response.status_code == 200 and amazon_session._get_url_class(response.url) == url_class:
+            await self.run_in_executor(cache.put, url, response, amazon_session.username or "")
+
+        if amazon_session.debug:
+            amazon_session.page_capture.capture(response.url, response.text)
+
+        return response
+
+    async def _request_with_retries(self,
+                                    method: str,
+                                    url: str,
+                                    **kwargs: Any) -> Response:
+        logger.debug(f"{method} request to {url}")
+
+        transport = self.amazon_session.transport
+
+        # The same timeouts, retries, and rate limiting as the underlying AmazonSession's transport
+        attempt = 0
+        while True:
+            if transport.rate_limiter:
+                await asyncio.sleep(transport.rate_limiter.reserve())
+
+            start = time.monotonic()
+            try:
+                response = await self._request_once(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not transport.should_retry(method, attempt):
+                    raise
+
+                delay = transport.get_retry_delay(attempt)
+            else:
+                if transport.rate_limiter:
+                    transport.rate_limiter.record(response.status_code, time.monotonic() - start)
+
+                if response.status_code < 500 or not transport.should_retry(method, attempt):
+                    break
+
+                delay = transport.get_retry_delay(attempt, response.headers.get("Retry-After"))
+
+            logger.debug(f"{method} request to {url} failed, retrying in {delay:.2f}s")
+
+            transport._count_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        # Saving may merge in cookies from and write to the cookie jar file, so it shouldn't block the event loop
+        await self.run_in_executor(self.amazon_session.cookie_store.save, self.amazon_session.session.cookies)
+
+        logger.debug(f"Response: {response.url} - {response.status_code}")
+
+        return response
+
+    async def _request_once(self,
+                            method: str,
+                            url: str,
+                            **kwargs: Any) -> Response:
+        client_session = self._get_client_session()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_workers)
+
+        cookie_jar = self.amazon_session.session.cookies
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        headers = kwargs.pop("headers", {})
+        history: List[Response] = []
+
+        async with self._semaphore:
+            # Redirects are followed here, rather than by aiohttp, so that the cookies sent with, and set by, each
+            # hop are matched by the underlying session's cookie jar, with the same domain, path, expiry, and secure
+            # rules as its own requests
+            while True:
+                request = Request(method, url, headers=headers)
+                hop_headers = dict(headers)
+                cookie_header = get_cookie_header(cookie_jar, request)
+                if cookie_header:
+                    hop_headers["Cookie"] = cookie_header
+
+                async with client_session.request(method,
+                                                  url,
+                                                  headers=hop_headers,
+                                                  allow_redirects=False,
+                                                  **kwargs) as aiohttp_response:
+                    content = await aiohttp_response.read()
+
+                    set_cookie_headers = Message()
+                    for set_cookie in aiohttp_response.headers.getall("Set-Cookie", []):
+                        set_cookie_headers["Set-Cookie"] = set_cookie
+                    # The same adapters requests uses to extract cookies from its responses
+                    cookie_jar.extract_cookies(MockResponse(set_cookie_headers),  # type: ignore[arg-type]
+                                               MockRequest(request))  # type: ignore[arg-type]
+
+                    response = Response()
+                    response._content = content
+                    response.status_code = aiohttp_response.status
+                    response.url = str(aiohttp_response.url)
+                    response.headers = CaseInsensitiveDict(aiohttp_response.headers)
+                    response.encoding = aiohttp_response.get_encoding()
+
+                location = response.headers.get("Location")
+                if not allow_redirects or not response.is_redirect or not location:
+                    break
+
+                history.append(response)
+                if len(history) > self.amazon_session.session.max_redirects:
+                    raise TooManyRedirects(f"Exceeded {self.amazon_session.session.max_redirects} redirects.",
+                                           response=response)
+
+                url = urljoin(url, location)
+                # Like requests, a redirected POST is followed with a GET
+                if response.status_code == 303 or (response.status_code in (301, 302) and method == "POST"):
+                    method = "GET"
+                    kwargs.pop("data", None)
+                    kwargs.pop("json", None)
+
+        response.history = history
+
+        return response
+
+    def _get_client_session(self) -> "aiohttp.ClientSession":
+        if self._client_session is None or self._client_session.closed:
+            # Cookies are managed by the underlying AmazonSession's cookie jar, so it remains the source of truth
+            self._client_session = aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar())
+        return self._client_session
+
+
+class AsyncAmazonOrders:
+    """
+    An :mod:`asyncio` counterpart to :class:`~amazonorders.orders.AmazonOrders`. Using an authenticated
+    :class:`AsyncAmazonSession`, can be used to query Amazon for Order details and history.
+    """
+
+    def __init__(self,
+                 amazon_session: AsyncAmazonSession,
+                 debug: Optional[bool] = None,
+                 config: Optional[AmazonOrdersConfig] = None) -> None:
+        if not debug:
+            debug = amazon_session.amazon_session.debug
+        if not config:
+            config = amazon_session.config
+
+        #: The AsyncAmazonSession to use for requests.
+        self.amazon_session: AsyncAmazonSession = amazon_session
+        #: The AmazonOrdersConfig to use.
+        self.config: AmazonOrdersConfig = config
+
+        #: Set logger ``DEBUG`` and send output to ``stderr``.
+        self.debug: bool = debug
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+
+        self._amazon_orders = AmazonOrders(amazon_session.amazon_session, debug=debug, config=config)
+
+    async def get_order_history(self,
+                                year: int = datetime.date.today().year,
+                                start_index: Optional[int] = None,
+                                full_details: bool = False,
+                                detach: Optional[bool] = None) -> List[Order]:
+        """
+        Get the Amazon order history for the given year. With ``full_details``, each page's details requests are
+        executed concurrently with each other and with fetching the next page.
+
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it.
+        :param detach: Detach each Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: A list of the requested Orders.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AsyncAmazonSession.login() to authenticate first.")
+
+        if detach is None:
+            detach = self.config.detach_entities
+
+        await self.amazon_session.visit(self.config.constants.ORDER_HISTORY_LANDING_URL)
+
+        optional_start_index = f"&startIndex={start_index}" if start_index else ""
+        next_page: Optional[str] = (
+            "{url}?{query_param}=year-{year}{optional_start_index}"
+        ).format(
+            url=self.config.constants.ORDER_HISTORY_URL,
+            query_param=self.config.constants.HISTORY_FILTER_QUERY_PARAM,
+            year=year,
+            optional_start_index=optional_start_index
+        )
+
+        order_tasks = []
+        while next_page:
+            page_response = await self.amazon_session.get(next_page)
+            response_parsed = await self.amazon_session.run_in_executor(self._amazon_orders._parse_history_page,
+                                                                        page_response)
+
+            orders = await self.amazon_session.run_in_executor(
+                lambda: [self.config.order_cls(order_tag, self.config)
+                         for order_tag in util.select(response_parsed,
+                                                      self.config.selectors.ORDER_HISTORY_ENTITY_SELECTOR,
+                                                      self.config.selector_stats)])
+            for order in orders:
+                order_tasks.append(asyncio.ensure_future(self._get_full_details(order, detach) if full_details
+                                                         else self._completed(order, detach)))
+
+            next_page = _get_next_page(response_parsed, start_index, self.config)
+
+        return [order for order in await asyncio.gather(*order_tasks) if order]
+
+    async def get_order(self,
+                        order_id: str,
+                        detach: Optional[bool] = None) -> Order:
+        """
+        Get the Amazon order represented by the ID.
+
+        :param order_id: The Amazon Order ID to lookup.
+        :param detach: Detach the Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the page it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: The requested Order.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AsyncAmazonSession.login() to authenticate first.")
+
+        order_details_response = await self.amazon_session.get(
+            f"{self.config.constants.ORDER_DETAILS_URL}?orderID={order_id}")
+        if not order_details_response.response.url.startswith(self.config.constants.ORDER_DETAILS_URL):
+            raise AmazonOrdersNotFoundError(f"Amazon redirected, which likely means Order {order_id} was not found.")
+
+        return await self.amazon_session.run_in_executor(
+            self._build_order_details, order_details_response, None,
+            self.config.detach_entities if detach is None else detach)
+
+    async def _get_full_details(self,
+                                order: Order,
+                                detach: bool) -> Optional[Order]:
+        if not order.order_details_link:
+            logger.warning(f"order_details_link for Order {order.order_number} did not populate, "
+                           f"cannot read full details.")
+
+            return None
+
+        order_details_response = await self.amazon_session.get(order.order_details_link)
+
+        return await self.amazon_session.run_in_executor(self._build_order_details, order_details_response, order,
+                                                         detach)
+
+    async def _completed(self,
+                         order: Order,
+                         detach: bool) -> Order:
+        if detach:
+            await self.amazon_session.run_in_executor(order.detach)
+
+        return order
+
+    def _build_order_details(self,
+                             order_details_response: AmazonSessionResponse,
+                             clone: Optional[Order] = None,
+                             detach: bool = False) -> Order:
+        order_details_tag = util.select_one(order_details_response.parsed,
+                                            self.config.selectors.ORDER_DETAILS_ENTITY_SELECTOR,
+                                            self.config.selector_stats)
+        order: Order = self.config.order_cls(order_details_tag, self.config, full_details=True, clone=clone)
+
+        if detach:
+            order.detach()
+
+        return order
+
+
+class AsyncAmazonTransactions:
+    """
+    An :mod:`asyncio` counterpart to :class:`~amazonorders.transactions.AmazonTransactions`. Using an
+    authenticated :class:`AsyncAmazonSession`, can be used to query Amazon for Transaction details and history.
+    """
+
+    def __init__(self,
+                 amazon_session: AsyncAmazonSession,
+                 debug: Optional[bool] = None,
+                 config: Optional[AmazonOrdersConfig] = None) -> None:
+        if not debug:
+            debug = amazon_session.amazon_session.debug
+        if not config:
+            config = amazon_session.config
+
+        #: The AsyncAmazonSession to use for requests.
+        self.amazon_session: AsyncAmazonSession = amazon_session
+        #: The AmazonOrdersConfig to use.
+        self.config: AmazonOrdersConfig = config
+
+        #: Set logger ``DEBUG`` and send output to ``stderr``.
+        self.debug: bool = debug
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+
+    async def get_transactions(self,
+                               days: int = 365,
+                               detach: Optional[bool] = None) -> List[Transaction]:
+        """
+        Get the Amazon Transactions for the given number of days.
+
+        :param days: The number of days worth of transactions to get.
+        :param detach: Detach each Transaction (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: A list of the requested Transactions.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AsyncAmazonSession.login() to authenticate first.")
+
+        min_date = datetime.date.today() - datetime.timedelta(days=days)
+        if detach is None:
+            detach = self.config.detach_entities
+
+        page_response = await self.amazon_session.get(self.config.constants.TRANSACTION_HISTORY_LANDING_URL)
+
+        transactions: List[Transaction] = []
+        while True:
+            form_tag = await self.amazon_session.run_in_executor(
+                lambda: util.select_one(page_response.parsed,
+                                        self.config.selectors.TRANSACTION_HISTORY_FORM_SELECTOR))
+            if not form_tag:
+                return transactions
+
+            loaded_transactions, next_page_post_url, next_page_post_data = (
+                await self.amazon_session.run_in_executor(_parse_transaction_form_tag, form_tag, self.config,
+                                                          detach)
+            )
+            for transaction in loaded_transactions:
+                if transaction.completed_date >= min_date:
+                    transactions.append(transaction)
+                else:
+                    return transactions
+
+            if next_page_post_url is None:
+                return transactions
+
+            page_response = await self.amazon_session.post(next_page_post_url, data=next_page_post_data)
@@ -0,0 +1,193 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from amazonorders import util
+
+logger = logging.getLogger(__name__)
+
+#: Query parameters that Amazon adds for tracking, which don't change the page that is returned.
+IGNORED_QUERY_PARAMS = {"ref", "ref_", "ie", "_encoding"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize the given URL so that different links to the same page share a cache key. The scheme and host are
+    lowercased, the fragment, tracking query parameters, and ``/ref=`` path segments are dropped, and the remaining
+    query parameters are sorted.
+
+    :param url: The URL to normalize.
+    :return: The normalized URL.
+    """
+    split = urlsplit(url)
+    path = "/".join(s for s in split.path.split("/") if not s.startswith("ref=")) or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(split.query, keep_blank_values=True)
+                             if k not in IGNORED_QUERY_PARAMS))
+    return urlunsplit((split.scheme.lower(), split.netloc.lower(), path, query, ""))
+
+
+class ResponseCache:
+    """
+    An on-disk cache of GET responses, keyed by normalized URL (see :func:`normalize_url`). Each URL belongs to a
+    class (for example, ``order_details``), and each class has its own TTL in ``ttls``, so pages that rarely change
+    can be cached much longer than those that do. A URL class without a TTL (or with a TTL of ``0``) is not cached.
+
+    When the cache grows beyond ``max_size`` bytes, the least recently used responses are evicted.
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 ttls: Dict[str, int],
+                 max_size: int) -> None:
+        #: The directory where responses are cached.
+        self.cache_dir: str = cache_dir
+        #: The number of seconds a response is cached for, keyed by URL class.
+        self.ttls: Dict[str, int] = ttls
+        #: The maximum total size, in bytes, of cached responses.
+        self.max_size: int = max_size
+        #: The number of lookups that were served from the cache.
+        self.hits: int = 0
+        #: The number of lookups that were not found in the cache, or had expired.
+        self.misses: int = 0
+
+        self._lock = threading.Lock()
+        # Cache filenames to their size, ordered least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        entry_paths = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith(".json")]
+        for entry_path in sorted(entry_paths, key=os.path.getmtime):
+            self._entries[os.path.basename(entry_path)] = os.path.getsize(entry_path)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size, in bytes, of cached responses.
+        """
+        with self._lock:
+            return sum(self._entries.values())
+
+    def is_cacheable(self,
+                     url_class: Optional[str]) -> bool:
+        """
+        :param url_class: The URL class to check.
+        :return: ``True`` if responses of the given URL class are cached.
+        """
+        return url_class is not None and self.ttls.get(url_class, 0) > 0
+
+    def get(self,
+            url: str,
+            url_class: str,
+            namespace: str = "") -> Optional[Response]:
+        """
+        Get the cached response for the given URL, if one exists that has not expired.
+
+        :param url: The URL that was requested.
+        :param url_class: The URL class, which determines the TTL.
+        :param namespace: Scopes the cache key, for example to an account.
+        :return: The cached response, or ``None`` on a miss.
+        """
+        filename = self._get_filename(url, namespace)
+        entry_path = os.path.join(self.cache_dir, filename)
+
+        with self._lock:
+            entry = None
+            if filename in self._entries:
+                try:
+                    with open(entry_path, "r", encoding="utf-8") as f:
+                        entry = json.loads(f.read())
+                except (OSError, ValueError):
+                    logger.debug(f"Cached response {entry_path} could not be read")
+
+            if entry is None or time.time() - entry["cached_at"] > self.ttls.get(url_class, 0):
+                if filename in self._entries:
+                    self._remove(filename)
+                self.misses += 1
+
+                return None
+
+            self._entries.move_to_end(filename)
+            os.utime(entry_path)
+            self.hits += 1
+
+        logger.debug(f"Cache hit for {url}")
+
+        response = Response()
+        response.url = entry["url"]
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = "utf-8"
+        response._content = entry["text"].encode("utf-8")
+
+        return response
+
+    def put(self,
+            url: str,
+            response: Response,
+            namespace: str = "") -> None:
+        """
+        Cache the given response for the given URL, evicting the least recently used responses if the cache has
+        grown beyond ``max_size``.
+
+        :param url: The URL that was requested.
+        :param response: The response to cache.
+        :param namespace: Scopes the cache key, for example to an account.
+        """
+        filename = self._get_filename(url, namespace)
+        data = json.dumps({
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "text": response.text,
+            "cached_at": time.time()
+        })
+
+        with self._lock:
+            util.atomic_write(os.path.join(self.cache_dir, filename), data, temp_prefix=".response-")
+
+            self._entries[filename] = os.path.getsize(os.path.join(self.cache_dir, filename))
+            self._entries.move_to_end(filename)
+
+            total_size = sum(self._entries.values())
+            while total_size > self.max_size and len(self._entries) > 1:
+                evicted_filename = next(iter(self._entries))
+                total_size -= self._entries[evicted_filename]
+                self._remove(evicted_filename)
+
+                logger.debug(f"Evicted {evicted_filename} from the cache")
+
+    def clear(self) -> None:
+        """
+        Delete all cached responses.
+        """
+        with self._lock:
+            for filename in list(self._entries):
+                self._remove(filename)
+
+    def _remove(self,
+                filename: str) -> None:
+        del self._entries[filename]
+
+        entry_path = os.path.join(self.cache_dir, filename)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+
+    def _get_filename(self,
+                      url: str,
+                      namespace: str) -> str:
+        key = f"{namespace}:{normalize_url(url)}"
+        return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
@@ -0,0 +1,118 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _solve_image(image: bytes) -> Optional[str]:
+    # Imported here, rather than at the top of the module, so the Captcha stack (including PIL) is only loaded when
+    # a Captcha is actually encountered
+    from amazoncaptcha import AmazonCaptcha
+
+    solution = AmazonCaptcha(BytesIO(image)).solve()
+    if not solution or solution.lower() == "not solved":
+        return None
+    return solution
+
+
+class CaptchaSolver:
+    """
+    Auto-solves Captcha images with ``amazoncaptcha``. Solving is CPU-bound, so it's done in ``max_processes``
+    worker processes (started when the first Captcha is solved), so many sessions authenticating at once, like those
+    in an :class:`~amazonorders.pool.AmazonSessionPool`, don't serialize on it. If ``max_processes`` is ``0``,
+    Captchas are solved in the calling thread instead.
+
+    Workers are started with the ``mp_context`` start method, which defaults to ``"spawn"``, since forking a process
+    that's running other threads (like a session's request workers) can deadlock the child.
+
+    Solutions are cached by the hash of the image, up to ``cache_size`` of them, so an image that's seen again isn't
+    solved again. Images that couldn't be solved aren't cached.
+    """
+
+    def __init__(self,
+                 max_processes: int = 1,
+                 cache_size: int = 128,
+                 mp_context: Optional[str] = "spawn") -> None:
+        #: The number of worker processes, ``0`` to solve in the calling thread.
+        self.max_processes: int = max_processes
+        #: The maximum number of solutions to cache.
+        self.cache_size: int = cache_size
+        #: The name of the :mod:`multiprocessing` start method to use for the workers, ``None`` for the platform's
+        #: default.
+        self.mp_context: Optional[str] = mp_context
+        #: The number of images solved (or attempted), not counting those served from the cache.
+        self.solve_count: int = 0
+        #: The number of images whose solution was served from the cache.
+        self.cache_hit_count: int = 0
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "CaptchaSolver":
+        return self
+
+    def __exit__(self,
+                 *args: Any) -> None:
+        self.close()
+
+    def solve(self,
+              image: bytes) -> Optional[str]:
+        """
+        Solve the given Captcha image, blocking until it's solved.
+
+        :param image: The content of the Captcha image.
+        :return: The solution, or ``None`` if the image couldn't be auto-solved.
+        """
+        image_hash = hashlib.sha1(image).digest()
+
+        with self._lock:
+            if image_hash in self._cache:
+                self._cache.move_to_end(image_hash)
+                self.cache_hit_count += 1
+
+                return self._cache[image_hash]
+
+            self.solve_count += 1
+
+        if self.max_processes > 0:
+            solution = self._get_executor().submit(_solve_image, image).result()
+        else:
+            solution = _solve_image(image)
+
+        logger.debug(f"Captcha solved as {solution}")
+
+        if solution is not None:
+            with self._lock:
+                self._cache[image_hash] = solution
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return solution
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes, if any were started.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_processes,
+                                                     mp_context=multiprocessing.get_context(self.mp_context))
+            return self._executor
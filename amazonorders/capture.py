@@ -0,0 +1,197 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import atexit
+import gzip
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class PageCapture:
+    """
+    Captures the pages of responses to files in ``output_dir``, for debugging. Each page is written to a file named
+    for the last segment of its URL's path, followed by the number of times that page has been captured (for
+    example, ``order-details_0.html``).
+
+    Pages are written on a background thread, so capturing doesn't slow requests down. Call :func:`flush` to wait
+    for pending pages to be written, which is also done when the interpreter exits.
+
+    If ``compress`` is ``True``, pages are gzipped (and given a ``.html.gz`` extension). If ``dedupe`` is ``True``,
+    a page that is byte-identical to one already captured is skipped (which leaves gaps in the sequence of pages
+    captured, so it's off by default). If ``max_size`` is set, once the captured
+    files exceed that many bytes, the oldest are deleted, so only the most recent pages are kept.
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 compress: bool = False,
+                 dedupe: bool = False,
+                 max_size: Optional[int] = None) -> None:
+        #: The directory pages are written to.
+        self.output_dir: str = output_dir
+        #: If pages should be gzipped.
+        self.compress: bool = compress
+        #: If pages byte-identical to a page already captured should be skipped.
+        self.dedupe: bool = dedupe
+        #: The maximum number of bytes of captured files to keep, ``None`` for no limit.
+        self.max_size: Optional[int] = max_size
+        #: The number of pages written.
+        self.write_count: int = 0
+        #: The number of pages skipped, since they were byte-identical to a page already captured.
+        self.duplicate_count: int = 0
+        #: The number of files deleted to keep captures under ``max_size``.
+        self.evicted_count: int = 0
+
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+        # Only used on the writer thread. The next index of each page name, seeded from the files already in
+        # ``output_dir`` on the first write, so a file is never overwritten without a stat per capture.
+        self._counters: Optional[Dict[str, int]] = None
+        # The path, size, and hash of each captured file, oldest first, and the path captured for each hash
+        self._captures: Deque[Tuple[str, int, bytes]] = deque()
+        self._hashes: Dict[bytes, str] = {}
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes of captured files currently kept.
+        """
+        return self._size
+
+    def capture(self,
+                url: str,
+                content: str) -> None:
+        """
+        Queue the given page to be written.
+
+        :param url: The URL of the page, which the file is named for.
+        :param content: The content of the page.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="amazon-orders-page-capture", daemon=True)
+                self._thread.start()
+
+                atexit.register(self.flush)
+
+        self._queue.put((url, content))
+
+    def flush(self) -> None:
+        """
+        Wait for all queued pages to be written.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Write all queued pages, then stop the background thread.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                self._write(*item)
+            except Exception:
+                logger.warning("Page could not be captured", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _write(self,
+               url: str,
+               content: str) -> None:
+        data = content.encode("utf-8")
+
+        content_hash = b""
+        if self.dedupe:
+            content_hash = hashlib.sha1(data).digest()
+            if content_hash in self._hashes:
+                self.duplicate_count += 1
+
+                logger.debug(f"Response {url} is identical to {self._hashes[content_hash]}, not captured")
+
+                return
+
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+
+        path = os.path.join(self.output_dir, self._get_file_name(url))
+        with open(path, "wb") as f:
+            f.write(data)
+
+        self.write_count += 1
+        self._size += len(data)
+        self._captures.append((path, len(data), content_hash))
+        if content_hash:
+            self._hashes[content_hash] = path
+
+        logger.debug(f"Response written to file: {path}")
+
+        if self.max_size is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        # Always keep the most recent capture, even if it alone exceeds ``max_size``
+        while self._size > (self.max_size or 0) and len(self._captures) > 1:
+            path, size, content_hash = self._captures.popleft()
+            self._size -= size
+            self._hashes.pop(content_hash, None)
+
+            try:
+                os.remove(path)
+            except OSError:
+                logger.debug(f"Capture {path} could not be deleted", exc_info=True)
+
+            self.evicted_count += 1
+
+    def _get_file_name(self,
+                       url: str) -> str:
+        page_name = os.path.splitext(os.path.basename(urlparse(url).path))[0]
+        if not page_name:
+            page_name = "index"
+
+        if self._counters is None:
+            self._counters = self._load_counters()
+
+        index = self._counters.get(page_name, 0)
+        self._counters[page_name] = index + 1
+
+        extension = ".html.gz" if self.compress else ".html"
+        return f"{page_name}_{index}{extension}"
+
+    def _load_counters(self) -> Dict[str, int]:
+        counters: Dict[str, int] = {}
+        if not os.path.isdir(self.output_dir):
+            return counters
+
+        file_name_pattern = re.compile(r"^(.+)_(\d+)\.html(?:\.gz)?$")
+        for file_name in os.listdir(self.output_dir):
+            match = file_name_pattern.match(file_name)
+            if match:
+                page_name, index = match.group(1), int(match.group(2))
+                counters[page_name] = max(counters.get(page_name, 0), index + 1)
+
+        return counters
@@ -19,6 +19,7 @@ from amazonorders.entity.transaction import Transaction
 from amazonorders.exception import AmazonOrdersError, AmazonOrdersAuthError
 from amazonorders.orders import AmazonOrders
 from amazonorders.session import AmazonSession, IODefault
+from amazonorders.store import OrderStore
 from amazonorders.transactions import AmazonTransactions
 
 logger = logging.getLogger("amazonorders")
@@ -110,6 +111,9 @@ def amazon_orders_cli(ctx: Context,
 @click.pass_context
 @click.option("--year", default=datetime.date.today().year,
               help="The year for which to get order history, defaults to the current year.")
+@click.option("--year-range", nargs=2, type=int,
+              help="The start and end year (inclusive) for which to get order history, fetched concurrently. "
+                   "Overrides --year.")
 @click.option("--start-index",
               help="Retrieve the single page of history at the given index.")
 @click.option("--full-details", is_flag=True, default=False,
@@ -125,15 +129,19 @@ def history(ctx: Context,
         _authenticate(amazon_session)
 
         year = kwargs["year"]
+        year_range = kwargs["year_range"]
         start_index = kwargs["start_index"]
         full_details = kwargs["full_details"]
 
+        if year_range and start_index:
+            raise AmazonOrdersError("--start-index cannot be used with --year-range.")
+
         optional_start_index = f", startIndex={start_index}, one page" if start_index else ", all pages"
         optional_full_details = ", with full details" if full_details else ""
         click.echo("""-----------------------------------------------------------------------
 Order History for {year}{optional_start_index}{optional_full_details}
 -----------------------------------------------------------------------\n"""
-                   .format(year=year,
+                   .format(year="{}-{}".format(*year_range) if year_range else year,
                            optional_start_index=optional_start_index,
                            optional_full_details=optional_full_details))
         click.echo("Info: Fetching order history, this might take a minute ...")
@@ -142,16 +150,22 @@ Order History for {year}{optional_start_index}{optional_full_details}
         amazon_orders = AmazonOrders(amazon_session,
                                      config=config)
 
-        orders = amazon_orders.get_order_history(year=kwargs["year"],
-                                                 start_index=kwargs[
-                                                     "start_index"],
-                                                 full_details=kwargs[
-                                                     "full_details"], )
-
-        click.echo("... {} orders parsed.\n".format(len(orders)))
+        # Orders are output as they are parsed, rather than waiting for all pages to be fetched
+        if year_range:
+            orders = amazon_orders.iter_order_history_range(year_range[0],
+                                                            year_range[1],
+                                                            full_details=full_details)
+        else:
+            orders = amazon_orders.iter_order_history(year=year,
+                                                      start_index=start_index,
+                                                      full_details=full_details)
 
+        total = 0
         for order in orders:
             click.echo(f"{_order_output(order, config)}\n")
+            total += 1
+
+        click.echo("... {} orders parsed.\n".format(total))
     except AmazonOrdersError as e:
         logger.debug("An error occurred.", exc_info=True)
         ctx.fail(str(e))
@@ -221,6 +235,78 @@ Transaction History for {days} days
         ctx.fail(str(e))
 
 
+@amazon_orders_cli.command()
+@click.pass_context
+@click.option("--earliest-year", type=int,
+              help="The earliest year to sync, defaults to the year of the most recently stored order (or the "
+                   "current year, if no orders are stored).")
+@click.option("--full-details", is_flag=True, default=False,
+              help="Retrieve the full details for each new order.")
+@click.option("--transaction-days", type=int, default=0,
+              help="The number of days of transactions to also sync, defaults to none.")
+def sync(ctx: Context,
+         **kwargs: Any) -> None:
+    """
+    Sync new orders (and, optionally, transactions) to the local order store.
+    """
+    amazon_session = ctx.obj["amazon_session"]
+
+    try:
+        _authenticate(amazon_session)
+
+        config = ctx.obj["conf"]
+        transaction_days = kwargs["transaction_days"]
+
+        click.echo("""-----------------------------------------------------------------------
+Syncing to {store_path}
+-----------------------------------------------------------------------
+""".format(store_path=config.store_path))
+        click.echo("Info: Fetching new orders, this might take a minute ...")
+
+        with OrderStore(config.store_path) as order_store:
+            new_orders = order_store.sync(AmazonOrders(amazon_session,
+                                                       config=config),
+                                          earliest_year=kwargs["earliest_year"],
+                                          full_details=kwargs["full_details"])
+
+            for order in new_orders:
+                click.echo(f"{_order_output(order, config)}\n")
+
+            click.echo("... {} new orders synced, {} orders stored.\n".format(len(new_orders),
+                                                                              order_store.order_count()))
+
+            if transaction_days:
+                transactions = AmazonTransactions(amazon_session,
+                                                  config=config).get_transactions(days=transaction_days)
+                order_store.save_transactions(transactions)
+
+                click.echo("... {} transactions synced.\n".format(len(transactions)))
+    except AmazonOrdersError as e:
+        logger.debug("An error occurred.", exc_info=True)
+        ctx.fail(str(e))
+
+
+@amazon_orders_cli.command(short_help="Show which selector alternatives have matched.")
+@click.pass_context
+def selector_stats(ctx: Context) -> None:
+    """
+    Show how many times each alternative of each fallback selector list has matched, which shows the page layout
+    Amazon is serving. Stats are only kept between commands if the "persist_selector_stats" config is enabled.
+    """
+    config = ctx.obj["conf"]
+
+    stats = config.selector_stats.stats
+    if not stats:
+        click.echo("Info: No selector stats have been recorded.\n")
+        return
+
+    for name, hits in sorted(stats.items()):
+        click.echo(name)
+        for selector, count in sorted(hits.items(), key=lambda h: -h[1]):
+            click.echo(f"  {count:>8}  {selector}")
+    click.echo("")
+
+
 @amazon_orders_cli.command(short_help="Check if persisted session exists.")
 @click.pass_context
 def check_session(ctx: Context) -> None:
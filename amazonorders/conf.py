@@ -5,6 +5,9 @@ from typing import Any, Dict, Optional
 import yaml
 
 from amazonorders import util
+from amazonorders.currency import CurrencyParser
+from amazonorders.dates import DateParser
+from amazonorders.selectorstats import SelectorStats
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +32,34 @@ class AmazonOrdersConfig:
         # Provision default configs
         self._data = {
             "max_auth_attempts": 10,
+            "max_workers": 4,
+            "connect_timeout": 10,
+            "read_timeout": 30,
+            "max_retries": 3,
+            "retry_backoff": 0.5,
+            "rate_limit": None,
+            "bs4_parser": "html.parser",
+            "restrict_history_parse": True,
+            "adaptive_selectors": False,
+            "persist_selector_stats": False,
+            "detach_entities": False,
+            "currency_as_decimal": False,
             "output_dir": os.path.join(os.getcwd(), "output"),
+            "capture_compress": False,
+            "capture_dedupe": False,
+            "capture_max_size": None,
             "cookie_jar_path": os.path.join(DEFAULT_CONFIG_DIR, "cookies.json"),
+            "cookie_flush_interval": 0,
+            "session_freshness": 0,
+            "store_path": os.path.join(DEFAULT_CONFIG_DIR, "orders.db"),
+            "cache_dir": None,
+            # Details pages of Orders that aren't delivered, or are still returnable, still change, so they're only
+            # cached for a short time by default
+            "cache_ttl": {
+                "order_history": 300,
+                "order_details": 3600,
+            },
+            "cache_max_size": 104857600,
             "constants_class": "amazonorders.constants.Constants",
             "selectors_class": "amazonorders.selectors.Selectors",
             "order_class": "amazonorders.entity.order.Order",
@@ -67,14 +96,39 @@ class AmazonOrdersConfig:
 
         self.constants = util.load_class(constants_class_split[:-1], constants_class_split[-1])()
         self.selectors = util.load_class(selectors_class_split[:-1], selectors_class_split[-1])()
+        # Compiled up front in to the registry shared by all entities, so an invalid selector fails here, rather than
+        # when it's first used
+        util.compile_selectors(self.selectors)
+        #: Which alternative of each of the ``selectors`` fallback lists has matched, used to reorder the
+        #: alternatives if ``adaptive_selectors`` is enabled. If ``persist_selector_stats`` is enabled, stats are
+        #: persisted next to the config file.
+        self.selector_stats = SelectorStats(
+            self.selectors,
+            adaptive=self.adaptive_selectors,
+            stats_path=f"{os.path.splitext(self.config_path)[0]}.selector-stats.json"
+            if self.persist_selector_stats else None)
+        #: Parses the currencies of entities, using the separators of the ``constants`` ``LOCALE``.
+        self.currency_parser = CurrencyParser(self.constants.LOCALE, use_decimal=self.currency_as_decimal)
+        #: Parses the dates of entities, using the month names of the ``constants`` ``LOCALE``.
+        self.date_parser = DateParser(self.constants.LOCALE)
         self.order_cls = util.load_class(order_class_split[:-1], order_class_split[-1])
         self.shipment_cls = util.load_class(shipment_class_split[:-1], shipment_class_split[-1])
         self.item_cls = util.load_class(item_class_split[:-1], item_class_split[-1])
 
     def __getattr__(self,
                     key: str) -> Any:
+        # Private attributes are never config values, and looking them up in ``_data`` before it's set (for
+        # instance, when unpickling) would recurse
+        if key.startswith("_"):
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{key}'")
+
         return self._data[key]
 
+    def __reduce__(self) -> Any:
+        # Only the path and data are pickled, and the config is rebuilt from them, rather than pickling the loaded
+        # classes, compiled selectors, and parsers. Changes made at runtime to those objects are not kept.
+        return self.__class__, (self.config_path, self._data)
+
     def update_config(self,
                       key: str,
                       value: str,
@@ -21,6 +21,12 @@ class Constants:
 
     BASE_URL = os.environ.get("AMAZON_BASE_URL", "https://www.amazon.com")
 
+    ##########################################################################
+    # Locale of the marketplace, which determines how currencies are parsed
+    ##########################################################################
+
+    LOCALE = os.environ.get("AMAZON_LOCALE", "en_US")
+
     ##########################################################################
     # URLs for AmazonSession
     ##########################################################################
@@ -37,6 +43,8 @@ class Constants:
     ORDER_HISTORY_URL = f"{BASE_URL}/your-orders/orders"
     ORDER_DETAILS_URL = f"{BASE_URL}/gp/your-account/order-details"
     HISTORY_FILTER_QUERY_PARAM = "timeFilter"
+    HISTORY_START_INDEX_QUERY_PARAM = "startIndex"
+    HISTORY_PAGE_SIZE = 10
 
     ##########################################################################
     # URLs for transactions
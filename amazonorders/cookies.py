@@ -0,0 +1,333 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from http.cookiejar import Cookie, CookieJar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from amazonorders import util
+from amazonorders.exception import AmazonOrdersError
+
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+#: The version of the format cookies are persisted in. Files from before versioning are a flat JSON object of cookie
+#: names to values, which are still loaded, and are upgraded on the next write.
+COOKIE_FILE_VERSION = 2
+
+#: The number of seconds to wait for the lock on a cookie jar on Windows, where it's polled, before giving up, so a
+#: stuck lock raises an error rather than hanging the process.
+FILE_LOCK_TIMEOUT = 60
+
+CookieKey = Tuple[str, str, str]
+
+# The stores that coalesce writes, flushed when the interpreter exits. Held weakly, so stores that are no longer
+# used can still be freed (a store with pending changes is kept alive by its flush timer until they're written).
+_flushed_at_exit: "weakref.WeakSet[CookieStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    for cookie_store in list(_flushed_at_exit):
+        cookie_store.flush()
+
+
+@contextmanager
+def _file_lock(lock_path: str) -> Iterator[None]:
+    # Locks a separate lock file, rather than the cookie file itself, since the cookie file is replaced on each write
+    with open(lock_path, "a+") as f:
+        if sys.platform == "win32":  # pragma: no cover
+            f.seek(0)
+            deadline = time.monotonic() + FILE_LOCK_TIMEOUT
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK only retries for 10 seconds before giving up
+                    if time.monotonic() >= deadline:
+                        raise AmazonOrdersError(f"Timed out waiting for the lock on {lock_path}, delete it if "
+                                                f"no other process is using the cookie jar.") from e
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _cookie_to_dict(cookie: Cookie) -> Dict[str, Any]:
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "expires": cookie.expires,
+        "secure": cookie.secure,
+        "rest": dict(getattr(cookie, "_rest", {})),
+    }
+
+
+def _dict_to_cookie(cookie: Dict[str, Any]) -> Cookie:
+    return create_cookie(cookie["name"],
+                         cookie["value"],
+                         domain=cookie.get("domain", ""),
+                         path=cookie.get("path", "/"),
+                         expires=cookie.get("expires"),
+                         secure=cookie.get("secure", False),
+                         rest=cookie.get("rest", {"HttpOnly": None}))
+
+
+def _is_expired(cookie: Dict[str, Any],
+                now: float) -> bool:
+    return cookie.get("expires") is not None and cookie["expires"] <= now
+
+
+def _serialize(cookie_jar: CookieJar) -> Dict[CookieKey, Dict[str, Any]]:
+    now = time.time()
+    cookies = {}
+    for cookie in list(cookie_jar):
+        cookie_dict = _cookie_to_dict(cookie)
+        if not _is_expired(cookie_dict, now):
+            cookies[(cookie.domain, cookie.path, cookie.name)] = cookie_dict
+    return cookies
+
+
+class CookieStore:
+    """
+    Persists the cookies of a :class:`requests.Session` to a JSON file, with each cookie's domain, path, expiry, and
+    other attributes. The file is only written when the cookies have changed since they were last loaded or written,
+    and each write is atomic (the cookies are written to a temp file, which is then renamed over
+    ``cookie_jar_path``).
+
+    The file can be safely shared by many processes (and sessions) on the same host, so they share one authenticated
+    session. Reads and writes are done while holding a lock on ``lock_path``, and rather than each process
+    overwriting the file with its own cookies, changes are merged: before writing, cookies another process changed
+    since they were last loaded are pulled in to the cookie jar (unless they were also changed locally, in which case
+    the local change wins). Since :func:`save` is called after each request, changes another process wrote are
+    also picked up then, at the cost of a ``stat`` of the file.
+
+    If ``flush_interval`` is greater than ``0``, changes are not written immediately, but instead are coalesced and
+    written on a background thread at most once per interval. Call :func:`flush` to force pending changes to be
+    written, which is also done when the interpreter exits.
+    """
+
+    def __init__(self,
+                 cookie_jar_path: str,
+                 flush_interval: float = 0) -> None:
+        #: The path to the file where cookies are persisted.
+        self.cookie_jar_path: str = cookie_jar_path
+        #: The path to the file locked while reading or writing ``cookie_jar_path``.
+        self.lock_path: str = f"{cookie_jar_path}.lock"
+        #: The path to the file locked while a session sharing ``cookie_jar_path`` logs in again, see
+        #: :func:`reauth_lock`.
+        self.reauth_lock_path: str = f"{cookie_jar_path}.reauth.lock"
+        #: The number of seconds to coalesce writes for, ``0`` to write changes immediately.
+        self.flush_interval: float = flush_interval
+        #: The number of times cookies have been written to ``cookie_jar_path``.
+        self.write_count: int = 0
+
+        self._lock = threading.RLock()
+        # The cookies last loaded from or written to ``cookie_jar_path``, and the ``stat`` of the file at that time,
+        # used to tell which cookies were changed locally, and which by another process
+        self._persisted: Optional[Dict[CookieKey, Dict[str, Any]]] = None
+        self._persisted_stat: Optional[Tuple[int, int, int]] = None
+        # The cookie jar with changes pending a flush, and its cookies when it was last saved
+        self._pending: Optional[RequestsCookieJar] = None
+        self._pending_cookies: Optional[Dict[CookieKey, Dict[str, Any]]] = None
+        self._timer: Optional[threading.Timer] = None
+
+        cookie_dir = os.path.dirname(self.cookie_jar_path)
+        if not os.path.exists(cookie_dir):
+            os.makedirs(cookie_dir)
+
+        if self.flush_interval > 0:
+            _flushed_at_exit.add(self)
+
+    def load(self,
+             cookie_jar: RequestsCookieJar) -> None:
+        """
+        Update the given cookie jar with the persisted cookies, if any exist. Expired cookies are skipped.
+
+        :param cookie_jar: The cookie jar to update.
+        """
+        with self._lock:
+            with _file_lock(self.lock_path):
+                cookies = self._read()
+
+            if cookies is None:
+                return
+
+            self._persisted = cookies
+
+        for cookie in cookies.values():
+            cookie_jar.set_cookie(_dict_to_cookie(cookie))
+
+    def save(self,
+             cookie_jar: RequestsCookieJar) -> bool:
+        """
+        Persist the given cookie jar, if it has changed since it was last loaded or written. If another process has
+        written to ``cookie_jar_path`` since, its changes are first merged in to the cookie jar.
+
+        :param cookie_jar: The cookie jar to persist.
+        :return: ``True`` if the cookies changed and a write was performed or scheduled.
+        """
+        with self._lock:
+            self.refresh(cookie_jar)
+
+            cookies = _serialize(cookie_jar)
+            if cookies == (self._pending_cookies if self._pending is not None else self._persisted):
+                return False
+
+            if self.flush_interval > 0:
+                self._pending = cookie_jar
+                self._pending_cookies = cookies
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            else:
+                self._write(cookie_jar)
+
+        return True
+
+    def refresh(self,
+                cookie_jar: RequestsCookieJar) -> None:
+        """
+        Merge in to the given cookie jar any changes another process has written to ``cookie_jar_path`` since the
+        cookies were last loaded or written.
+
+        :param cookie_jar: The cookie jar to update.
+        """
+        with self._lock:
+            if self._persisted_stat != self._stat():
+                with _file_lock(self.lock_path):
+                    self._merge(cookie_jar)
+
+    @contextmanager
+    def reauth_lock(self) -> Iterator[None]:
+        """
+        Hold a lock, across all processes sharing ``cookie_jar_path``, while a session logs in again, so that when
+        many are redirected to sign-in at once, only the first logs in, and the rest pick up its cookies with
+        :func:`refresh`.
+
+        This is a separate lock from ``lock_path``, since cookies are saved while logging in.
+        """
+        with _file_lock(self.reauth_lock_path):
+            yield
+
+    def flush(self) -> None:
+        """
+        Write any pending changes that are waiting on the background flush interval.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if self._pending is not None:
+                self._write(self._pending)
+                self._pending = None
+                self._pending_cookies = None
+
+    def clear(self) -> None:
+        """
+        Discard any pending changes and delete the persisted cookies.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+            self._pending_cookies = None
+            self._persisted = None
+
+            with _file_lock(self.lock_path):
+                if os.path.exists(self.cookie_jar_path):
+                    os.remove(self.cookie_jar_path)
+
+            self._persisted_stat = None
+
+    def _read(self) -> Optional[Dict[CookieKey, Dict[str, Any]]]:
+        self._persisted_stat = self._stat()
+        if self._persisted_stat is None:
+            return None
+
+        with open(self.cookie_jar_path, "r", encoding="utf-8") as f:
+            data = json.loads(f.read())
+
+        if isinstance(data, dict) and isinstance(data.get("cookies"), list):
+            cookie_dicts = data["cookies"]
+        else:
+            # A file from before cookie metadata was persisted, which is only cookie names and values
+            cookie_dicts = [_cookie_to_dict(create_cookie(name, value)) for name, value in data.items()]
+
+        now = time.time()
+        return {(c.get("domain", ""), c.get("path", "/"), c["name"]): c
+                for c in cookie_dicts if not _is_expired(c, now)}
+
+    def _merge(self,
+               cookie_jar: RequestsCookieJar) -> None:
+        # Must be called while holding the file lock
+        persisted = self._persisted or {}
+        cookies = _serialize(cookie_jar)
+        on_disk = self._read() or {}
+
+        for key, cookie in on_disk.items():
+            # Changed by another process, and not changed locally
+            if cookie != persisted.get(key) and cookies.get(key) == persisted.get(key):
+                cookie_jar.set_cookie(_dict_to_cookie(cookie))
+        for key, cookie in persisted.items():
+            # Deleted by another process, and not changed locally
+            if key not in on_disk and cookies.get(key) == cookie:
+                domain, path, name = key
+                try:
+                    cookie_jar.clear(domain, path, name)
+                except KeyError:
+                    pass
+
+        self._persisted = on_disk
+
+    def _write(self,
+               cookie_jar: RequestsCookieJar) -> None:
+        with _file_lock(self.lock_path):
+            self._merge(cookie_jar)
+
+            cookies = _serialize(cookie_jar)
+
+            util.atomic_write(self.cookie_jar_path,
+                              json.dumps({"version": COOKIE_FILE_VERSION, "cookies": list(cookies.values())}),
+                              temp_prefix=".cookies-")
+
+            self._persisted = cookies
+            self._persisted_stat = self._stat()
+
+        self.write_count += 1
+
+        logger.debug(f"Cookies written to {self.cookie_jar_path}")
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.cookie_jar_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,113 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Pattern, Tuple, Union
+
+#: The decimal separator, and the group separators, of currencies in each marketplace, keyed by locale (for example,
+#: ``de_DE``) or language (for example, ``de``). A locale that isn't listed falls back to its language, then to
+#: ``en``.
+CURRENCY_SEPARATORS: Dict[str, Tuple[str, str]] = {
+    "en": (".", ","),
+    "ja": (".", ","),
+    "zh": (".", ","),
+    "de": (",", "."),
+    "es": (",", "."),
+    "it": (",", "."),
+    "nl": (",", "."),
+    "pt": (",", "."),
+    "tr": (",", "."),
+    "fr": (",", " \u00a0\u202f"),
+    "pl": (",", " \u00a0\u202f"),
+    "sv": (",", " \u00a0\u202f"),
+}
+
+# Anything that may surround an amount, like currency symbols and codes (for example, "$", "EUR", or "Rs"), and
+# whitespace
+_SURROUNDING = r"(?:[^\W\d_]|[\s$£€¥₹₩₽¤])*"
+
+
+def get_currency_separators(locale: str) -> Tuple[str, str]:
+    """
+    Get the currency separators of the given locale from :attr:`CURRENCY_SEPARATORS`.
+
+    :param locale: The locale, for example ``en_US``.
+    :return: The decimal separator, and a string of the group separators.
+    """
+    return (CURRENCY_SEPARATORS.get(locale) or
+            CURRENCY_SEPARATORS.get(locale.split("_")[0]) or
+            CURRENCY_SEPARATORS["en"])
+
+
+@lru_cache(maxsize=None)
+def _compile_currency_pattern(decimal_separator: str,
+                              group_separators: str) -> Pattern:
+    return re.compile(r"{surrounding}(?:([-+]){surrounding})?(\d[\d{group}]*)(?:{decimal}(\d+))?{surrounding}".format(
+        surrounding=_SURROUNDING,
+        group=re.escape(group_separators),
+        decimal=re.escape(decimal_separator)))
+
+
+class CurrencyParser:
+    """
+    Parses currencies, like ``$1,234.99`` or ``1.234,99 €``, using the separators of the marketplace's locale (see
+    :attr:`CURRENCY_SEPARATORS`). The pattern for each locale's separators is compiled once and shared by all
+    parsers, and each currency is parsed with a single match.
+
+    An amount without a fractional part is returned as an ``int``, and one with a fractional part as a ``float``,
+    unless ``use_decimal`` is ``True``, in which case a :class:`~decimal.Decimal` is returned, so amounts can be
+    summed without floating point error.
+    """
+
+    def __init__(self,
+                 locale: str = "en_US",
+                 use_decimal: bool = False) -> None:
+        #: The locale of the marketplace, for example ``en_US``.
+        self.locale: str = locale
+        #: If amounts should be returned as a :class:`~decimal.Decimal`.
+        self.use_decimal: bool = use_decimal
+
+        decimal_separator, group_separators = get_currency_separators(locale)
+        self._pattern = _compile_currency_pattern(decimal_separator, group_separators)
+        self._group_separators_table = str.maketrans("", "", group_separators)
+
+    def parse(self,
+              value: Any) -> Union[int, float, Decimal, None]:
+        """
+        Parse the given currency. If ``value`` is already a number, it is returned as is.
+
+        :param value: The currency to parse.
+        :return: The amount, or ``None`` if ``value`` is not a currency.
+        """
+        if isinstance(value, (int, float, Decimal)):
+            return value
+
+        if not value:
+            return None
+
+        match = self._pattern.fullmatch(value)
+        if not match:
+            return None
+
+        sign, integer, fraction = match.groups()
+        integer = integer.translate(self._group_separators_table)
+
+        if self.use_decimal:
+            return Decimal(f"{sign or ''}{integer}.{fraction}" if fraction else f"{sign or ''}{integer}")
+        elif fraction:
+            return float(f"{sign or ''}{integer}.{fraction}")
+        else:
+            return -int(integer) if sign == "-" else int(integer)
+
+    def parse_many(self,
+                   values: Iterable[Any]) -> List[Union[int, float, Decimal, None]]:
+        """
+        Parse each of the given currencies, for example, all the prices on a page.
+
+        :param values: The currencies to parse.
+        :return: The amounts, in the same order as ``values``.
+        """
+        parse = self.parse
+        return [parse(value) for value in values]
@@ -0,0 +1,142 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from dateutil import parser
+
+logger = logging.getLogger(__name__)
+
+#: The names (and abbreviations) of each month, in order, keyed by language. English names are always recognized,
+#: since Amazon shows English pages in every marketplace.
+MONTH_NAMES: Dict[str, List[Tuple[str, ...]]] = {
+    "en": [("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"), ("may",),
+           ("june", "jun"), ("july", "jul"), ("august", "aug"), ("september", "sept", "sep"),
+           ("october", "oct"), ("november", "nov"), ("december", "dec")],
+    "de": [("januar", "jan"), ("februar", "feb"), ("märz", "mär"), ("april", "apr"), ("mai",),
+           ("juni", "jun"), ("juli", "jul"), ("august", "aug"), ("september", "sept", "sep"),
+           ("oktober", "okt"), ("november", "nov"), ("dezember", "dez")],
+    "fr": [("janvier", "janv"), ("février", "févr"), ("mars",), ("avril", "avr"), ("mai",),
+           ("juin",), ("juillet", "juil"), ("août",), ("septembre", "sept"),
+           ("octobre", "oct"), ("novembre", "nov"), ("décembre", "déc")],
+    "es": [("enero", "ene"), ("febrero", "feb"), ("marzo", "mar"), ("abril", "abr"), ("mayo", "may"),
+           ("junio", "jun"), ("julio", "jul"), ("agosto", "ago"), ("septiembre", "setiembre", "sept", "sep"),
+           ("octubre", "oct"), ("noviembre", "nov"), ("diciembre", "dic")],
+    "it": [("gennaio", "gen"), ("febbraio", "feb"), ("marzo", "mar"), ("aprile", "apr"), ("maggio", "mag"),
+           ("giugno", "giu"), ("luglio", "lug"), ("agosto", "ago"), ("settembre", "set"),
+           ("ottobre", "ott"), ("novembre", "nov"), ("dicembre", "dic")],
+}
+
+
+@lru_cache(maxsize=None)
+def _compile_date_patterns(language: str) -> Tuple[Dict[str, int], List[Tuple[Pattern, Tuple[str, str, str]]]]:
+    months: Dict[str, int] = {}
+    for month_language in dict.fromkeys(["en", language]):
+        for month, names in enumerate(MONTH_NAMES.get(month_language, []), start=1):
+            for name in names:
+                months.setdefault(name, month)
+
+    # Longer names first, so "sept" is never matched as "sep"
+    month_names = "|".join(re.escape(name) for name in sorted(months, key=len, reverse=True))
+    patterns = [
+        # "October 3, 2023", "Oct. 3, 2023"
+        (re.compile(rf"\b({month_names})\.?\s+(\d{{1,2}}),?\s+(\d{{4}})\b", re.IGNORECASE), ("month", "day", "year")),
+        # "3 October 2023", "3. Oktober 2023", "3 de octubre de 2023"
+        (re.compile(rf"\b(\d{{1,2}})\.?\s+(?:de\s+)?({month_names})\.?,?\s+(?:de\s+)?(\d{{4}})\b", re.IGNORECASE),
+         ("day", "month", "year")),
+        # "2023-10-03"
+        (re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"), ("year", "month", "day")),
+    ]
+    return months, patterns
+
+
+class DateParser:
+    """
+    Parses dates, like ``October 3, 2023`` or ``3 October 2023``, from text. Amazon's date formats (with the month
+    names of the marketplace's locale) are tried first, and only when none of them match is the slower, fuzzy
+    :func:`dateutil.parser.parse` used, which is counted in ``fallbacks``. Results are memoized in an LRU of
+    ``cache_size`` strings, since the same dates (and text without dates) repeat across entities.
+    """
+
+    def __init__(self,
+                 locale: str = "en_US",
+                 cache_size: int = 1024) -> None:
+        #: The locale of the marketplace, for example ``en_US``.
+        self.locale: str = locale
+        #: The maximum number of parsed strings to memoize.
+        self.cache_size: int = cache_size
+        #: The number of strings that didn't match any known format, so were parsed with :mod:`dateutil`.
+        self.fallbacks: int = 0
+
+        self._months, self._patterns = _compile_date_patterns(locale.split("_")[0].lower())
+        self._lock = threading.Lock()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        state.pop("_parse_cached")
+        return state
+
+    def __setstate__(self,
+                     state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._parse_cached = lru_cache(maxsize=self.cache_size)(self._parse)
+
+    def parse(self,
+              value: str,
+              fuzzy: bool = False) -> datetime.date:
+        """
+        Parse a date from the given text.
+
+        :param value: The text to parse.
+        :param fuzzy: If ``True``, text around the date is ignored when falling back to :mod:`dateutil`, the same as
+            its ``fuzzy`` parameter. Amazon's date formats are always found anywhere in the text.
+        :return: The parsed date.
+        :raises ValueError: If no date could be parsed from the text.
+        """
+        parsed_date = self._parse_cached(value, fuzzy)
+        if parsed_date is None:
+            raise ValueError(f"Could not parse a date from \"{value}\".")
+
+        return parsed_date
+
+    def cache_info(self) -> Any:
+        """
+        :return: The hits, misses, and size of the memoized strings, as a :func:`functools.lru_cache` ``CacheInfo``.
+        """
+        return self._parse_cached.cache_info()
+
+    def _parse(self,
+               value: str,
+               fuzzy: bool) -> Optional[datetime.date]:
+        for pattern, fields in self._patterns:
+            match = pattern.search(value)
+            if not match:
+                continue
+
+            parts = dict(zip(fields, match.groups()))
+            month = parts["month"]
+            try:
+                return datetime.date(int(parts["year"]),
+                                     int(month) if month.isdigit() else self._months[month.lower()],
+                                     int(parts["day"]))
+            except ValueError:
+                # Not a real date, like "February 30, 2023"
+                break
+
+        with self._lock:
+            self.fallbacks += 1
+
+        logger.debug(f"\"{value}\" didn't match a known date format, falling back to dateutil")
+
+        try:
+            return parser.parse(value, fuzzy=fuzzy).date()
+        except (ValueError, OverflowError):
+            return None
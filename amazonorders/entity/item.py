@@ -21,6 +21,15 @@ class Item(Parsable):
     An Item in an Amazon :class:`~amazonorders.entity.order.Order`.
     """
 
+    FIELD_SELECTOR_NAMES = ["FIELD_ITEM_TITLE_SELECTOR",
+                            "FIELD_ITEM_LINK_SELECTOR",
+                            "FIELD_ITEM_PRICE_SELECTOR",
+                            "FIELD_ITEM_SELLER_SELECTOR",
+                            "FIELD_ITEM_TAG_ITERATOR_SELECTOR",
+                            "FIELD_ITEM_RETURN_SELECTOR",
+                            "FIELD_ITEM_IMG_LINK_SELECTOR",
+                            "FIELD_ITEM_QUANTITY_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig) -> None:
@@ -33,30 +42,30 @@ class Item(Parsable):
         self.link: str = self.safe_simple_parse(selector=self.config.selectors.FIELD_ITEM_LINK_SELECTOR,
                                                 attr_name="href", required=True)
         #: The Item price.
-        self.price: Optional[float] = self.to_currency(
+        self.price: Optional[float] = self.lazy(lambda: self.to_currency(
             self.safe_simple_parse(selector=self.config.selectors.FIELD_ITEM_PRICE_SELECTOR)
-        )
+        ))
         #: The Item Seller.
-        self.seller: Optional[Seller] = self.safe_simple_parse(
+        self.seller: Optional[Seller] = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_ITEM_SELLER_SELECTOR,
             text_contains="Sold by:",
-            wrap_tag=Seller)
+            wrap_tag=Seller))
         #: The Item condition.
-        self.condition: Optional[str] = self.safe_simple_parse(
+        self.condition: Optional[str] = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_ITEM_TAG_ITERATOR_SELECTOR,
-            prefix_split="Condition:")
+            prefix_split="Condition:"))
         #: The Item return eligible date.
-        self.return_eligible_date: Optional[date] = self.safe_simple_parse(
+        self.return_eligible_date: Optional[date] = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_ITEM_RETURN_SELECTOR,
             text_contains="Return",
-            parse_date=True)
+            parse_date=True))
         #: The Item image URL.
-        self.image_link: Optional[str] = self.safe_simple_parse(
+        self.image_link: Optional[str] = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_ITEM_IMG_LINK_SELECTOR,
-            attr_name="src")
+            attr_name="src"))
         #: The Item quantity.
-        self.quantity: Optional[int] = self.safe_simple_parse(
-            selector=self.config.selectors.FIELD_ITEM_QUANTITY_SELECTOR)
+        self.quantity: Optional[int] = self.lazy(lambda: self.safe_simple_parse(
+            selector=self.config.selectors.FIELD_ITEM_QUANTITY_SELECTOR))
 
     def __repr__(self) -> str:
         return f"<Item: \"{self.title}\">"
@@ -4,9 +4,10 @@ __license__ = "MIT"
 import json
 import logging
 from datetime import date
-from typing import Any, List, Optional, TypeVar, Union
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple, TypeVar, Union
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 
 from amazonorders import util
 from amazonorders.conf import AmazonOrdersConfig
@@ -26,6 +27,19 @@ class Order(Parsable):
     An Amazon Order.
     """
 
+    FIELD_SELECTOR_NAMES = ["SHIPMENT_ENTITY_SELECTOR",
+                            "ITEM_ENTITY_SELECTOR",
+                            "FIELD_ORDER_NUMBER_SELECTOR",
+                            "FIELD_ORDER_DETAILS_LINK_SELECTOR",
+                            "FIELD_ORDER_GRAND_TOTAL_SELECTOR",
+                            "FIELD_ORDER_PLACED_DATE_SELECTOR",
+                            "FIELD_ORDER_PAYMENT_METHOD_SELECTOR",
+                            "FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR",
+                            "FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR",
+                            "FIELD_ORDER_GIFT_CARD_INSTANCE_SELECTOR",
+                            "FIELD_ORDER_ADDRESS_SELECTOR",
+                            "FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig,
@@ -33,50 +47,64 @@ class Order(Parsable):
                  clone: Optional[OrderEntity] = None) -> None:
         super().__init__(parsed, config)
 
+        # The text and currency of each subtotal, populated the first time a currency field is parsed
+        self._subtotals: Optional[List[Tuple[str, Any]]] = None
+
         #: If the Orders full details were populated from its details page.
         self.full_details: bool = full_details
 
+        # Fields taken from ``clone`` are read now, rather than lazily, so this Order doesn't keep ``clone`` (and the
+        # page it was parsed from) alive
+
         #: The Order Shipments.
-        self.shipments: List[Shipment] = clone.shipments if clone else self._parse_shipments()
+        self.shipments: List[Shipment] = clone.shipments if clone else self.lazy(self._parse_shipments)
         #: The Order Items.
-        self.items: List[Item] = clone.items if clone and not full_details else self._parse_items()
+        self.items: List[Item] = clone.items if clone and not full_details else self.lazy(self._parse_items)
         #: The Order number.
         self.order_number: str = clone.order_number if clone else self.safe_simple_parse(
             selector=self.config.selectors.FIELD_ORDER_NUMBER_SELECTOR,
             required=True)
         #: The Order details link.
-        self.order_details_link: Optional[str] = clone.order_details_link if clone else self.safe_parse(
-            self._parse_order_details_link)
+        self.order_details_link: Optional[str] = clone.order_details_link if clone else self.lazy(
+            lambda: self.safe_parse(self._parse_order_details_link))
         #: The Order grand total.
-        self.grand_total: float = clone.grand_total if clone else self.safe_parse(self._parse_grand_total)
+        self.grand_total: float = clone.grand_total if clone else self.lazy(
+            lambda: self.safe_parse(self._parse_grand_total))
         #: The Order placed date.
-        self.order_placed_date: date = clone.order_placed_date if clone else self.safe_simple_parse(
-            selector=self.config.selectors.FIELD_ORDER_PLACED_DATE_SELECTOR, parse_date=True)
+        self.order_placed_date: date = clone.order_placed_date if clone else self.lazy(
+            lambda: self.safe_simple_parse(selector=self.config.selectors.FIELD_ORDER_PLACED_DATE_SELECTOR,
+                                           parse_date=True))
         #: The Order Recipients.
-        self.recipient: Recipient = clone.recipient if clone else self.safe_parse(self._parse_recipient)
+        self.recipient: Recipient = clone.recipient if clone else self.lazy(
+            lambda: self.safe_parse(self._parse_recipient))
 
         # Fields below this point are only populated if `full_details` is True
 
         #: The Order payment method. Only populated when ``full_details`` is ``True``.
-        self.payment_method: Optional[str] = self._if_full_details(
-            self.safe_simple_parse(selector=self.config.selectors.FIELD_ORDER_PAYMENT_METHOD_SELECTOR,
-                                   attr_name="alt"))
+        self.payment_method: Optional[str] = self._if_full_details(self.lazy(
+            lambda: self.safe_simple_parse(selector=self.config.selectors.FIELD_ORDER_PAYMENT_METHOD_SELECTOR,
+                                           attr_name="alt")))
         #: The Order payment method's last 4 digits. Only populated when ``full_details`` is ``True``.
-        self.payment_method_last_4: Optional[int] = self._if_full_details(
-            self.safe_simple_parse(selector=self.config.selectors.FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR,
-                                   prefix_split="ending in"))
+        self.payment_method_last_4: Optional[int] = self._if_full_details(self.lazy(
+            lambda: self.safe_simple_parse(selector=self.config.selectors.FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR,
+                                           prefix_split="ending in")))
         #: The Order subtotal. Only populated when ``full_details`` is ``True``.
-        self.subtotal: Optional[float] = self._if_full_details(self._parse_currency("subtotal"))
+        self.subtotal: Optional[float] = self._if_full_details(self.lazy(lambda: self._parse_currency("subtotal")))
         #: The Order shipping total. Only populated when ``full_details`` is ``True``.
-        self.shipping_total: Optional[float] = self._if_full_details(self._parse_currency("shipping"))
+        self.shipping_total: Optional[float] = self._if_full_details(
+            self.lazy(lambda: self._parse_currency("shipping")))
         #: The Order Subscribe & Save discount. Only populated when ``full_details`` is ``True``.
-        self.subscription_discount: Optional[float] = self._if_full_details(self._parse_currency("subscribe"))
+        self.subscription_discount: Optional[float] = self._if_full_details(
+            self.lazy(lambda: self._parse_currency("subscribe")))
         #: The Order total before tax. Only populated when ``full_details`` is ``True``.
-        self.total_before_tax: Optional[float] = self._if_full_details(self._parse_currency("before tax"))
+        self.total_before_tax: Optional[float] = self._if_full_details(
+            self.lazy(lambda: self._parse_currency("before tax")))
         #: The Order estimated tax. Only populated when ``full_details`` is ``True``.
-        self.estimated_tax: Optional[float] = self._if_full_details(self._parse_currency("estimated tax"))
+        self.estimated_tax: Optional[float] = self._if_full_details(
+            self.lazy(lambda: self._parse_currency("estimated tax")))
         #: The Order refund total. Only populated when ``full_details`` is ``True``.
-        self.refund_total: Optional[float] = self._if_full_details(self._parse_currency("refund total"))
+        self.refund_total: Optional[float] = self._if_full_details(
+            self.lazy(lambda: self._parse_currency("refund total")))
 
     def __repr__(self) -> str:
         return f"<Order #{self.order_number}: \"{self.items}\">"
@@ -89,8 +117,7 @@ class Order(Parsable):
             return []
 
         shipments: List[Shipment] = [self.config.shipment_cls(x, self.config)
-                                     for x in util.select(self.parsed,
-                                                          self.config.selectors.SHIPMENT_ENTITY_SELECTOR)]
+                                     for x in self.select(self.config.selectors.SHIPMENT_ENTITY_SELECTOR)]
         shipments.sort()
         return shipments
 
@@ -99,8 +126,7 @@ class Order(Parsable):
             return []
 
         items: List[Item] = [self.config.item_cls(x, self.config)
-                             for x in util.select(self.parsed,
-                                                  self.config.selectors.ITEM_ENTITY_SELECTOR)]
+                             for x in self.select(self.config.selectors.ITEM_ENTITY_SELECTOR)]
         items.sort()
         return items
 
@@ -112,7 +138,7 @@ class Order(Parsable):
 
         return value
 
-    def _parse_grand_total(self) -> float:
+    def _parse_grand_total(self) -> Union[float, Decimal]:
         value = self.simple_parse(self.config.selectors.FIELD_ORDER_GRAND_TOTAL_SELECTOR)
 
         total_str = "total"
@@ -134,19 +160,19 @@ class Order(Parsable):
 
     def _parse_recipient(self) -> Optional[Recipient]:
         # At least for now, we don't populate Recipient data for digital orders
-        if util.select_one(self.parsed, self.config.selectors.FIELD_ORDER_GIFT_CARD_INSTANCE_SELECTOR):
+        if self.select_one(self.config.selectors.FIELD_ORDER_GIFT_CARD_INSTANCE_SELECTOR):
             return None
 
-        value = util.select_one(self.parsed, self.config.selectors.FIELD_ORDER_ADDRESS_SELECTOR)
+        value = self.select_one(self.config.selectors.FIELD_ORDER_ADDRESS_SELECTOR)
 
         if not value:
-            value = util.select_one(self.parsed, self.config.selectors.FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR)
+            value = self.select_one(self.config.selectors.FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR)
 
             if value:
                 data_popover = value.get("data-a-popover", {})  # type: ignore[arg-type, var-annotated]
                 inline_content = data_popover.get("inlineContent")  # type: ignore[union-attr]
                 if inline_content:
-                    value = BeautifulSoup(json.loads(inline_content), "html.parser")
+                    value = util.parse_html(json.loads(inline_content), self.config.bs4_parser)
 
         if not value:
             # TODO: there are multiple shipToData tags, we should double check we're picking the right one
@@ -166,7 +192,7 @@ class Order(Parsable):
             )
 
             if parent_tag:
-                value = BeautifulSoup(str(parent_tag.contents[0]).strip(), "html.parser")
+                value = util.parse_html(str(parent_tag.contents[0]).strip(), self.config.bs4_parser)
 
         if not value:
             return None
@@ -174,18 +200,29 @@ class Order(Parsable):
         return Recipient(value, self.config)
 
     def _parse_currency(self, contains) -> Optional[float]:
-        value = None
+        for text, value in self._get_subtotals():
+            if contains in text:
+                return value
+
+        return None
+
+    def _get_subtotals(self) -> List[Tuple[str, Any]]:
+        # The subtotals are found, and their currencies converted in one batch, the first time any of the currency
+        # fields is parsed, then shared by the rest
+        if self._subtotals is None:
+            subtotal_tags = []
+            for tag in self.select(self.config.selectors.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
+                if util.select_one(tag, self.config.selectors.FIELD_ORDER_SUBTOTALS_TAG_POPOVER_PRELOAD_SELECTOR):
+                    continue
 
-        for tag in util.select(self.parsed, self.config.selectors.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if (contains in tag.text.lower() and
-                    not util.select_one(tag,
-                                        self.config.selectors.FIELD_ORDER_SUBTOTALS_TAG_POPOVER_PRELOAD_SELECTOR)):
                 inner_tag = util.select_one(tag, self.config.selectors.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
                 if inner_tag:
-                    value = self.to_currency(inner_tag.text)
-                    break
+                    subtotal_tags.append((tag.text.lower(), inner_tag.text))
 
-        return value
+            values = self.config.currency_parser.parse_many(inner_text for _, inner_text in subtotal_tags)
+            self._subtotals = [(text, value) for (text, _), value in zip(subtotal_tags, values)]
+
+        return self._subtotals
 
     def _if_full_details(self,
                          value: Any) -> Union[Any, None]:
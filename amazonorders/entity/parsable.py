@@ -2,12 +2,11 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import logging
-import re
 from datetime import date
-from typing import Any, Callable, Dict, Optional, Type, Union
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from bs4 import Tag
-from dateutil import parser
 
 from amazonorders import util
 from amazonorders.conf import AmazonOrdersConfig
@@ -20,21 +19,156 @@ class Parsable:
     """
     A base class that contains a parsed representation of the entity, and can be extended to
     be made up of the entities fields utilizing the helper methods.
+
+    The first time the entity selects from ``parsed`` (with :func:`select`, :func:`select_one`, or
+    :func:`simple_parse`), every selector named in ``FIELD_SELECTOR_NAMES`` is matched in a single traversal of
+    ``parsed``, and the matches are kept for all the entity's fields. Any other selector is matched the first time
+    it is used, and its matches are also kept, so an entity never selects the same selector twice.
+
+    Fields assigned with :func:`lazy` are not parsed until they are first accessed, after which the value is kept,
+    so a caller that only reads a few fields of an entity doesn't pay to parse the rest (or to build the entity's
+    child entities). Any fields not yet parsed are parsed before the entity is pickled, since ``parsed`` is not.
     """
 
+    #: The names of the ``Selectors`` attributes (for example, ``FIELD_ITEM_TITLE_SELECTOR``) used to populate the
+    #: entity's fields, which are all matched in a single traversal of ``parsed``.
+    FIELD_SELECTOR_NAMES: List[str] = []
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig) -> None:
+        # Parse functions of the lazy fields that haven't been accessed yet, keyed by field name
+        self.__dict__.setdefault("_lazy_fields", {})
+
         #: Parsed HTML data that can be used to populate the fields of the entity.
         self.parsed: Tag = parsed
         #: The AmazonOrdersConfig to use.
         self.config: AmazonOrdersConfig = config
 
+        # Matches of each selector in ``parsed``, populated on first select
+        self._selections: Optional[Dict[str, List[Tag]]] = None
+        self._selections_parsed: Optional[Tag] = None
+
+    def __setattr__(self,
+                    name: str,
+                    value: Any) -> None:
+        lazy_fields = self.__dict__.setdefault("_lazy_fields", {})
+        if isinstance(value, _LazyField):
+            lazy_fields[name] = value.parse_function
+            self.__dict__.pop(name, None)
+        else:
+            lazy_fields.pop(name, None)
+            super().__setattr__(name, value)
+
+    def __getattr__(self,
+                    name: str) -> Any:
+        # Only called when ``name`` isn't already set on the entity, so a lazy field is parsed on first access only
+        lazy_fields = self.__dict__.get("_lazy_fields")
+        if not lazy_fields or name not in lazy_fields:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+        value = lazy_fields[name]()
+        if lazy_fields.pop(name, None) is not None:
+            super().__setattr__(name, value)
+
+        return self.__dict__.get(name, value)
+
     def __getstate__(self) -> Dict:
+        self.parse_lazy_fields()
+
         state = self.__dict__.copy()
         state.pop("parsed")
+        state.pop("_lazy_fields", None)
+        state.pop("_selections", None)
+        state.pop("_selections_parsed", None)
         return state
 
+    def __setstate__(self,
+                     state: Dict) -> None:
+        self.__dict__.update(state)
+        # ``parsed`` is not pickled, so an unpickled entity is detached
+        self.parsed = None  # type: ignore[assignment]
+        self._selections = None
+        self._selections_parsed = None
+
+    def lazy(self,
+             parse_function: Callable[[], Any]) -> Any:
+        """
+        Mark a field to be parsed on first access, rather than when the entity is built. Assign the return value
+        to the field, for example ``self.title: str = self.lazy(lambda: self.safe_simple_parse(...))``.
+        Fields parsed with ``required=True`` should not be lazy, so an entity missing one fails to be built, rather
+        than raising when the field is first accessed.
+
+        :param parse_function: Called with no arguments the first time the field is accessed, its return value
+            becomes the field's value.
+        :return: A marker that, when assigned to a field of the entity, makes the field lazy.
+        """
+        return _LazyField(parse_function)
+
+    def parse_lazy_fields(self) -> None:
+        """
+        Parse any lazy fields (see :func:`lazy`) that haven't been accessed yet.
+        """
+        for name in list(self.__dict__.get("_lazy_fields", {})):
+            getattr(self, name)
+
+    def detach(self) -> None:
+        """
+        Parse any lazy fields that haven't been accessed yet (and those of the entity's child entities, like an
+        Order's Items), then release ``parsed``, leaving only the fields' values. An entity keeps the whole page it
+        was parsed from alive (a ``Tag`` references its parents), so once detached, the page can be freed.
+
+        The tree is released rather than decomposed, since other entities (for example, the other Orders on the
+        same history page) may still be parsed from it.
+        """
+        self.parse_lazy_fields()
+
+        for name, value in self.__dict__.items():
+            if name == "parsed":
+                continue
+
+            for child in value if isinstance(value, list) else [value]:
+                if isinstance(child, Parsable):
+                    child.detach()
+
+        self.parsed = None  # type: ignore[assignment]
+        self._selections = None
+        self._selections_parsed = None
+
+    def select(self,
+               selector: Union[List[str], str]) -> List[Tag]:
+        """
+        Select from ``parsed`` the same as :func:`~amazonorders.util.select`, but using the matches from the
+        entity's single traversal of ``parsed``.
+
+        :param selector: The CSS selector(s) for the field.
+        :return: The selected tags.
+        """
+        if isinstance(selector, str):
+            selector = [selector]
+
+        # Alternatives are always tried in declared order, since they were all matched in the same traversal,
+        # there are no failed selects to save by reordering them
+        for s in selector:
+            tags = self._get_selection(s)
+            if tags:
+                self.config.selector_stats.record(selector, s)
+                return tags
+
+        return []
+
+    def select_one(self,
+                   selector: Union[List[str], str]) -> Optional[Tag]:
+        """
+        Select from ``parsed`` the same as :func:`~amazonorders.util.select_one`, but using the matches from the
+        entity's single traversal of ``parsed``.
+
+        :param selector: The CSS selector(s) for the field.
+        :return: The selected tag.
+        """
+        tags = self.select(selector)
+        return tags[0] if tags else None
+
     def safe_parse(self,
                    parse_function: Callable[..., Any],
                    **kwargs: Any) -> Any:
@@ -84,8 +218,8 @@ class Parsable:
         :param required: If required, an exception will be thrown instead of returning ``None``.
         :param prefix_split: Only select the field with the given prefix, returning the right side of the split if so.
         :param wrap_tag: Wrap the selected tag in this class before returning.
-        :param parse_date: ``True`` if the resulting value should be fuzzy parsed in to a date (returning ``None`` if
-            parsing fails).
+        :param parse_date: ``True`` if the resulting value should be parsed in to a date with the config's
+            :class:`~amazonorders.dates.DateParser` (returning ``None`` if parsing fails).
         :return: The cleaned up return value from the parsed ``selector``.
         """
         if isinstance(selector, str):
@@ -94,7 +228,7 @@ class Parsable:
         value: Union[int, float, bool, date, str, None] = None
 
         for s in selector:
-            for tag in self.parsed.select(s):
+            for tag in self._get_selection(s):
                 if tag:
                     if attr_name:
                         value = tag.attrs[attr_name]
@@ -122,11 +256,12 @@ class Parsable:
 
                         if parse_date and isinstance(value, str):
                             try:
-                                value = parser.parse(value, fuzzy=True).date()
+                                value = self.config.date_parser.parse(value, fuzzy=True)
                             except ValueError:
                                 value = None
                     break
             if value:
+                self.config.selector_stats.record(selector, s)
                 break
 
         if value is None and required:
@@ -148,6 +283,42 @@ class Parsable:
         """
         return self.safe_parse(self.simple_parse, selector=selector, **kwargs)
 
+    def _get_selection(self,
+                       selector: str) -> List[Tag]:
+        if self.parsed is None:
+            return []
+
+        if self._selections is None or self._selections_parsed is not self.parsed:
+            self._selections = self._extract_selections()
+            self._selections_parsed = self.parsed
+
+        if selector not in self._selections:
+            self._selections[selector] = util.compile_selector(selector).select(self.parsed)
+
+        return self._selections[selector]
+
+    def _extract_selections(self) -> Dict[str, List[Tag]]:
+        selectors: List[str] = []
+        for name in self.FIELD_SELECTOR_NAMES:
+            value = getattr(self.config.selectors, name, None)
+            for s in [value] if isinstance(value, str) else value or []:
+                if s not in selectors:
+                    selectors.append(s)
+
+        selections: Dict[str, List[Tag]] = {s: [] for s in selectors}
+        if not selectors:
+            return selections
+
+        # Walk ``parsed`` once with all the selectors combined, then sort out which selectors matched each of
+        # the (relatively few) matched tags, which keeps each selector's matches in document order
+        compiled_selectors = [(s, util.compile_selector(s)) for s in selectors]
+        for tag in util.compile_selector(", ".join(selectors)).select(self.parsed):
+            for s, compiled in compiled_selectors:
+                if compiled.match(tag):
+                    selections[s].append(tag)
+
+        return selections
+
     def with_base_url(self,
                       url: str) -> str:
         """
@@ -161,24 +332,25 @@ class Parsable:
         return url
 
     def to_currency(self,
-                    value: Union[str, int, float]) -> Union[int, float, None]:
+                    value: Union[str, int, float, Decimal, None]) -> Union[int, float, Decimal, None]:
         """
-        Clean up a currency, stripping non-numeric values and returning it as a primitive.
+        Clean up a currency, stripping non-numeric values and returning it as a primitive (or a
+        :class:`~decimal.Decimal`, if ``currency_as_decimal`` is enabled in the config). Currencies are parsed with
+        the config's :class:`~amazonorders.currency.CurrencyParser`, using the separators of the marketplace.
 
         :param value: The currency to parse.
         :return: The currency as a primitive.
         """
-        if isinstance(value, (int, float)):
-            return value
+        return self.config.currency_parser.parse(value)
 
-        if not value:
-            return None
 
-        value = value.strip()
-        value = re.sub("[a-zA-Z$£€,]+", "", value)
-        currency = util.to_type(value)
+class _LazyField:
+    """
+    The marker returned by :func:`Parsable.lazy`.
+    """
 
-        if isinstance(currency, str):
-            return None
+    __slots__ = ("parse_function",)
 
-        return currency
+    def __init__(self,
+                 parse_function: Callable[[], Any]) -> None:
+        self.parse_function = parse_function
@@ -17,6 +17,12 @@ class Recipient(Parsable):
     The person receiving an Amazon :class:`~amazonorders.entity.order.Order`.
     """
 
+    FIELD_SELECTOR_NAMES = ["FIELD_RECIPIENT_NAME_SELECTOR",
+                            "FIELD_RECIPIENT_ADDRESS1_SELECTOR",
+                            "FIELD_RECIPIENT_ADDRESS2_SELECTOR",
+                            "FIELD_RECIPIENT_ADDRESS_CITY_STATE_POSTAL_SELECTOR",
+                            "FIELD_RECIPIENT_ADDRESS_COUNTRY_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig) -> None:
@@ -26,7 +32,7 @@ class Recipient(Parsable):
         self.name: str = self.safe_simple_parse(selector=self.config.selectors.FIELD_RECIPIENT_NAME_SELECTOR,
                                                 required=True)
         #: The Recipient address.
-        self.address: Optional[str] = self.safe_parse(self._parse_address)
+        self.address: Optional[str] = self.lazy(lambda: self.safe_parse(self._parse_address))
 
     def __repr__(self) -> str:
         return f"<Recipient: \"{self.name}\">"
@@ -17,17 +17,21 @@ class Seller(Parsable):
     An Amazon Seller of an Amazon :class:`~amazonorders.entity.item.Item`.
     """
 
+    FIELD_SELECTOR_NAMES = ["FIELD_SELLER_NAME_SELECTOR",
+                            "FIELD_SELLER_LINK_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig) -> None:
         super().__init__(parsed, config)
 
         #: The Seller name.
-        self.name: str = self.safe_simple_parse(self.config.selectors.FIELD_SELLER_NAME_SELECTOR,
-                                                prefix_split="Sold by:")
+        self.name: str = self.lazy(lambda: self.safe_simple_parse(self.config.selectors.FIELD_SELLER_NAME_SELECTOR,
+                                                                  prefix_split="Sold by:"))
         #: The Seller link.
-        self.link: Optional[str] = self.safe_simple_parse(selector=self.config.selectors.FIELD_SELLER_LINK_SELECTOR,
-                                                          attr_name="href")
+        self.link: Optional[str] = self.lazy(lambda: self.safe_simple_parse(
+            selector=self.config.selectors.FIELD_SELLER_LINK_SELECTOR,
+            attr_name="href"))
 
     def __repr__(self) -> str:
         return f"<Seller: \"{self.name}\">"
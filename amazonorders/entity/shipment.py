@@ -6,7 +6,6 @@ from typing import List, Optional, TypeVar
 
 from bs4 import Tag
 
-from amazonorders import util
 from amazonorders.conf import AmazonOrdersConfig
 from amazonorders.entity.item import Item
 from amazonorders.entity.parsable import Parsable
@@ -21,20 +20,24 @@ class Shipment(Parsable):
     An Amazon Shipment, which should contain one or more :class:`~amazonorders.entity.item.Item`'s.
     """
 
+    FIELD_SELECTOR_NAMES = ["ITEM_ENTITY_SELECTOR",
+                            "FIELD_SHIPMENT_DELIVERY_STATUS_SELECTOR",
+                            "FIELD_SHIPMENT_TRACKING_LINK_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig) -> None:
         super().__init__(parsed, config)
 
         #: The Shipment Items.
-        self.items: List[Item] = self._parse_items()
+        self.items: List[Item] = self.lazy(self._parse_items)
         #: The Shipment delivery status.
-        self.delivery_status: Optional[str] = self.safe_simple_parse(
-            selector=self.config.selectors.FIELD_SHIPMENT_DELIVERY_STATUS_SELECTOR)
+        self.delivery_status: Optional[str] = self.lazy(lambda: self.safe_simple_parse(
+            selector=self.config.selectors.FIELD_SHIPMENT_DELIVERY_STATUS_SELECTOR))
         #: The Shipment tracking link.
-        self.tracking_link: Optional[str] = self.safe_simple_parse(
+        self.tracking_link: Optional[str] = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR,
-            attr_name="href")
+            attr_name="href"))
 
     def __repr__(self) -> str:
         return f"<Shipment: \"{self.items}\">"
@@ -54,7 +57,6 @@ class Shipment(Parsable):
             return []
 
         items: List[Item] = [self.config.item_cls(x, self.config)
-                             for x in util.select(self.parsed,
-                                                  self.config.selectors.ITEM_ENTITY_SELECTOR)]
+                             for x in self.select(self.config.selectors.ITEM_ENTITY_SELECTOR)]
         items.sort()
         return items
@@ -18,6 +18,12 @@ class Transaction(Parsable):
     An Amazon Transaction.
     """
 
+    FIELD_SELECTOR_NAMES = ["FIELD_TRANSACTION_PAYMENT_METHOD_SELECTOR",
+                            "FIELD_TRANSACTION_GRAND_TOTAL_SELECTOR",
+                            "FIELD_TRANSACTION_ORDER_NUMBER_SELECTOR",
+                            "FIELD_TRANSACTION_ORDER_LINK_SELECTOR",
+                            "FIELD_TRANSACTION_SELLER_NAME_SELECTOR"]
+
     def __init__(self,
                  parsed: Tag,
                  config: AmazonOrdersConfig,
@@ -27,21 +33,21 @@ class Transaction(Parsable):
         #: The Transaction completed date.
         self.completed_date: date = completed_date
         #: The Transaction payment method.
-        self.payment_method: str = self.safe_simple_parse(
+        self.payment_method: str = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_TRANSACTION_PAYMENT_METHOD_SELECTOR
-        )
+        ))
         #: The Transaction grand total.
-        self.grand_total: float = self.safe_parse(self._parse_grand_total)
+        self.grand_total: float = self.lazy(lambda: self.safe_parse(self._parse_grand_total))
         #: The Transaction was a refund or not.
-        self.is_refund: bool = self.grand_total > 0
+        self.is_refund: bool = self.lazy(lambda: self.grand_total > 0)
         #: The Transaction order number.
-        self.order_number: str = self.safe_parse(self._parse_order_number)
+        self.order_number: str = self.lazy(lambda: self.safe_parse(self._parse_order_number))
         #: The Transaction order details link.
-        self.order_details_link: str = self.safe_parse(self._parse_order_details_link)
+        self.order_details_link: str = self.lazy(lambda: self.safe_parse(self._parse_order_details_link))
         #: The Transaction seller name.
-        self.seller: str = self.safe_simple_parse(
+        self.seller: str = self.lazy(lambda: self.safe_simple_parse(
             selector=self.config.selectors.FIELD_TRANSACTION_SELLER_NAME_SELECTOR
-        )
+        ))
 
     def __repr__(self) -> str:
         return f"<Transaction {self.completed_date}: \"Order #{self.order_number}, Grand Total: {self.grand_total}\">"
@@ -6,8 +6,6 @@ from io import BytesIO
 from typing import Any, Dict, Optional, TYPE_CHECKING
 from urllib.parse import urlparse
 
-from PIL import Image
-from amazoncaptcha import AmazonCaptcha
 from bs4 import Tag
 
 from amazonorders import util
@@ -22,9 +20,10 @@ class AuthForm(ABC):
     """
     The base class of an authentication ``<form>`` that can be submitted.
 
-    The base implementation will attempt to auto-solve Captcha. If this fails, it will
-    use the default image view to show the Captcha prompt, and it will also pass the
-    image URL to :func:`~amazonorders.session.IODefault.prompt` as ``img_url``.
+    The base implementation will attempt to auto-solve Captcha with the session's
+    :class:`~amazonorders.captcha.CaptchaSolver`. If this fails, it will use the default image view to show the
+    Captcha prompt, and it will also pass the image URL to :func:`~amazonorders.session.IODefault.prompt` as
+    ``img_url``.
     """
 
     def __init__(self,
@@ -121,9 +120,14 @@ class AuthForm(ABC):
                 "Call AuthForm.select_form() first."
             )  # pragma: no cover
 
-        captcha_response = AmazonCaptcha.fromlink(url).solve()
-        if not captcha_response or captcha_response.lower() == "not solved":
-            img_response = self.amazon_session.session.get(url)
+        # Fetched with the session, so the image is downloaded over its pooled connections with its cookies
+        img_response = self.amazon_session.transport.request(self.amazon_session.session, "GET", url)
+
+        captcha_response = self.amazon_session.captcha_solver.solve(img_response.content)
+        if not captcha_response:
+            # Only loaded when a Captcha couldn't be auto-solved
+            from PIL import Image
+
             img = Image.open(BytesIO(img_response.content))
             img.show()
 
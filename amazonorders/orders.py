@@ -2,28 +2,158 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import datetime
+import itertools
 import logging
-from typing import List, Optional
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Callable, Deque, Generator, Iterable, List, Optional, Tuple, TYPE_CHECKING, TypeVar, Union
+
+from bs4 import SoupStrainer, Tag
 
 from amazonorders import util
 from amazonorders.conf import AmazonOrdersConfig
 from amazonorders.entity.order import Order
 from amazonorders.exception import AmazonOrdersError, AmazonOrdersNotFoundError
-from amazonorders.session import AmazonSession
+from amazonorders.session import AmazonSession, AmazonSessionResponse
+
+if TYPE_CHECKING:
+    from amazonorders.pipeline import ParsePipeline
 
 logger = logging.getLogger(__name__)
 
+#: The number of order history pages fetched ahead of the page whose Orders are being yielded by
+#: :func:`~AmazonOrders.iter_order_history`, so few pages are fetched needlessly if the iterator is closed early.
+#: When the whole history is fetched anyway, like by :func:`~AmazonOrders.get_order_history`, up to the
+#: ``max_workers`` config value are.
+HISTORY_PAGE_PREFETCH = 2
+
+T = TypeVar("T")
+
+
+def _iter_ahead(executor: Executor,
+                fn: Callable[[Any], T],
+                items: Iterable[Any],
+                window: int) -> Generator[T, None, None]:
+    # Like Executor.map(), but items are only submitted ``window`` ahead of the result being yielded, and items not
+    # yet started are cancelled if the iterator is closed early
+    items_iter = iter(items)
+    futures: Deque[Future] = deque(executor.submit(fn, item) for item in itertools.islice(items_iter, window))
+    try:
+        while futures:
+            result = futures.popleft().result()
+            futures.extend(executor.submit(fn, item) for item in itertools.islice(items_iter, 1))
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _build_history_page_strainer(config: AmazonOrdersConfig) -> Optional[SoupStrainer]:
+    # When enabled, only the Order cards and pagination of history pages are parsed
+    return util.build_strainer(
+        config.selectors.ORDER_HISTORY_ENTITY_SELECTOR,
+        config.selectors.NEXT_PAGE_LINK_SELECTOR,
+        config.selectors.PAGE_LINK_SELECTOR,
+        config.selectors.ORDER_HISTORY_COUNT_SELECTOR
+    ) if config.restrict_history_parse else None
+
+
+def _parse_history_page_html(html: str,
+                             config: AmazonOrdersConfig,
+                             strainer: Optional[SoupStrainer]) -> Tag:
+    if strainer is not None:
+        response_parsed = util.parse_html(html, config.bs4_parser, parse_only=strainer)
+        if util.select_one(response_parsed, config.selectors.ORDER_HISTORY_ENTITY_SELECTOR):
+            return response_parsed
+
+        logger.debug("No Orders found parsing only the Order cards of the history page, parsing the full page")
+
+    return util.parse_html(html, config.bs4_parser)
+
+
+def _get_next_page(response_parsed: Tag,
+                   start_index: Optional[int],
+                   config: AmazonOrdersConfig) -> Optional[str]:
+    if start_index is not None:
+        logger.debug("start_index is given, not paging")
+
+        return None
+
+    next_page_tag = util.select_one(response_parsed, config.selectors.NEXT_PAGE_LINK_SELECTOR)
+    if not next_page_tag:
+        logger.debug("No next page")
+
+        return None
+
+    next_page = str(next_page_tag["href"])
+    if not next_page.startswith("http"):
+        next_page = f"{config.constants.BASE_URL}{next_page}"
+
+    return next_page
+
+
+def _get_remaining_pages(response_parsed: Tag,
+                         next_page: str,
+                         config: AmazonOrdersConfig) -> List[str]:
+    start_index_pattern = re.compile(rf"{config.constants.HISTORY_START_INDEX_QUERY_PARAM}=(\d+)")
+
+    next_match = start_index_pattern.search(next_page)
+    if not next_match:
+        return [next_page]
+
+    last_start_index = None
+    for page_link_tag in util.select(response_parsed, config.selectors.PAGE_LINK_SELECTOR):
+        page_match = start_index_pattern.search(str(page_link_tag.get("href", "")))
+        if page_match:
+            last_start_index = max(int(page_match.group(1)), last_start_index or 0)
+
+    if last_start_index is None:
+        count_tag = util.select_one(response_parsed, config.selectors.ORDER_HISTORY_COUNT_SELECTOR)
+        count_match = re.search(r"\d+", count_tag.text.replace(",", "")) if count_tag else None
+        if not count_match:
+            logger.debug("Page count not found, paging one at a time")
+
+            return [next_page]
+
+        page_size = config.constants.HISTORY_PAGE_SIZE
+        last_start_index = (max(int(count_match.group(0)), 1) - 1) // page_size * page_size
+
+    # If the page count was wrong, the last page will still have a next page link, which will be followed
+    return [start_index_pattern.sub(f"{config.constants.HISTORY_START_INDEX_QUERY_PARAM}={i}", next_page)
+            for i in range(int(next_match.group(1)),
+                           last_start_index + 1,
+                           config.constants.HISTORY_PAGE_SIZE)] or [next_page]
+
+
+def _get_history_page_urls(response_parsed: Tag,
+                           start_index: Optional[int],
+                           fan_out: bool,
+                           config: AmazonOrdersConfig) -> List[str]:
+    # The URLs of the pages to fetch after this one: all of the remaining pages if ``fan_out``, otherwise the next
+    next_page = _get_next_page(response_parsed, start_index, config)
+    if not next_page:
+        return []
+
+    return _get_remaining_pages(response_parsed, next_page, config) if fan_out else [next_page]
+
 
 class AmazonOrders:
     """
     Using an authenticated :class:`~amazonorders.session.AmazonSession`, can be used to query Amazon
     for Order details and history.
+
+    If a :class:`~amazonorders.pipeline.ParsePipeline` is given, pages are still fetched on threads, but parsed,
+    and their Orders built, in the pipeline's worker processes.
     """
 
     def __init__(self,
                  amazon_session: AmazonSession,
                  debug: Optional[bool] = None,
-                 config: Optional[AmazonOrdersConfig] = None) -> None:
+                 config: Optional[AmazonOrdersConfig] = None,
+                 pipeline: Optional["ParsePipeline"] = None) -> None:
         if not debug:
             debug = amazon_session.debug
         if not config:
@@ -33,82 +163,121 @@ class AmazonOrders:
         self.amazon_session: AmazonSession = amazon_session
         #: The AmazonOrdersConfig to use.
         self.config: AmazonOrdersConfig = config
+        #: The pipeline that pages are parsed in, if parsing should be done in worker processes. Orders built by the
+        #: pipeline are always detached.
+        self.pipeline: Optional["ParsePipeline"] = pipeline
 
         #: Set logger ``DEBUG`` and send output to ``stderr``.
         self.debug: bool = debug
         if self.debug:
             logger.setLevel(logging.DEBUG)
 
+        self._history_page_strainer = _build_history_page_strainer(self.config)
+
     def get_order_history(self,
                           year: int = datetime.date.today().year,
                           start_index: Optional[int] = None,
-                          full_details: bool = False) -> List[Order]:
+                          full_details: bool = False,
+                          detach: Optional[bool] = None) -> List[Order]:
         """
-        Get the Amazon order history for the given year.
+        Get the Amazon order history for the given year. Once the first page is parsed, the remaining pages are
+        fetched concurrently, up to the ``max_workers`` config value.
 
         :param year: The year for which to get history.
         :param start_index: The index to start at within the history.
         :param full_details: Will execute an additional request per Order in the retrieved history to fully
-            populate it.
+            populate it. These requests are executed concurrently, up to the ``max_workers`` config value.
+        :param detach: Detach each Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
         :return: A list of the requested Orders.
         """
-        if not self.amazon_session.is_authenticated:
-            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
+        return list(self._iter_order_history(year, start_index, full_details, detach, self.config.max_workers))
 
-        self.amazon_session.get(self.config.constants.ORDER_HISTORY_LANDING_URL)
+    def iter_order_history(self,
+                           year: int = datetime.date.today().year,
+                           start_index: Optional[int] = None,
+                           full_details: bool = False,
+                           detach: Optional[bool] = None) -> Generator[Order, None, None]:
+        """
+        Get the Amazon order history for the given year, yielding each Order as soon as it has been parsed (and,
+        with ``full_details``, its details page fetched).
 
-        orders = []
-        optional_start_index = f"&startIndex={start_index}" if start_index else ""
-        next_page: Optional[str] = (
-            "{url}?{query_param}=year-{year}{optional_start_index}"
-        ).format(
-            url=self.config.constants.ORDER_HISTORY_URL,
-            query_param=self.config.constants.HISTORY_FILTER_QUERY_PARAM,
-            year=year,
-            optional_start_index=optional_start_index
-        )
+        Once the first page is parsed, the URLs of the remaining pages are computed from its pagination (or its total
+        order count), and up to ``HISTORY_PAGE_PREFETCH`` of those pages are fetched concurrently in the background
+        while Orders are yielded in the history's order (:func:`get_order_history` instead fetches up to the
+        ``max_workers`` config value of them at once). If neither can be found, each next page is instead fetched
+        while the Orders of the current page are being yielded. If the iterator is closed early, pages not yet
+        fetched are not fetched.
 
-        while next_page:
-            self.amazon_session.get(next_page)
-            response_parsed = self.amazon_session.last_response_parsed
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it. These requests are executed concurrently, up to the ``max_workers`` config value.
+        :param detach: Detach each Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: An iterator of the requested Orders.
+        """
+        return self._iter_order_history(year, start_index, full_details, detach, HISTORY_PAGE_PREFETCH)
 
-            for order_tag in util.select(response_parsed, self.config.selectors.ORDER_HISTORY_ENTITY_SELECTOR):
-                order: Order = self.config.order_cls(order_tag, self.config)
+    def get_order_history_range(self,
+                                start_year: int,
+                                end_year: int = datetime.date.today().year,
+                                full_details: bool = False,
+                                detach: Optional[bool] = None) -> List[Order]:
+        """
+        Get the Amazon order history for every year in the given range, inclusive. See
+        :func:`iter_order_history_range` for details.
 
-                if full_details:
-                    if not order.order_details_link:
-                        logger.warning(f"order_details_link for Order {order.order_number} did not populate, "
-                                       f"cannot read full details.")
+        :param start_year: The first year for which to get history.
+        :param end_year: The last year for which to get history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it.
+        :param detach: Detach each Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: A list of the requested Orders, in order of the date they were placed.
+        """
+        return list(self.iter_order_history_range(start_year, end_year, full_details, detach))
 
-                        continue
+    def iter_order_history_range(self,
+                                 start_year: int,
+                                 end_year: int = datetime.date.today().year,
+                                 full_details: bool = False,
+                                 detach: Optional[bool] = None) -> Generator[Order, None, None]:
+        """
+        Get the Amazon order history for every year in the given range, inclusive. Years are fetched concurrently,
+        sharing the session's request budget of ``max_workers`` concurrent requests.
 
-                    self.amazon_session.get(order.order_details_link)
-                    order_details_tag = util.select_one(self.amazon_session.last_response_parsed,
-                                                        self.config.selectors.ORDER_DETAILS_ENTITY_SELECTOR)
-                    order = self.config.order_cls(order_details_tag, self.config, full_details=True, clone=order)
+        Orders are yielded in order of the date they were placed, and each year's Orders are yielded as soon as that
+        year (and all the years before it) have been fetched.
 
-                orders.append(order)
+        :param start_year: The first year for which to get history.
+        :param end_year: The last year for which to get history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it.
+        :param detach: Detach each Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
+        :return: An iterator of the requested Orders, in order of the date they were placed.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
 
-            next_page = None
-            if start_index is None:
-                next_page_tag = util.select_one(response_parsed, self.config.selectors.NEXT_PAGE_LINK_SELECTOR)
-                if next_page_tag:
-                    next_page = str(next_page_tag["href"])
-                    if not next_page.startswith("http"):
-                        next_page = f"{self.config.constants.BASE_URL}{next_page}"
-                else:
-                    logger.debug("No next page")
-            else:
-                logger.debug("start_index is given, not paging")
+        if start_year > end_year:
+            raise AmazonOrdersError(f"start_year {start_year} must not be after end_year {end_year}.")
 
-        return orders
+        self.amazon_session.visit(self.config.constants.ORDER_HISTORY_LANDING_URL)
+
+        return self._iter_order_history_range(start_year, end_year, full_details,
+                                              self.config.detach_entities if detach is None else detach)
 
     def get_order(self,
-                  order_id: str) -> Order:
+                  order_id: str,
+                  detach: Optional[bool] = None) -> Order:
         """
         Get the Amazon order represented by the ID.
 
         :param order_id: The Amazon Order ID to lookup.
+        :param detach: Detach the Order (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the page it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
         :return: The requested Order.
         """
         if not self.amazon_session.is_authenticated:
@@ -118,8 +287,172 @@ class AmazonOrders:
         if not self.amazon_session.last_response.url.startswith(self.config.constants.ORDER_DETAILS_URL):
             raise AmazonOrdersNotFoundError(f"Amazon redirected, which likely means Order {order_id} was not found.")
 
+        if self.pipeline:
+            return self.pipeline.parse_order_details(self.amazon_session.last_response)
+
         order_details_tag = util.select_one(self.amazon_session.last_response_parsed,
-                                            self.config.selectors.ORDER_DETAILS_ENTITY_SELECTOR)
+                                            self.config.selectors.ORDER_DETAILS_ENTITY_SELECTOR,
+                                            self.config.selector_stats)
         order: Order = self.config.order_cls(order_details_tag, self.config, full_details=True)
 
+        if self.config.detach_entities if detach is None else detach:
+            order.detach()
+
+        return order
+
+    def _iter_order_history(self,
+                            year: int,
+                            start_index: Optional[int],
+                            full_details: bool,
+                            detach: Optional[bool],
+                            page_prefetch: int) -> Generator[Order, None, None]:
+        # Not a generator itself, so these are checked when called, rather than on the first Order
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
+
+        self.amazon_session.visit(self.config.constants.ORDER_HISTORY_LANDING_URL)
+
+        return self._iter_year_order_history(year, start_index, full_details,
+                                             self.config.detach_entities if detach is None else detach, page_prefetch)
+
+    def _iter_order_history_range(self,
+                                  start_year: int,
+                                  end_year: int,
+                                  full_details: bool,
+                                  detach: bool) -> Generator[Order, None, None]:
+        years = range(start_year, end_year + 1)
+        # Signals years still being fetched to stop if the consumer stops early
+        stop = threading.Event()
+        # Every year's requests are made in one executor, so no more than ``max_workers`` are made at once across all
+        # years. The years themselves only wait on their requests, so are run in a separate executor, since waiting
+        # in the same one could deadlock
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor, \
+                ThreadPoolExecutor(max_workers=min(len(years), self.config.max_workers)) as year_executor:
+            try:
+                with closing(_iter_ahead(year_executor,
+                                         lambda year: self._get_year_order_history(year, None, full_details, detach,
+                                                                                   stop, executor),
+                                         years,
+                                         self.config.max_workers)) as year_orders:
+                    for orders in year_orders:
+                        yield from sorted(orders, key=lambda o: o.order_placed_date or datetime.date.min)
+            finally:
+                stop.set()
+
+    def _get_year_order_history(self,
+                                year: int,
+                                start_index: Optional[int],
+                                full_details: bool,
+                                detach: bool = False,
+                                stop: Optional[threading.Event] = None,
+                                executor: Optional[Executor] = None) -> List[Order]:
+        orders = []
+        with closing(self._iter_year_order_history(year, start_index, full_details, detach,
+                                                   self.config.max_workers, executor)) as year_orders:
+            for order in year_orders:
+                if stop is not None and stop.is_set():
+                    break
+
+                orders.append(order)
+        return orders
+
+    def _iter_year_order_history(self,
+                                 year: int,
+                                 start_index: Optional[int],
+                                 full_details: bool,
+                                 detach: bool = False,
+                                 page_prefetch: int = HISTORY_PAGE_PREFETCH,
+                                 executor: Optional[Executor] = None) -> Generator[Order, None, None]:
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+                yield from self._iter_year_order_history(year, start_index, full_details, detach, page_prefetch,
+                                                         executor)
+            return
+
+        optional_start_index = f"&startIndex={start_index}" if start_index else ""
+        first_page = (
+            "{url}?{query_param}=year-{year}{optional_start_index}"
+        ).format(
+            url=self.config.constants.ORDER_HISTORY_URL,
+            query_param=self.config.constants.HISTORY_FILTER_QUERY_PARAM,
+            year=year,
+            optional_start_index=optional_start_index
+        )
+
+        # Only the first page fans out to all the remaining pages, after that each page's next page is followed
+        page_futures: Deque[Future] = deque([executor.submit(self._get_history_page, first_page, start_index,
+                                                             start_index is None)])
+        page_urls: Deque[str] = deque()
+        try:
+            while page_futures:
+                order_tags, next_page_urls = page_futures.popleft().result()
+
+                if not page_futures and not page_urls:
+                    page_urls.extend(next_page_urls)
+                # Fetch the next pages while this page's Orders are built and consumed, but no more than
+                # ``page_prefetch`` ahead, so pages aren't fetched if the consumer stops early
+                while page_urls and len(page_futures) < page_prefetch:
+                    page_futures.append(executor.submit(self._get_history_page, page_urls.popleft(),
+                                                        start_index, False))
+
+                # Results are returned in the order submitted, so the history's order is maintained
+                with closing(_iter_ahead(executor,
+                                         lambda t: self._build_order(t, full_details, detach),
+                                         order_tags,
+                                         self.config.max_workers)) as orders:
+                    for order in orders:
+                        if order:
+                            yield order
+        finally:
+            # If the consumer stopped early, don't wait on pages that haven't started
+            for page_future in page_futures:
+                page_future.cancel()
+
+    def _get_history_page(self,
+                          url: str,
+                          start_index: Optional[int],
+                          fan_out: bool) -> Tuple[List[Union[Tag, Order]], List[str]]:
+        page_response = self.amazon_session.scoped_request("GET", url)
+
+        if self.pipeline:
+            orders, page_urls = self.pipeline.parse_history_page(page_response.response, start_index, fan_out)
+            return list(orders), page_urls
+
+        response_parsed = self._parse_history_page(page_response)
+        order_tags = util.select(response_parsed,
+                                 self.config.selectors.ORDER_HISTORY_ENTITY_SELECTOR,
+                                 self.config.selector_stats)
+
+        return list(order_tags), _get_history_page_urls(response_parsed, start_index, fan_out, self.config)
+
+    def _parse_history_page(self,
+                            page_response: AmazonSessionResponse) -> Tag:
+        return _parse_history_page_html(page_response.response.text, self.config, self._history_page_strainer)
+
+    def _build_order(self,
+                     order_tag: Union[Tag, Order],
+                     full_details: bool,
+                     detach: bool = False) -> Optional[Order]:
+        # Orders built by the pipeline are passed as is
+        order: Order = self.config.order_cls(order_tag, self.config) if isinstance(order_tag, Tag) else order_tag
+
+        if full_details:
+            if not order.order_details_link:
+                logger.warning(f"order_details_link for Order {order.order_number} did not populate, "
+                               f"cannot read full details.")
+
+                return None
+
+            order_details_response = self.amazon_session.scoped_request("GET", order.order_details_link)
+            if self.pipeline:
+                return self.pipeline.parse_order_details(order_details_response.response, clone=order)
+
+            order_details_tag = util.select_one(order_details_response.parsed,
+                                                self.config.selectors.ORDER_DETAILS_ENTITY_SELECTOR,
+                                                self.config.selector_stats)
+            order = self.config.order_cls(order_details_tag, self.config, full_details=True, clone=order)
+
+        if detach:
+            order.detach()
+
         return order
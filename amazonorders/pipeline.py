@@ -0,0 +1,222 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from bs4 import SoupStrainer
+from requests import Response
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.entity.order import Order
+from amazonorders.entity.transaction import Transaction
+from amazonorders.orders import _build_history_page_strainer, _get_history_page_urls, _parse_history_page_html
+from amazonorders.transactions import _parse_transaction_form_tag
+
+logger = logging.getLogger(__name__)
+
+# The persistent ID the config is pickled as, so entities cross between processes without it
+_CONFIG_ID = "config"
+
+# Set in each worker process by _init_worker()
+_worker_config: Optional[AmazonOrdersConfig] = None
+_worker_history_page_strainer: Optional[SoupStrainer] = None
+
+
+class _EntityPickler(pickle.Pickler):
+    def __init__(self,
+                 file: io.BytesIO,
+                 config: AmazonOrdersConfig) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+
+        self._config = config
+
+    def persistent_id(self,
+                      obj: Any) -> Optional[str]:
+        return _CONFIG_ID if obj is self._config else None
+
+
+class _EntityUnpickler(pickle.Unpickler):
+    def __init__(self,
+                 file: io.BytesIO,
+                 config: AmazonOrdersConfig) -> None:
+        super().__init__(file)
+
+        self._config = config
+
+    def persistent_load(self,
+                        pid: Any) -> AmazonOrdersConfig:
+        if pid != _CONFIG_ID:
+            raise pickle.UnpicklingError(f"Unsupported persistent ID: {pid}")
+        return self._config
+
+
+def _dumps(obj: Any,
+           config: AmazonOrdersConfig) -> bytes:
+    f = io.BytesIO()
+    _EntityPickler(f, config).dump(obj)
+    return f.getvalue()
+
+
+def _loads(data: bytes,
+           config: AmazonOrdersConfig) -> Any:
+    return _EntityUnpickler(io.BytesIO(data), config).load()
+
+
+def _decode(content: bytes,
+            encoding: Optional[str]) -> str:
+    return str(content, encoding or "utf-8", errors="replace")
+
+
+def _init_worker(config: AmazonOrdersConfig) -> None:
+    global _worker_config, _worker_history_page_strainer
+
+    _worker_config = config
+    _worker_history_page_strainer = _build_history_page_strainer(config)
+
+
+def _get_worker_config() -> AmazonOrdersConfig:
+    if _worker_config is None:
+        raise RuntimeError("The worker was not initialized with a config.")
+    return _worker_config
+
+
+def _parse_history_page(content: bytes,
+                        encoding: Optional[str],
+                        start_index: Optional[int],
+                        fan_out: bool) -> bytes:
+    config = _get_worker_config()
+
+    response_parsed = _parse_history_page_html(_decode(content, encoding), config, _worker_history_page_strainer)
+
+    orders = []
+    for order_tag in util.select(response_parsed, config.selectors.ORDER_HISTORY_ENTITY_SELECTOR,
+                                 config.selector_stats):
+        order = config.order_cls(order_tag, config)
+        order.detach()
+        orders.append(order)
+
+    return _dumps((orders, _get_history_page_urls(response_parsed, start_index, fan_out, config)), config)
+
+
+def _parse_order_details(content: bytes,
+                         encoding: Optional[str],
+                         clone: Optional[bytes]) -> bytes:
+    config = _get_worker_config()
+
+    response_parsed = util.parse_html(_decode(content, encoding), config.bs4_parser)
+    order_details_tag = util.select_one(response_parsed,
+                                        config.selectors.ORDER_DETAILS_ENTITY_SELECTOR,
+                                        config.selector_stats)
+    order = config.order_cls(order_details_tag, config, full_details=True,
+                             clone=_loads(clone, config) if clone else None)
+    order.detach()
+
+    return _dumps(order, config)
+
+
+def _parse_transactions_page(content: bytes,
+                             encoding: Optional[str]) -> bytes:
+    config = _get_worker_config()
+
+    response_parsed = util.parse_html(_decode(content, encoding), config.bs4_parser)
+    form_tag = util.select_one(response_parsed, config.selectors.TRANSACTION_HISTORY_FORM_SELECTOR)
+
+    return _dumps(_parse_transaction_form_tag(form_tag, config, detach=True) if form_tag else None, config)
+
+
+class ParsePipeline:
+    """
+    Parses pages, and builds their entities, in a pool of worker processes, so parsing isn't serialized by the GIL
+    with the threads fetching pages, and throughput scales with the number of cores. Pass it to
+    :class:`~amazonorders.orders.AmazonOrders` or :class:`~amazonorders.transactions.AmazonTransactions`, which
+    continue to fetch pages on threads, then hand each page's raw content to the pipeline.
+
+    Each worker is sent the config once, when it starts. Entities are detached (see
+    :func:`~amazonorders.entity.parsable.Parsable.detach`) before they're sent back, so their parsed HTML never
+    crosses between processes, and they're pickled without the config, which is replaced with this pipeline's
+    ``config`` when they're unpickled.
+
+    The config is rebuilt in each worker from its ``config_path`` and values, so changes made at runtime to its
+    ``constants`` or ``selectors`` aren't seen by the workers, and selector stats recorded in the workers aren't
+    reflected in the config's ``selector_stats``.
+    """
+
+    def __init__(self,
+                 config: AmazonOrdersConfig,
+                 max_processes: Optional[int] = None,
+                 mp_context: Optional[str] = None) -> None:
+        #: The AmazonOrdersConfig to use.
+        self.config: AmazonOrdersConfig = config
+        #: The number of worker processes. Defaults to the number of CPUs.
+        self.max_processes: int = max_processes or os.cpu_count() or 1
+
+        self._executor = ProcessPoolExecutor(max_workers=self.max_processes,
+                                             mp_context=multiprocessing.get_context(mp_context),
+                                             initializer=_init_worker,
+                                             initargs=(self.config,))
+
+    def __enter__(self) -> "ParsePipeline":
+        return self
+
+    def __exit__(self,
+                 *args: Any) -> None:
+        self.close()
+
+    def parse_history_page(self,
+                           response: Response,
+                           start_index: Optional[int] = None,
+                           fan_out: bool = False) -> Tuple[List[Order], List[str]]:
+        """
+        Parse an order history page, blocking until a worker has parsed it.
+
+        :param response: The order history page.
+        :param start_index: The index the page starts at within the history, if given, in which case there are no
+            more pages to fetch.
+        :param fan_out: If the URLs of all the remaining pages should be returned, rather than just the next page.
+        :return: The page's Orders, and the URLs of the pages to fetch after it.
+        """
+        return self._submit(_parse_history_page, response, start_index, fan_out)
+
+    def parse_order_details(self,
+                            response: Response,
+                            clone: Optional[Order] = None) -> Order:
+        """
+        Parse an Order details page, blocking until a worker has parsed it.
+
+        :param response: The Order details page.
+        :param clone: The Order, already parsed from an order history page, to populate fields not on the details
+            page from.
+        :return: The Order.
+        """
+        return self._submit(_parse_order_details, response, _dumps(clone, self.config) if clone else None)
+
+    def parse_transactions_page(self,
+                                response: Response) \
+            -> Optional[Tuple[List[Transaction], Optional[str], Optional[Dict[str, str]]]]:
+        """
+        Parse a transaction history page, blocking until a worker has parsed it.
+
+        :param response: The transaction history page.
+        :return: The page's Transactions, and the URL and data to POST for the next page, or ``None`` if the page
+            has no transactions form.
+        """
+        return self._submit(_parse_transactions_page, response)
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _submit(self,
+                fn: Any,
+                response: Response,
+                *args: Any) -> Any:
+        return _loads(self._executor.submit(fn, response.content, response.encoding, *args).result(), self.config)
@@ -0,0 +1,412 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from amazonorders.captcha import CaptchaSolver
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.entity.order import Order
+from amazonorders.entity.transaction import Transaction
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.orders import AmazonOrders
+from amazonorders.session import AmazonSession, IODefault
+from amazonorders.transactions import AmazonTransactions
+from amazonorders.transport import Transport
+
+logger = logging.getLogger(__name__)
+
+
+class PooledAccount:
+    """
+    An account in an :class:`AmazonSessionPool`, with its own :class:`~amazonorders.session.AmazonSession` (and so
+    its own cookie jar), and the :class:`~amazonorders.orders.AmazonOrders` and
+    :class:`~amazonorders.transactions.AmazonTransactions` that use it.
+    """
+
+    def __init__(self,
+                 name: str,
+                 amazon_session: AmazonSession) -> None:
+        #: The name the account was added to the pool with.
+        self.name: str = name
+        #: The AmazonSession of the account.
+        self.amazon_session: AmazonSession = amazon_session
+        #: The AmazonOrders of the account.
+        self.amazon_orders: AmazonOrders = AmazonOrders(amazon_session)
+        #: The AmazonTransactions of the account.
+        self.amazon_transactions: AmazonTransactions = AmazonTransactions(amazon_session)
+
+        #: The number of jobs that have run, including those that failed.
+        self.jobs: int = 0
+        #: The number of jobs that raised an error.
+        self.failed: int = 0
+        #: The number of entities (for example, Orders or Transactions) returned by completed jobs.
+        self.entities: int = 0
+        #: The total number of seconds jobs have spent running.
+        self.busy_time: float = 0.0
+        #: The total number of seconds jobs have spent queued, waiting for their turn.
+        self.wait_time: float = 0.0
+
+        # Jobs waiting for their turn, and the number running
+        self._queue: Deque[Tuple[Future, Callable, Tuple, Dict[str, Any], float]] = deque()
+        self._running: int = 0
+
+    @property
+    def config(self) -> AmazonOrdersConfig:
+        """
+        The AmazonOrdersConfig of the account's session.
+        """
+        return self.amazon_session.config
+
+
+class AmazonSessionPool:
+    """
+    Holds the :class:`~amazonorders.session.AmazonSession` of many Amazon accounts, each with its own
+    :class:`~amazonorders.conf.AmazonOrdersConfig` (and so its own cookie jar), and schedules jobs (logins, order
+    history, Order details, and transactions) across them.
+
+    No more than ``max_workers`` jobs run at once across all accounts, and no more than ``max_jobs_per_account``
+    on a single account (by default one, since :class:`~amazonorders.orders.AmazonOrders` and
+    :class:`~amazonorders.transactions.AmazonTransactions` use the session's ``last_response``). When a worker
+    frees up, the next job is taken from the accounts in turn, so an account with many queued jobs doesn't starve
+    the others. Within a job, an account's requests are still executed concurrently, up to its own ``max_workers``.
+
+    If a ``transport`` is given, it's shared by every account's session, so its ``rate_limit`` applies to the pool
+    as a whole. Every account's session shares the pool's ``captcha_solver``, so accounts that hit a Captcha while
+    logging in concurrently are solved in its worker processes (one per ``max_workers``), and share its cache of
+    solutions.
+
+    Each account's throughput is reported by :attr:`stats`.
+    """
+
+    def __init__(self,
+                 config: Optional[AmazonOrdersConfig] = None,
+                 max_workers: Optional[int] = None,
+                 max_jobs_per_account: int = 1,
+                 transport: Optional[Transport] = None) -> None:
+        if not config:
+            config = AmazonOrdersConfig()
+
+        #: The AmazonOrdersConfig that account configs are derived from, if an account isn't added with its own.
+        self.config: AmazonOrdersConfig = config
+        #: The maximum number of jobs running at once, across all accounts. Defaults to the ``max_workers`` config
+        #: value.
+        self.max_workers: int = max_workers or self.config.max_workers
+        #: The maximum number of jobs running at once on a single account.
+        self.max_jobs_per_account: int = max_jobs_per_account
+        #: The transport shared by every account's session, if any.
+        self.transport: Optional[Transport] = transport
+        #: The Captcha solver shared by every account's session.
+        self.captcha_solver: CaptchaSolver = CaptchaSolver(max_processes=self.max_workers)
+        #: The accounts in the pool, keyed by name.
+        self.accounts: Dict[str, PooledAccount] = {}
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="amazon-orders-pool")
+        # The accounts in the order they'll next be offered a worker
+        self._rotation: Deque[str] = deque()
+        self._in_flight = 0
+
+    def __enter__(self) -> "AmazonSessionPool":
+        return self
+
+    def __exit__(self,
+                 *args: Any) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        The ``jobs`` completed, jobs ``failed``, ``entities`` returned, jobs ``queued``, ``busy_time`` and
+        ``wait_time`` (in seconds), and ``throughput`` (entities per busy second) of each account, keyed by name.
+        """
+        with self._lock:
+            return {name: {"jobs": account.jobs,
+                           "failed": account.failed,
+                           "entities": account.entities,
+                           "queued": len(account._queue),
+                           "busy_time": account.busy_time,
+                           "wait_time": account.wait_time,
+                           "throughput": account.entities / account.busy_time if account.busy_time else 0.0}
+                    for name, account in self.accounts.items()}
+
+    def add_account(self,
+                    name: str,
+                    username: Optional[str],
+                    password: Optional[str],
+                    config: Optional[AmazonOrdersConfig] = None,
+                    io: IODefault = IODefault(),
+                    auth_forms: Optional[List] = None) -> PooledAccount:
+        """
+        Add an account to the pool.
+
+        :param name: A unique name for the account, used to submit jobs to it.
+        :param username: The account's Amazon username.
+        :param password: The account's Amazon password.
+        :param config: The account's AmazonOrdersConfig. If not given, one is created from this pool's ``config``,
+            with its config file, cookie jar, and store in ``accounts/<name>`` next to the pool's config file, and
+            its output in ``<name>`` in the pool's ``output_dir``.
+        :param io: The I/O handler for the account's echoes and prompts.
+        :param auth_forms: The list of form implementations to use with the account's authentication.
+        :return: The added account.
+        """
+        if name in self.accounts:
+            raise AmazonOrdersError(f"An account named \"{name}\" is already in the pool.")
+
+        if not config:
+            account_dir = os.path.join(os.path.dirname(self.config.config_path), "accounts", name)
+            data = dict(self.config._data)
+            data.update({"cookie_jar_path": os.path.join(account_dir, "cookies.json"),
+                         "store_path": os.path.join(account_dir, "orders.db"),
+                         "output_dir": os.path.join(self.config.output_dir, name)})
+            config = AmazonOrdersConfig(config_path=os.path.join(account_dir, "config.yml"), data=data)
+
+        if config.cookie_jar_path in [a.config.cookie_jar_path for a in self.accounts.values()]:
+            raise AmazonOrdersError(f"The cookie jar {config.cookie_jar_path} is already used by another account "
+                                    f"in the pool.")
+
+        amazon_session = AmazonSession(username,
+                                       password,
+                                       io=io,
+                                       config=config,
+                                       auth_forms=auth_forms,
+                                       transport=self.transport,
+                                       captcha_solver=self.captcha_solver)
+        account = PooledAccount(name, amazon_session)
+
+        with self._lock:
+            self.accounts[name] = account
+            self._rotation.append(name)
+
+        return account
+
+    def submit(self,
+               name: str,
+               fn: Callable[..., Any],
+               *args: Any,
+               **kwargs: Any) -> Future:
+        """
+        Queue a job on the given account. The job is run once a worker is free and it's the account's turn.
+
+        :param name: The name of the account.
+        :param fn: The job, which is called with the :class:`PooledAccount`, followed by ``args`` and ``kwargs``.
+        :param args: Positional arguments passed to ``fn``.
+        :param kwargs: Keyword arguments passed to ``fn``.
+        :return: A future for the value returned by ``fn``.
+        """
+        if name not in self.accounts:
+            raise AmazonOrdersError(f"No account named \"{name}\" is in the pool.")
+
+        future: Future = Future()
+        with self._lock:
+            self.accounts[name]._queue.append((future, fn, args, kwargs, time.monotonic()))
+            self._dispatch()
+
+        return future
+
+    def submit_login(self,
+                     name: str) -> Future:
+        """
+        Queue a login of the given account. See :func:`~amazonorders.session.AmazonSession.login`.
+
+        :param name: The name of the account.
+        :return: A future that completes when the account is logged in.
+        """
+        return self.submit(name, lambda account: account.amazon_session.login())
+
+    def submit_order_history(self,
+                             name: str,
+                             year: int = datetime.date.today().year,
+                             start_index: Optional[int] = None,
+                             full_details: bool = False,
+                             detach: Optional[bool] = None) -> Future:
+        """
+        Queue a fetch of the given account's order history. See
+        :func:`~amazonorders.orders.AmazonOrders.get_order_history`.
+
+        :param name: The name of the account.
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it.
+        :param detach: Detach each Order once it's built. Defaults to the ``detach_entities`` config value.
+        :return: A future for the list of Orders.
+        """
+        return self.submit(name,
+                           lambda account: account.amazon_orders.get_order_history(year, start_index, full_details,
+                                                                                   detach))
+
+    def submit_order(self,
+                     name: str,
+                     order_id: str,
+                     detach: Optional[bool] = None) -> Future:
+        """
+        Queue a fetch of an Order's details on the given account. See
+        :func:`~amazonorders.orders.AmazonOrders.get_order`.
+
+        :param name: The name of the account.
+        :param order_id: The Amazon Order ID to lookup.
+        :param detach: Detach the Order once it's built. Defaults to the ``detach_entities`` config value.
+        :return: A future for the Order.
+        """
+        return self.submit(name, lambda account: account.amazon_orders.get_order(order_id, detach))
+
+    def submit_transactions(self,
+                            name: str,
+                            days: int = 365,
+                            detach: Optional[bool] = None) -> Future:
+        """
+        Queue a fetch of the given account's Transactions. See
+        :func:`~amazonorders.transactions.AmazonTransactions.get_transactions`.
+
+        :param name: The name of the account.
+        :param days: The number of days worth of transactions to get.
+        :param detach: Detach each Transaction once it's built. Defaults to the ``detach_entities`` config value.
+        :return: A future for the list of Transactions.
+        """
+        return self.submit(name, lambda account: account.amazon_transactions.get_transactions(days, detach))
+
+    def login(self,
+              names: Optional[Iterable[str]] = None) -> None:
+        """
+        Log in the given accounts, scheduled across the pool.
+
+        :param names: The names of the accounts. Defaults to every account in the pool.
+        """
+        self._gather({name: self.submit_login(name) for name in self._get_names(names)})
+
+    def get_order_history(self,
+                          names: Optional[Iterable[str]] = None,
+                          year: int = datetime.date.today().year,
+                          full_details: bool = False,
+                          detach: Optional[bool] = None) -> Dict[str, List[Order]]:
+        """
+        Get the order history of the given accounts for the given year, scheduled across the pool.
+
+        :param names: The names of the accounts. Defaults to every account in the pool.
+        :param year: The year for which to get history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it.
+        :param detach: Detach each Order once it's built. Defaults to the ``detach_entities`` config value.
+        :return: The Orders of each account, keyed by name.
+        """
+        return self._gather({name: self.submit_order_history(name, year, full_details=full_details, detach=detach)
+                             for name in self._get_names(names)})
+
+    def get_transactions(self,
+                         names: Optional[Iterable[str]] = None,
+                         days: int = 365,
+                         detach: Optional[bool] = None) -> Dict[str, List[Transaction]]:
+        """
+        Get the Transactions of the given accounts for the given number of days, scheduled across the pool.
+
+        :param names: The names of the accounts. Defaults to every account in the pool.
+        :param days: The number of days worth of transactions to get.
+        :param detach: Detach each Transaction once it's built. Defaults to the ``detach_entities`` config value.
+        :return: The Transactions of each account, keyed by name.
+        """
+        return self._gather({name: self.submit_transactions(name, days, detach)
+                             for name in self._get_names(names)})
+
+    def close(self) -> None:
+        """
+        Wait for queued jobs to complete, then shut down the pool's workers (including the ``captcha_solver``'s)
+        and flush each account's cookies.
+        """
+        while True:
+            with self._lock:
+                futures = [job[0] for account in self.accounts.values() for job in account._queue]
+            if not futures:
+                break
+            # Unlike checking each future's result, waiting doesn't raise for jobs that were cancelled
+            wait(futures)
+
+        self._executor.shutdown(wait=True)
+        self.captcha_solver.close()
+
+        for account in self.accounts.values():
+            account.amazon_session.cookie_store.flush()
+
+    def _get_names(self,
+                   names: Optional[Iterable[str]]) -> List[str]:
+        return list(self.accounts) if names is None else list(names)
+
+    def _gather(self,
+                futures: Dict[str, Future]) -> Dict[str, Any]:
+        # Wait for every job, so one account's error doesn't leave the others running, then raise the first error
+        results = {}
+        error: Optional[BaseException] = None
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.debug(f"Job on account \"{name}\" failed", exc_info=True)
+                if error is None:
+                    error = e
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def _dispatch(self) -> None:
+        # Must be called with the lock held
+        while self._in_flight < self.max_workers:
+            account = self._get_next_account()
+            if not account:
+                break
+
+            job = account._queue.popleft()
+            account._running += 1
+            self._in_flight += 1
+
+            self._executor.submit(self._run, account, *job)
+
+    def _get_next_account(self) -> Optional[PooledAccount]:
+        # Take the first account in the rotation that has a queued job and room to run it, then send it to the back
+        for _ in range(len(self._rotation)):
+            account = self.accounts[self._rotation[0]]
+            self._rotation.rotate(-1)
+            if account._queue and account._running < self.max_jobs_per_account:
+                return account
+        return None
+
+    def _run(self,
+             account: PooledAccount,
+             future: Future,
+             fn: Callable[..., Any],
+             args: Tuple,
+             kwargs: Dict[str, Any],
+             queued: float) -> None:
+        start = time.monotonic()
+        result: Any = None
+        error: Optional[BaseException] = None
+
+        if future.set_running_or_notify_cancel():
+            try:
+                result = fn(account, *args, **kwargs)
+            except BaseException as e:
+                error = e
+
+        with self._lock:
+            if not future.cancelled():
+                account.jobs += 1
+                account.failed += 1 if error else 0
+                account.entities += len(result) if isinstance(result, list) else 1 if result is not None else 0
+                account.busy_time += time.monotonic() - start
+                account.wait_time += start - queued
+
+            account._running -= 1
+            self._in_flight -= 1
+            self._dispatch()
+
+        if error is not None:
+            future.set_exception(error)
+        elif not future.cancelled():
+            future.set_result(result)
@@ -34,6 +34,8 @@ class Selectors:
     ##########################################################################
 
     NEXT_PAGE_LINK_SELECTOR = "ul.a-pagination li.a-last a"
+    PAGE_LINK_SELECTOR = "ul.a-pagination li:not(.a-last) a"
+    ORDER_HISTORY_COUNT_SELECTOR = "span.num-orders"
 
     ##########################################################################
     # CSS selectors for Entities and Fields
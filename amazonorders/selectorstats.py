@@ -0,0 +1,151 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from amazonorders import util
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorStats:
+    """
+    Tracks which alternative of each fallback selector list (for example, ``ITEM_ENTITY_SELECTOR``) actually
+    matched, which shows the page layout Amazon is serving an account.
+
+    If ``adaptive`` is ``True``, :func:`order` puts the alternatives that have matched most often first, so a
+    layout that only matches a later alternative doesn't pay for a failed select of the whole page for each
+    alternative before it. This is used when selecting entities from a page (for example,
+    ``ORDER_HISTORY_ENTITY_SELECTOR``), where each alternative is for a different layout. Fields within an entity
+    are always tried in declared order, since all of their alternatives are matched in the entity's single
+    traversal anyway (see :class:`~amazonorders.entity.parsable.Parsable`), and a list like
+    ``FIELD_ORDER_NUMBER_SELECTOR`` goes from specific to general, so its order matters.
+
+    If ``stats_path`` is given, previously persisted stats are loaded from it, and :func:`save` persists them back
+    to it, which is also done when the interpreter exits.
+    """
+
+    def __init__(self,
+                 selectors: Any,
+                 adaptive: bool = False,
+                 stats_path: Optional[str] = None) -> None:
+        #: If alternatives should be reordered by how often they've matched.
+        self.adaptive: bool = adaptive
+        #: The path to the file where stats are persisted.
+        self.stats_path: Optional[str] = stats_path
+
+        self._lock = threading.Lock()
+        # Hits of each alternative, keyed by the selector list
+        self._hits: Dict[Tuple[str, ...], Dict[str, int]] = {}
+        # The ``Selectors`` attribute name of each list, so stats can be reported by name
+        self._names: Dict[Tuple[str, ...], str] = {}
+
+        for name in dir(selectors):
+            value = getattr(selectors, name)
+            if name.endswith("_SELECTOR") and isinstance(value, list) and len(value) > 1:
+                self._names[tuple(value)] = name
+
+        if self.stats_path:
+            self._load()
+
+            atexit.register(self._save_at_exit)
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        return state
+
+    def __setstate__(self,
+                     state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        The number of times each alternative has matched, keyed by the ``Selectors`` attribute name of the list
+        (or, if the list isn't on ``Selectors``, the alternatives joined with ``" | "``).
+        """
+        with self._lock:
+            return {self._get_name(key): dict(hits) for key, hits in self._hits.items()}
+
+    def order(self,
+              selector: List[str]) -> List[str]:
+        """
+        Get the order the given alternatives should be tried in. Unless ``adaptive`` is ``True``, this is the
+        declared order.
+
+        :param selector: The alternatives.
+        :return: The alternatives, most frequently matched first, if ``adaptive``.
+        """
+        if not self.adaptive or len(selector) < 2:
+            return selector
+
+        hits = self._hits.get(tuple(selector))
+        if not hits:
+            return selector
+
+        # sorted() is stable, so alternatives that haven't matched keep their declared order
+        return sorted(selector, key=lambda s: -hits.get(s, 0))
+
+    def record(self,
+               selector: List[str],
+               matched: str) -> None:
+        """
+        Record that the given alternative matched.
+
+        :param selector: The alternatives.
+        :param matched: The alternative that matched.
+        """
+        if len(selector) < 2:
+            return
+
+        key = tuple(selector)
+        with self._lock:
+            hits = self._hits.setdefault(key, {})
+            hits[matched] = hits.get(matched, 0) + 1
+
+    def save(self) -> None:
+        """
+        Persist the stats to ``stats_path``.
+        """
+        if not self.stats_path:
+            return
+
+        with self._lock:
+            data = [{"name": self._get_name(key), "selector": list(key), "hits": hits}
+                    for key, hits in self._hits.items()]
+
+        util.atomic_write(self.stats_path, json.dumps(data, indent=2), temp_prefix=".selector-stats-")
+
+        logger.debug(f"Selector stats written to {self.stats_path}")
+
+    def _save_at_exit(self) -> None:
+        try:
+            self.save()
+        except OSError:
+            logger.debug("Selector stats could not be written at exit", exc_info=True)
+
+    def _load(self) -> None:
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return
+
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            logger.warning(f"Selector stats at {self.stats_path} could not be read, starting over.")
+            return
+
+        with self._lock:
+            for entry in data:
+                self._hits[tuple(entry["selector"])] = dict(entry["hits"])
+
+    def _get_name(self,
+                  key: Tuple[str, ...]) -> str:
+        return self._names.get(key, " | ".join(key))
@@ -1,20 +1,26 @@
 __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
-import json
 import logging
 import os
-from typing import Any, List, Optional
-from urllib.parse import urlparse
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
-import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 from requests import Response, Session
 from requests.utils import dict_from_cookiejar
 
+from amazonorders import util
+from amazonorders.cache import ResponseCache, normalize_url
+from amazonorders.captcha import CaptchaSolver
+from amazonorders.capture import PageCapture
 from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.cookies import CookieStore
 from amazonorders.exception import AmazonOrdersAuthError
 from amazonorders.forms import CaptchaForm, MfaDeviceSelectForm, MfaForm, SignInForm, AuthForm
+from amazonorders.sessionstate import SessionState
+from amazonorders.transport import Transport
 
 logger = logging.getLogger(__name__)
 
@@ -55,11 +61,38 @@ class IODefault:
         return input(f"--> {msg}: ")
 
 
+class AmazonSessionResponse:
+    """
+    A response from a request executed on an :class:`AmazonSession`. Unlike ``last_response`` and
+    ``last_response_parsed`` on the session, this is scoped to a single request, so it is safe to use when requests
+    are executed concurrently.
+    """
+
+    def __init__(self,
+                 response: Response,
+                 bs4_parser: str) -> None:
+        #: The response from the executed request.
+        self.response: Response = response
+        #: The BeautifulSoup parser to use when the response is parsed.
+        self.bs4_parser: str = bs4_parser
+
+        self._parsed: Optional[Tag] = None
+
+    @property
+    def parsed(self) -> Tag:
+        """
+        A parsed representation of the response, which is parsed on first access.
+        """
+        if self._parsed is None:
+            self._parsed = util.parse_html(self.response.text, self.bs4_parser)
+        return self._parsed
+
+
 class AmazonSession:
     """
     An interface for interacting with Amazon and authenticating an underlying :class:`requests.Session`. Utilizing
-    this class means session data is maintained between requests. Session data is also persisted after each request,
-    meaning it will also be maintained between separate instantiations of the class or application.
+    this class means session data is maintained between requests. Session data is also persisted when it changes
+    after a request, meaning it will also be maintained between separate instantiations of the class or application.
 
     To get started, call the :func:`login` function.
     """
@@ -70,9 +103,15 @@ class AmazonSession:
                  debug: bool = False,
                  io: IODefault = IODefault(),
                  config: Optional[AmazonOrdersConfig] = None,
-                 auth_forms: Optional[List] = None) -> None:
+                 auth_forms: Optional[List] = None,
+                 transport: Optional[Transport] = None,
+                 captcha_solver: Optional[CaptchaSolver] = None) -> None:
         if not config:
             config = AmazonOrdersConfig()
+        if not transport:
+            transport = Transport(config)
+        if not captcha_solver:
+            captcha_solver = CaptchaSolver()
         if not auth_forms:
             auth_forms = [SignInForm(config),
                           MfaDeviceSelectForm(config),
@@ -102,64 +141,151 @@ class AmazonSession:
         #: instantiating an AmazonSession, ensure that list is populated with the default form implementations.
         self.auth_forms: List[AuthForm] = auth_forms
 
+        #: The transport requests are executed with, which may be shared with other AmazonSessions.
+        self.transport: Transport = transport
+        #: Auto-solves Captcha images during :func:`login`, which may be shared with other AmazonSessions.
+        self.captcha_solver: CaptchaSolver = captcha_solver
         #: The shared session to be used across all requests.
-        self.session: Session = Session()
+        self.session: Session = self.transport.create_session()
         #: The last response executed on the Session.
         self.last_response: Response = Response()
-        #: A parsed representation of the last response executed on the Session.
-        self.last_response_parsed: Tag = Tag(name="html")
+        # Populated on first access of ``last_response_parsed``, reset on each request
+        self._last_response_parsed: Optional[Tag] = Tag(name="html")
         #: If :func:`login` has been executed and successfully logged in the session.
         self.is_authenticated: bool = False
-
-        cookie_dir = os.path.dirname(self.config.cookie_jar_path)
-        if not os.path.exists(cookie_dir):
-            os.makedirs(cookie_dir)
-        if os.path.exists(self.config.cookie_jar_path):
-            with open(self.config.cookie_jar_path, "r", encoding="utf-8") as f:
-                data = json.loads(f.read())
-                cookies = requests.utils.cookiejar_from_dict(data)
-                self.session.cookies.update(cookies)
+        #: The store that persists the Session's cookies to ``cookie_jar_path``.
+        self.cookie_store: CookieStore = CookieStore(self.config.cookie_jar_path,
+                                                     self.config.cookie_flush_interval)
+
+        self.cookie_store.load(self.session.cookies)
+
+        #: When the session was last validated, and which landing pages have been visited since, persisted next to
+        #: ``cookie_jar_path``. Within ``session_freshness`` seconds of validating, :func:`login` and :func:`visit`
+        #: skip their requests.
+        self.session_state: SessionState = SessionState(
+            f"{os.path.splitext(self.config.cookie_jar_path)[0]}.session-state.json",
+            self.config.session_freshness,
+            self.username)
+
+        #: The cache of GET responses, which is only used if ``cache_dir`` is set in the config.
+        self.response_cache: Optional[ResponseCache] = ResponseCache(self.config.cache_dir,
+                                                                     self.config.cache_ttl,
+                                                                     self.config.cache_max_size) \
+            if self.config.cache_dir else None
+        #: Captures the page of each response to ``output_dir`` when ``debug`` is enabled.
+        self.page_capture: PageCapture = PageCapture(self.config.output_dir,
+                                                     self.config.capture_compress,
+                                                     self.config.capture_dedupe,
+                                                     self.config.capture_max_size)
+
+        # Bounds the number of requests in flight at once across all threads using this session
+        self._request_semaphore = threading.BoundedSemaphore(self.config.max_workers)
+        # Serializes logging in again when a request is redirected to sign-in, and counts successful logins, so
+        # threads that were redirected at the same time only log in once
+        self._revalidate_lock = threading.Lock()
+        self._login_count = 0
+        # Flags the thread running the auth flow, whose requests are expected to land on sign-in
+        self._auth_local = threading.local()
 
     def request(self,
                 method: str,
                 url: str,
                 **kwargs: Any) -> Response:
         """
-        Execute the request against Amazon with base headers, parsing and storing the response
-        and persisting response cookies.
+        Execute the request against Amazon with base headers, storing the response (which will be parsed on
+        first access of ``last_response_parsed``) and persisting response cookies.
 
         :param method: The request method to execute.
         :param url: The URL to execute ``method`` on.
         :param kwargs: Remaining ``kwargs`` will be passed to :func:`requests.request`.
         :return: The Response from the executed request.
         """
+        self.last_response = self.scoped_request(method, url, **kwargs).response
+        self._last_response_parsed = None
+
+        return self.last_response
+
+    def scoped_request(self,
+                       method: str,
+                       url: str,
+                       **kwargs: Any) -> AmazonSessionResponse:
+        """
+        Execute the request against Amazon with base headers, persisting response cookies, but without storing
+        the response in ``last_response``. This makes it safe to call from multiple threads at once, though no more
+        than ``max_workers`` requests will be in flight on the session at once. The request is executed with
+        ``transport``, which applies timeouts, retries, and rate limiting.
+
+        If ``cache_dir`` is set in the config, GET requests for URLs with a TTL in ``cache_ttl`` are served from the
+        response cache when possible.
+
+        If ``session_freshness`` is set in the config and the request is redirected to sign-in, the session is
+        stale, so it is logged in again with :func:`login`, and the request is retried once.
+
+        :param method: The request method to execute.
+        :param url: The URL to execute ``method`` on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`requests.request`.
+        :return: The response from the executed request.
+        """
+        login_count = self._login_count
+        auth_cookies = self._get_auth_cookies()
+
+        scoped_response = self._scoped_request(method, url, **kwargs)
+
+        if self._should_revalidate(url, scoped_response.response):
+            self._revalidate(login_count, auth_cookies)
+
+            scoped_response = self._scoped_request(method, url, **kwargs)
+
+        return scoped_response
+
+    def _scoped_request(self,
+                        method: str,
+                        url: str,
+                        **kwargs: Any) -> AmazonSessionResponse:
         if "headers" not in kwargs:
             kwargs["headers"] = {}
         kwargs["headers"].update(self.config.constants.BASE_HEADERS)
 
+        url_class = self._get_url_class(url) if method == "GET" else None
+        cache = self.response_cache if self.response_cache and self.response_cache.is_cacheable(url_class) else None
+        if cache and url_class:
+            cached_response = cache.get(url, url_class, self.username or "")
+            if cached_response is not None:
+                return AmazonSessionResponse(cached_response, self.config.bs4_parser)
+
         logger.debug(f"{method} request to {url}")
 
-        self.last_response = self.session.request(method, url, **kwargs)
-        self.last_response_parsed = BeautifulSoup(self.last_response.text,
-                                                  "html.parser")
+        with self._request_semaphore:
+            response = self.transport.request(self.session, method, url, **kwargs)
 
-        cookies = dict_from_cookiejar(self.session.cookies)
-        if os.path.exists(self.config.cookie_jar_path):
-            os.remove(self.config.cookie_jar_path)
-        with open(self.config.cookie_jar_path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(cookies))
+        self.cookie_store.save(self.session.cookies)
+
+        # Only cache the page that was requested, not, for instance, a redirect to sign-in
+        if cache and response.status_code == 200 and self._get_url_class(response.url) == url_class:
+            cache.put(url, response, self.username or "")
 
-        logger.debug(f"Response: {self.last_response.url} - {self.last_response.status_code}")
+        logger.debug(f"Response: {response.url} - {response.status_code}")
 
         if self.debug:
-            page_name = self._get_page_from_url(self.config.output_dir, self.last_response.url)
-            with open(os.path.join(self.config.output_dir, page_name), "w",
-                      encoding="utf-8") as html_file:
-                logger.debug(
-                    f"Response written to file: {html_file.name}")
-                html_file.write(self.last_response.text)
+            self.page_capture.capture(response.url, response.text)
 
-        return self.last_response
+        return AmazonSessionResponse(response, self.config.bs4_parser)
+
+    @property
+    def last_response_parsed(self) -> Tag:
+        """
+        A parsed representation of the last response executed on the Session. The response is only parsed the first
+        time this is accessed after a request, so requests that only need ``last_response`` don't pay for a parse.
+        """
+        if self._last_response_parsed is None:
+            self._last_response_parsed = util.parse_html(self.last_response.text,
+                                                         self.config.bs4_parser)
+        return self._last_response_parsed
+
+    @last_response_parsed.setter
+    def last_response_parsed(self,
+                             value: Tag) -> None:
+        self._last_response_parsed = value
 
     def get(self,
             url: str,
@@ -185,6 +311,30 @@ class AmazonSession:
         """
         return self.request("POST", url, **kwargs)
 
+    def visit(self,
+              url: str,
+              **kwargs: Any) -> Optional[Response]:
+        """
+        Perform a GET request of a landing page, which only needs to be visited once to warm up the session, like
+        ``ORDER_HISTORY_LANDING_URL``. If ``session_freshness`` is set in the config, and the page has been visited
+        since the session was last validated, within that window, the request is skipped.
+
+        :param url: The URL of the landing page to GET on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AmazonSession.request`.
+        :return: The Response from the executed GET request, or ``None`` if it was skipped.
+        """
+        if self.session_state.was_visited(url):
+            logger.debug(f"{url} was already visited, skipping")
+
+            return None
+
+        response = self.get(url, **kwargs)
+
+        if response.ok and not self._is_sign_in_redirect(url, response):
+            self.session_state.mark_visited(url)
+
+        return response
+
     def auth_cookies_stored(self) -> bool:
         cookies = dict_from_cookiejar(self.session.cookies)
         return cookies.get("session-token") and cookies.get("x-main")
@@ -197,8 +347,24 @@ class AmazonSession:
         If successful, ``is_authenticated`` will be set to ``True``.
 
         Session cookies are persisted, and if existing session data is found during this auth flow, it will be
-        skipped entirely and flagged as authenticated.
+        skipped entirely and flagged as authenticated. If ``session_freshness`` is set in the config, and the session
+        was validated within that window, even the request of the sign-in page is skipped.
         """
+        if self.auth_cookies_stored() and self.session_state.is_fresh():
+            logger.debug("Session was validated recently, skipping the sign-in page")
+
+            self.is_authenticated = True
+
+            return
+
+        with self._authenticating():
+            self._login()
+
+        if self.is_authenticated:
+            self.session_state.mark_validated()
+            self._login_count += 1
+
+    def _login(self) -> None:
         self.get(self.config.constants.SIGN_IN_URL)
 
         # If our local session data is stale, Amazon will redirect us to the signin page
@@ -239,28 +405,78 @@ class AmazonSession:
         """
         Logout and close the existing Amazon session and clear cookies.
         """
-        self.get(self.config.constants.SIGN_OUT_URL)
+        self.session_state.invalidate()
+
+        with self._authenticating():
+            self.get(self.config.constants.SIGN_OUT_URL)
 
-        if os.path.exists(self.config.cookie_jar_path):
-            os.remove(self.config.cookie_jar_path)
+        self.cookie_store.clear()
 
         self.session.close()
-        self.session = Session()
+        self.session = self.transport.create_session()
 
         self.is_authenticated = False
 
-    def _get_page_from_url(self,
-                           output_dir: str,
-                           url: str) -> str:
-        page_name = os.path.splitext(os.path.basename(urlparse(url).path))[0]
-        if not page_name:
-            page_name = "index"
-
-        i = 0
-        filename_frmt = "{page_name}_{index}.html"
-        while os.path.isfile(os.path.join(output_dir, filename_frmt.format(page_name=page_name, index=i))):
-            i += 1
-        return filename_frmt.format(page_name=page_name, index=i)
+    @contextmanager
+    def _authenticating(self) -> Iterator[None]:
+        previous = getattr(self._auth_local, "active", False)
+        self._auth_local.active = True
+        try:
+            yield
+        finally:
+            self._auth_local.active = previous
+
+    def _is_sign_in_redirect(self,
+                             url: str,
+                             response: Response) -> bool:
+        sign_in_redirect_url = self.config.constants.SIGN_IN_REDIRECT_URL
+        return (response.url.split("?")[0] == sign_in_redirect_url and
+                url.split("?")[0] != sign_in_redirect_url)
+
+    def _should_revalidate(self,
+                           url: str,
+                           response: Response) -> bool:
+        return (self.session_state.freshness > 0 and
+                self.is_authenticated and
+                not getattr(self._auth_local, "active", False) and
+                self._is_sign_in_redirect(url, response))
+
+    def _get_auth_cookies(self) -> Dict[str, Optional[str]]:
+        cookies = dict_from_cookiejar(self.session.cookies)
+        return {name: cookies.get(name) for name in ("session-token", "x-main")}
+
+    def _revalidate(self,
+                    login_count: int,
+                    auth_cookies: Dict[str, Optional[str]]) -> None:
+        with self._revalidate_lock:
+            # Another thread already logged in again since this request was started
+            if self._login_count != login_count:
+                return
+
+            # Other processes sharing the cookie jar were likely redirected at the same time, so only one logs in
+            with self.cookie_store.reauth_lock():
+                self.cookie_store.refresh(self.session.cookies)
+                if self._get_auth_cookies() != auth_cookies:
+                    logger.debug("Request was redirected to sign-in, but another session has since logged in, "
+                                 "using its cookies")
+
+                    self.session_state.mark_validated()
+
+                    return
+
+                logger.debug("Request was redirected to sign-in, logging in again")
+
+                self.logout()
+                self.login()
+
+    def _get_url_class(self,
+                       url: str) -> Optional[str]:
+        normalized_url = normalize_url(url)
+        if normalized_url.startswith(self.config.constants.ORDER_DETAILS_URL):
+            return "order_details"
+        elif normalized_url.startswith(self.config.constants.ORDER_HISTORY_URL):
+            return "order_history"
+        return None
 
     def _raise_auth_error(self) -> None:
         debug_str = " To capture the page to a file, set the `debug` flag." if not self.debug else ""
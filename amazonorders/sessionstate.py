@@ -0,0 +1,132 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from amazonorders import util
+
+logger = logging.getLogger(__name__)
+
+
+class SessionState:
+    """
+    Tracks when an :class:`~amazonorders.session.AmazonSession` was last validated (that is, logged in, or found to
+    already be logged in, by going through the sign-in page), and which landing pages (like
+    ``ORDER_HISTORY_LANDING_URL``) have been visited since, persisted to ``state_path`` so the state carries over
+    between separate instantiations of the session.
+
+    Within ``freshness`` seconds of the session being validated, the session is considered fresh, and the sign-in
+    page and visited landing pages can be skipped. If ``freshness`` is ``0``, the session is never fresh. State saved
+    for a different ``username`` is ignored.
+    """
+
+    def __init__(self,
+                 state_path: str,
+                 freshness: float = 0,
+                 username: Optional[str] = None) -> None:
+        #: The path to the file where the state is persisted.
+        self.state_path: str = state_path
+        #: The number of seconds after being validated that the session is considered fresh.
+        self.freshness: float = freshness
+        #: The username the session is for.
+        self.username: Optional[str] = username
+        #: The time the session was last validated, in seconds since the epoch.
+        self.validated_at: Optional[float] = None
+        #: The time each landing page was last visited, in seconds since the epoch, keyed by URL.
+        self.visited: Dict[str, float] = {}
+
+        self._lock = threading.Lock()
+
+        if self.freshness > 0:
+            self._load()
+
+    def is_fresh(self) -> bool:
+        """
+        :return: ``True`` if the session was validated within ``freshness`` seconds.
+        """
+        with self._lock:
+            return self._is_fresh()
+
+    def was_visited(self,
+                    url: str) -> bool:
+        """
+        :param url: The URL of the landing page.
+        :return: ``True`` if the session is fresh, and the landing page was visited since it was validated.
+        """
+        with self._lock:
+            return self._is_fresh() and url in self.visited
+
+    def mark_validated(self) -> None:
+        """
+        Record that the session was just validated. Landing pages visited before are forgotten.
+        """
+        with self._lock:
+            self.validated_at = time.time()
+            self.visited = {}
+
+        self._save()
+
+    def mark_visited(self,
+                     url: str) -> None:
+        """
+        Record that the landing page was just visited.
+
+        :param url: The URL of the landing page.
+        """
+        with self._lock:
+            if not self._is_fresh():
+                return
+
+            self.visited[url] = time.time()
+
+        self._save()
+
+    def invalidate(self) -> None:
+        """
+        Forget that the session was validated, for example, because a request was redirected to sign-in.
+        """
+        with self._lock:
+            if self.validated_at is None and not self.visited:
+                return
+
+            self.validated_at = None
+            self.visited = {}
+
+        self._save()
+
+    def _is_fresh(self) -> bool:
+        return self.freshness > 0 and self.validated_at is not None and \
+            0 <= time.time() - self.validated_at < self.freshness
+
+    def _load(self) -> None:
+        if not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            logger.debug(f"Session state at {self.state_path} could not be read, ignoring it", exc_info=True)
+            return
+
+        if data.get("username") != self.username:
+            return
+
+        self.validated_at = data.get("validated_at")
+        self.visited = dict(data.get("visited", {}))
+
+    def _save(self) -> None:
+        if self.freshness <= 0:
+            return
+
+        with self._lock:
+            data = {"username": self.username, "validated_at": self.validated_at, "visited": dict(self.visited)}
+
+        util.atomic_write(self.state_path, json.dumps(data), temp_prefix=".session-state-")
+
+        logger.debug(f"Session state written to {self.state_path}")
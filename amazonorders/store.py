@@ -0,0 +1,283 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from decimal import Decimal
+from types import TracebackType
+from typing import Any, Iterable, List, Optional, Type, Union
+
+from amazonorders.entity.item import Item
+from amazonorders.entity.order import Order
+from amazonorders.entity.transaction import Transaction
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.orders import AmazonOrders
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_number TEXT PRIMARY KEY,
+    order_details_link TEXT,
+    grand_total REAL,
+    order_placed_date TEXT,
+    full_details INTEGER NOT NULL,
+    payment_method TEXT,
+    payment_method_last_4 INTEGER,
+    subtotal REAL,
+    shipping_total REAL,
+    subscription_discount REAL,
+    total_before_tax REAL,
+    estimated_tax REAL,
+    refund_total REAL,
+    synced_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_order_placed_date ON orders (order_placed_date);
+
+CREATE TABLE IF NOT EXISTS recipients (
+    order_number TEXT PRIMARY KEY REFERENCES orders (order_number) ON DELETE CASCADE,
+    name TEXT,
+    address TEXT
+);
+
+CREATE TABLE IF NOT EXISTS shipments (
+    id INTEGER PRIMARY KEY,
+    order_number TEXT NOT NULL REFERENCES orders (order_number) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    delivery_status TEXT,
+    tracking_link TEXT
+);
+CREATE INDEX IF NOT EXISTS shipments_order_number ON shipments (order_number);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    order_number TEXT NOT NULL REFERENCES orders (order_number) ON DELETE CASCADE,
+    shipment_id INTEGER REFERENCES shipments (id) ON DELETE SET NULL,
+    title TEXT,
+    link TEXT,
+    price REAL,
+    seller_name TEXT,
+    seller_link TEXT,
+    condition TEXT,
+    return_eligible_date TEXT,
+    image_link TEXT,
+    quantity INTEGER
+);
+CREATE INDEX IF NOT EXISTS items_order_number ON items (order_number);
+CREATE INDEX IF NOT EXISTS items_shipment_id ON items (shipment_id);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    completed_date TEXT,
+    payment_method TEXT,
+    grand_total REAL,
+    is_refund INTEGER,
+    order_number TEXT,
+    order_details_link TEXT,
+    seller TEXT
+);
+-- SQLite treats NULLs as distinct in a UNIQUE constraint, so the key's columns are coalesced, otherwise a
+-- Transaction missing any of them would be inserted again on every save
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_key ON transactions (
+    COALESCE(order_number, ''), COALESCE(completed_date, ''), COALESCE(grand_total, ''), COALESCE(payment_method, '')
+);
+CREATE INDEX IF NOT EXISTS transactions_order_number ON transactions (order_number);
+CREATE INDEX IF NOT EXISTS transactions_completed_date ON transactions (completed_date);
+"""
+
+
+class OrderStore:
+    """
+    A local SQLite store of Orders (along with their Shipments, Items, and Recipient) and Transactions. Rather than
+    re-fetching full years of history, call :func:`sync` to fetch only the Orders placed since the store was last
+    synced.
+    """
+
+    def __init__(self,
+                 store_path: str) -> None:
+        #: The path to the SQLite database file.
+        self.store_path: str = store_path
+
+        store_dir = os.path.dirname(self.store_path)
+        if store_dir and not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.store_path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "OrderStore":
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the connection to the SQLite database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def has_order(self,
+                  order_number: str) -> bool:
+        """
+        :param order_number: The Order number to look for.
+        :return: ``True`` if the Order is in the store.
+        """
+        return self._fetch_one("SELECT 1 FROM orders WHERE order_number = ?", (order_number,)) is not None
+
+    def order_count(self) -> int:
+        """
+        :return: The number of Orders in the store.
+        """
+        return self._fetch_one("SELECT COUNT(*) FROM orders")[0]
+
+    def latest_order_placed_date(self) -> Optional[datetime.date]:
+        """
+        :return: The placed date of the most recent Order in the store, or ``None`` if the store is empty.
+        """
+        value = self._fetch_one("SELECT MAX(order_placed_date) FROM orders")[0]
+        return datetime.date.fromisoformat(value) if value else None
+
+    def save_orders(self,
+                    orders: Iterable[Order]) -> None:
+        """
+        Insert the given Orders, along with their Shipments, Items, and Recipient, replacing any that are already
+        in the store.
+
+        :param orders: The Orders to save.
+        """
+        synced_at = datetime.datetime.now().isoformat()
+        with self._lock, self._connection:
+            for order in orders:
+                self._save_order(order, synced_at)
+
+    def save_transactions(self,
+                          transactions: Iterable[Transaction]) -> None:
+        """
+        Insert the given Transactions, skipping any that are already in the store.
+
+        :param transactions: The Transactions to save.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO transactions (completed_date, payment_method, grand_total, is_refund, "
+                "order_number, order_details_link, seller) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(_to_iso(t.completed_date), t.payment_method, _to_real(t.grand_total), t.is_refund, t.order_number,
+                  t.order_details_link, t.seller) for t in transactions])
+
+    def sync(self,
+             amazon_orders: AmazonOrders,
+             earliest_year: Optional[int] = None,
+             full_details: bool = False) -> List[Order]:
+        """
+        Fetch Orders newest-first with :func:`~amazonorders.orders.AmazonOrders.iter_order_history`, saving them to
+        the store and stopping as soon as an Order that is already in the store is reached. When the store is kept in
+        sync regularly, this means only a few pages of history are fetched.
+
+        :param amazon_orders: The AmazonOrders to fetch history with.
+        :param earliest_year: The earliest year to sync. Defaults to the year of the most recent Order in the
+            store, or the current year if the store is empty.
+        :param full_details: Get the full details for each new Order, which requires an additional request per
+            Order. These requests are executed concurrently, up to the ``max_workers`` config value.
+        :return: The new Orders, newest first.
+        """
+        if not amazon_orders.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
+
+        today = datetime.date.today()
+        if earliest_year is None:
+            latest_order_placed_date = self.latest_order_placed_date()
+            earliest_year = latest_order_placed_date.year if latest_order_placed_date else today.year
+        if earliest_year > today.year:
+            raise AmazonOrdersError(f"earliest_year must not be after {today.year}.")
+
+        new_orders: List[Order] = []
+        new_order_numbers = set()
+        for year in range(today.year, earliest_year - 1, -1):
+            known_order_reached = False
+            # Only a few pages are fetched ahead of the Orders being checked, and closing the iterator stops the rest
+            # from being fetched, since most syncs stop on the first page
+            with closing(amazon_orders.iter_order_history(year, full_details=full_details)) as orders:
+                for order in orders:
+                    if order.order_number in new_order_numbers or self.has_order(order.order_number):
+                        known_order_reached = True
+                        break
+                    new_orders.append(order)
+                    new_order_numbers.add(order.order_number)
+
+            if known_order_reached:
+                logger.debug(f"Reached stored Order in {year}, stopping sync")
+
+                break
+
+        self.save_orders(new_orders)
+
+        return new_orders
+
+    def _save_order(self,
+                    order: Order,
+                    synced_at: str) -> None:
+        self._connection.execute("DELETE FROM orders WHERE order_number = ?", (order.order_number,))
+        self._connection.execute(
+            "INSERT INTO orders (order_number, order_details_link, grand_total, order_placed_date, full_details, "
+            "payment_method, payment_method_last_4, subtotal, shipping_total, subscription_discount, "
+            "total_before_tax, estimated_tax, refund_total, synced_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (order.order_number, order.order_details_link, _to_real(order.grand_total),
+             _to_iso(order.order_placed_date), order.full_details, order.payment_method, order.payment_method_last_4,
+             _to_real(order.subtotal), _to_real(order.shipping_total), _to_real(order.subscription_discount),
+             _to_real(order.total_before_tax), _to_real(order.estimated_tax), _to_real(order.refund_total),
+             synced_at))
+
+        if order.recipient:
+            self._connection.execute(
+                "INSERT INTO recipients (order_number, name, address) VALUES (?, ?, ?)",
+                (order.order_number, order.recipient.name, order.recipient.address))
+
+        # Items are stored once per Order, linked to the Shipment they appear in, if any
+        item_shipment_ids = {}
+        for position, shipment in enumerate(order.shipments):
+            cursor = self._connection.execute(
+                "INSERT INTO shipments (order_number, position, delivery_status, tracking_link) VALUES (?, ?, ?, ?)",
+                (order.order_number, position, shipment.delivery_status, shipment.tracking_link))
+            for item in shipment.items:
+                item_shipment_ids[(item.title, item.link)] = cursor.lastrowid
+
+        self._connection.executemany(
+            "INSERT INTO items (order_number, shipment_id, title, link, price, seller_name, seller_link, condition, "
+            "return_eligible_date, image_link, quantity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [_item_row(order.order_number, item_shipment_ids.get((item.title, item.link)), item)
+             for item in order.items])
+
+    def _fetch_one(self,
+                   sql: str,
+                   parameters: Iterable[Any] = ()) -> Any:
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchone()
+
+
+def _item_row(order_number: str,
+              shipment_id: Optional[int],
+              item: Item) -> tuple:
+    return (order_number, shipment_id, item.title, item.link, _to_real(item.price),
+            item.seller.name if item.seller else None, item.seller.link if item.seller else None, item.condition,
+            _to_iso(item.return_eligible_date), item.image_link, item.quantity)
+
+
+def _to_iso(value: Optional[datetime.date]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _to_real(value: Union[int, float, Decimal, None]) -> Union[int, float, None]:
+    # sqlite3 can't bind a Decimal, which currencies are if ``currency_as_decimal`` is enabled
+    return float(value) if isinstance(value, Decimal) else value
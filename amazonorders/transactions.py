@@ -3,10 +3,9 @@ __license__ = "MIT"
 
 import datetime
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from bs4 import Tag
-from dateutil import parser
 
 from amazonorders import util
 from amazonorders.conf import AmazonOrdersConfig
@@ -14,11 +13,15 @@ from amazonorders.entity.transaction import Transaction
 from amazonorders.exception import AmazonOrdersError
 from amazonorders.session import AmazonSession
 
+if TYPE_CHECKING:
+    from amazonorders.pipeline import ParsePipeline
+
 logger = logging.getLogger(__name__)
 
 
 def _parse_transaction_form_tag(form_tag: Tag,
-                                config: AmazonOrdersConfig) \
+                                config: AmazonOrdersConfig,
+                                detach: bool = False) \
         -> Tuple[List[Transaction], Optional[str], Optional[Dict[str, str]]]:
     transactions = []
     date_container_tags = util.select(form_tag, config.selectors.TRANSACTION_DATE_CONTAINERS_SELECTOR)
@@ -29,7 +32,7 @@ def _parse_transaction_form_tag(form_tag: Tag,
             continue
 
         date_str = date_tag.text
-        date = parser.parse(date_str).date()
+        date = config.date_parser.parse(date_str)
 
         transactions_container_tag = date_container_tag.find_next_sibling(
             config.selectors.TRANSACTIONS_CONTAINER_SELECTOR)
@@ -40,6 +43,8 @@ def _parse_transaction_form_tag(form_tag: Tag,
         transaction_tags = util.select(transactions_container_tag, config.selectors.TRANSACTIONS_SELECTOR)
         for transaction_tag in transaction_tags:
             transaction = Transaction(transaction_tag, config, date)
+            if detach:
+                transaction.detach()
             transactions.append(transaction)
 
     form_state_input = util.select_one(form_tag, config.selectors.TRANSACTIONS_NEXT_PAGE_INPUT_STATE_SELECTOR)
@@ -62,12 +67,16 @@ class AmazonTransactions:
     """
     Using an authenticated :class:`~amazonorders.session.AmazonSession`, can be used to query Amazon
     for Transaction details and history.
+
+    If a :class:`~amazonorders.pipeline.ParsePipeline` is given, pages are parsed, and their Transactions built, in
+    the pipeline's worker processes.
     """
 
     def __init__(self,
                  amazon_session: AmazonSession,
                  debug: Optional[bool] = None,
-                 config: Optional[AmazonOrdersConfig] = None) -> None:
+                 config: Optional[AmazonOrdersConfig] = None,
+                 pipeline: Optional["ParsePipeline"] = None) -> None:
         if not debug:
             debug = amazon_session.debug
         if not config:
@@ -77,6 +86,9 @@ class AmazonTransactions:
         self.amazon_session: AmazonSession = amazon_session
         #: The AmazonOrdersConfig to use.
         self.config: AmazonOrdersConfig = config
+        #: The pipeline that pages are parsed in, if parsing should be done in worker processes. Transactions built
+        #: by the pipeline are always detached.
+        self.pipeline: Optional["ParsePipeline"] = pipeline
 
         #: Set logger ``DEBUG`` and send output to ``stderr``.
         self.debug: bool = debug
@@ -84,30 +96,29 @@ class AmazonTransactions:
             logger.setLevel(logging.DEBUG)
 
     def get_transactions(self,
-                         days: int = 365) -> List[Transaction]:
+                         days: int = 365,
+                         detach: Optional[bool] = None) -> List[Transaction]:
         """
         Get the Amazon Transactions for the given number of days.
 
         :param days: The number of days worth of transactions to get.
+        :param detach: Detach each Transaction (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it's
+            built, so the pages it was parsed from can be freed. Defaults to the ``detach_entities`` config value.
         :return: A list of the requested Transactions.
         """
         if not self.amazon_session.is_authenticated:
             raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
 
         min_date = datetime.date.today() - datetime.timedelta(days=days)
+        if detach is None:
+            detach = self.config.detach_entities
 
         self.amazon_session.get(self.config.constants.TRANSACTION_HISTORY_LANDING_URL)
-        if not self.amazon_session.last_response_parsed:
-            raise AmazonOrdersError("Could not get transaction history landing page.")
-
-        form_tag = util.select_one(self.amazon_session.last_response_parsed,
-                                   self.config.selectors.TRANSACTION_HISTORY_FORM_SELECTOR)
+        page = self._parse_transactions_page("Could not get transaction history landing page.", detach)
 
         transactions: List[Transaction] = []
-        while form_tag:
-            loaded_transactions, next_page_post_url, next_page_post_data = (
-                _parse_transaction_form_tag(form_tag, self.config)
-            )
+        while page:
+            loaded_transactions, next_page_post_url, next_page_post_data = page
             for transaction in loaded_transactions:
                 if transaction.completed_date >= min_date:
                     transactions.append(transaction)
@@ -118,10 +129,23 @@ class AmazonTransactions:
                 return transactions
 
             self.amazon_session.post(next_page_post_url, data=next_page_post_data)
-            if not self.amazon_session.last_response_parsed:
-                raise AmazonOrdersError("Could not get next transaction history page.")
-
-            form_tag = util.select_one(self.amazon_session.last_response_parsed,
-                                       self.config.selectors.TRANSACTION_HISTORY_FORM_SELECTOR)
+            page = self._parse_transactions_page("Could not get next transaction history page.", detach)
 
         return transactions
+
+    def _parse_transactions_page(self,
+                                 error_message: str,
+                                 detach: bool) \
+            -> Optional[Tuple[List[Transaction], Optional[str], Optional[Dict[str, str]]]]:
+        if self.pipeline:
+            return self.pipeline.parse_transactions_page(self.amazon_session.last_response)
+
+        if not self.amazon_session.last_response_parsed:
+            raise AmazonOrdersError(error_message)
+
+        form_tag = util.select_one(self.amazon_session.last_response_parsed,
+                                   self.config.selectors.TRANSACTION_HISTORY_FORM_SELECTOR)
+        if not form_tag:
+            return None
+
+        return _parse_transaction_form_tag(form_tag, self.config, detach)
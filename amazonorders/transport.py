@@ -0,0 +1,250 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from amazonorders.conf import AmazonOrdersConfig
+
+logger = logging.getLogger(__name__)
+
+#: Status codes with which Amazon signals that requests should slow down.
+THROTTLE_STATUS_CODES = {429, 503}
+
+#: Methods that are safe to retry, since executing them more than once has the same effect as executing them once.
+#: Sign-in and OTP form submissions (``POST``) are never retried.
+RETRYABLE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+#: The maximum number of seconds to wait before a retry, including one asked for by a ``Retry-After`` header.
+MAX_RETRY_DELAY = 60.0
+
+
+class RateLimiter:
+    """
+    A token bucket that limits requests to ``rate`` requests per second, adapting the rate to how Amazon responds
+    (additive-increase/multiplicative-decrease). Each response recorded with :func:`record` that succeeds raises the
+    rate by ``increase``, up to ``max_rate``, and each response that is throttled (a ``429`` or ``503``) or slower
+    than ``latency_threshold`` seconds multiplies the rate by ``decrease_factor``, down to ``min_rate``.
+
+    The bucket holds up to a second's worth of tokens, so short bursts are allowed.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 min_rate: Optional[float] = None,
+                 max_rate: Optional[float] = None,
+                 increase: Optional[float] = None,
+                 decrease_factor: float = 0.5,
+                 latency_threshold: float = 10.0) -> None:
+        #: The highest rate, in requests per second, the limiter will increase to.
+        self.max_rate: float = max_rate or rate
+        #: The lowest rate, in requests per second, the limiter will decrease to.
+        self.min_rate: float = min_rate or min(rate, self.max_rate / 10)
+        #: The rate, in requests per second, added for each successful response.
+        self.increase: float = increase or self.max_rate / 20
+        #: The factor the rate is multiplied by for each throttled or slow response.
+        self.decrease_factor: float = decrease_factor
+        #: The number of seconds after which a response is considered slow.
+        self.latency_threshold: float = latency_threshold
+        #: The current rate, in requests per second.
+        self.rate: float = rate
+        #: The number of responses recorded.
+        self.requests: int = 0
+        #: The number of times the rate was decreased.
+        self.throttle_events: int = 0
+        #: The total number of seconds requests have waited for a token.
+        self.wait_time: float = 0.0
+
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """
+        The current ``rate``, and the ``requests``, ``throttle_events``, and ``wait_time`` so far.
+        """
+        with self._lock:
+            return {"rate": self.rate,
+                    "requests": self.requests,
+                    "throttle_events": self.throttle_events,
+                    "wait_time": self.wait_time}
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket, without blocking. If the bucket is empty, the token is borrowed from the
+        future, and the caller must wait the returned number of seconds before making its request.
+
+        :return: The number of seconds to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.wait_time += delay
+
+            return delay
+
+    def acquire(self) -> None:
+        """
+        Take a token from the bucket, blocking until one is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self,
+               status_code: int,
+               latency: float) -> None:
+        """
+        Adapt the rate to a response.
+
+        :param status_code: The response's status code.
+        :param latency: The number of seconds the request took.
+        """
+        with self._lock:
+            self.requests += 1
+
+            if status_code in THROTTLE_STATUS_CODES or latency > self.latency_threshold:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.throttle_events += 1
+
+                logger.debug(f"Response throttled ({status_code}, {latency:.2f}s), rate decreased to "
+                             f"{self.rate:.2f} requests per second")
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class Transport:
+    """
+    The HTTP transport that requests are executed with. Sessions created with :func:`create_session` have an
+    :class:`~requests.adapters.HTTPAdapter` mounted whose connection pool is sized to ``max_workers``, so concurrent
+    requests reuse connections rather than churning them, and :func:`request` applies default timeouts, retries
+    ``5xx`` responses (and connection errors) of idempotent requests with jittered exponential backoff, and, if
+    ``rate_limit`` is set in the config, paces requests with an adaptive :class:`RateLimiter`.
+
+    A single Transport can be shared by multiple :class:`~amazonorders.session.AmazonSession`, in which case its
+    rate limit applies across all of them.
+    """
+
+    def __init__(self,
+                 config: AmazonOrdersConfig) -> None:
+        #: The AmazonOrdersConfig to use.
+        self.config: AmazonOrdersConfig = config
+        #: The default ``(connect, read)`` timeout, in seconds, of requests.
+        self.timeout: Tuple[float, float] = (self.config.connect_timeout, self.config.read_timeout)
+        #: Paces requests, if ``rate_limit`` is set in the config.
+        self.rate_limiter: Optional[RateLimiter] = RateLimiter(self.config.rate_limit) \
+            if self.config.rate_limit else None
+        #: The number of requests that have been retried.
+        self.retries: int = 0
+
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """
+        The ``retries`` so far, along with the :class:`RateLimiter` metrics, if rate limiting is enabled.
+        """
+        metrics: Dict[str, float] = {"retries": self.retries}
+        if self.rate_limiter:
+            metrics.update(self.rate_limiter.metrics)
+        return metrics
+
+    def create_session(self) -> Session:
+        """
+        :return: A new :class:`~requests.Session` with this transport's adapter mounted.
+        """
+        session = Session()
+
+        adapter = HTTPAdapter(pool_connections=self.config.max_workers, pool_maxsize=self.config.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def request(self,
+                session: Session,
+                method: str,
+                url: str,
+                **kwargs: Any) -> Response:
+        """
+        Execute the request on the given session.
+
+        :param session: The session to execute the request on.
+        :param method: The request method to execute.
+        :param url: The URL to execute ``method`` on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`requests.Session.request`.
+        :return: The Response from the executed request.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            start = time.monotonic()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (ConnectionError, Timeout):
+                if not self.should_retry(method, attempt):
+                    raise
+
+                delay = self.get_retry_delay(attempt)
+                logger.debug(f"{method} request to {url} failed to connect, retrying in {delay:.2f}s",
+                             exc_info=True)
+            else:
+                if self.rate_limiter:
+                    self.rate_limiter.record(response.status_code, time.monotonic() - start)
+
+                if response.status_code < 500 or not self.should_retry(method, attempt):
+                    return response
+
+                delay = self.get_retry_delay(attempt, response.headers.get("Retry-After"))
+                logger.debug(f"{method} request to {url} returned {response.status_code}, retrying in {delay:.2f}s")
+
+            self._count_retry()
+            time.sleep(delay)
+            attempt += 1
+
+    def should_retry(self,
+                     method: str,
+                     attempt: int) -> bool:
+        """
+        :param method: The request method that was executed.
+        :param attempt: The number of times the request has already been retried.
+        :return: ``True`` if a failed request should be retried.
+        """
+        return method.upper() in RETRYABLE_METHODS and attempt < self.config.max_retries
+
+    def get_retry_delay(self,
+                        attempt: int,
+                        retry_after: Optional[str] = None) -> float:
+        """
+        Get the number of seconds to wait before a retry: a random delay up to ``retry_backoff`` doubled for each
+        previous attempt ("full jitter", so concurrent requests that failed together don't retry together), or
+        longer if the response's ``Retry-After`` header asks for it.
+
+        :param attempt: The number of times the request has already been retried.
+        :param retry_after: The value of the response's ``Retry-After`` header, if any.
+        :return: The number of seconds to wait.
+        """
+        delay = random.uniform(0, self.config.retry_backoff * 2 ** attempt)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, MAX_RETRY_DELAY)
+
+    def _count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
@@ -3,14 +3,32 @@ __license__ = "MIT"
 
 import importlib
 import logging
-from typing import List, Union, Optional, Callable
+import os
+import re
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
-from bs4 import Tag
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+from soupsieve import SoupSieve
+
+from amazonorders.exception import AmazonOrdersError
+
+if TYPE_CHECKING:
+    # Only imported for type checking, since selectorstats imports this module
+    from amazonorders.selectorstats import SelectorStats
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BS4_PARSER = "html.parser"
+
+_resolved_bs4_parsers: Dict[str, str] = {}
+_compiled_selectors: Dict[str, SoupSieve] = {}
 
-def select(parsed: Tag, selector: Union[List[str], str]) -> List[Tag]:
+
+def select(parsed: Tag,
+           selector: Union[List[str], str],
+           selector_stats: Optional["SelectorStats"] = None) -> List[Tag]:
     """
     This is a helper function that extends BeautifulSoup's `select() <https://www.crummy.com/software/
     BeautifulSoup/bs4/doc/#css-selectors-through-the-css-property>`_ method to allow for multiple selectors.
@@ -19,20 +37,25 @@ def select(parsed: Tag, selector: Union[List[str], str]) -> List[Tag]:
 
     :param parsed: The ``Tag`` from which to attempt selection.
     :param selector: The CSS selector(s) for the field.
+    :param selector_stats: If given, the ``list`` is tried in the order it gives, and the match is recorded to it.
     :return: The selected tag.
     """
     if isinstance(selector, str):
         selector = [selector]
 
-    for s in selector:
-        tag = parsed.select(s)
+    for s in selector_stats.order(selector) if selector_stats else selector:
+        tag = compile_selector(s).select(parsed)
         if tag:
+            if selector_stats:
+                selector_stats.record(selector, s)
             return tag
 
     return []
 
 
-def select_one(parsed: Tag, selector: Union[List[str], str]) -> Optional[Tag]:
+def select_one(parsed: Tag,
+               selector: Union[List[str], str],
+               selector_stats: Optional["SelectorStats"] = None) -> Optional[Tag]:
     """
     This is a helper function that extends BeautifulSoup's `select_one() <https://www.crummy.com/software/
     BeautifulSoup/bs4/doc/#css-selectors-through-the-css-property>`_ method to allow for multiple selectors.
@@ -41,18 +64,127 @@ def select_one(parsed: Tag, selector: Union[List[str], str]) -> Optional[Tag]:
 
     :param parsed: The ``Tag`` from which to attempt selection.
     :param selector: The CSS selector(s) for the field.
+    :param selector_stats: If given, the ``list`` is tried in the order it gives, and the match is recorded to it.
     :return: The selection tag.
     """
     if isinstance(selector, str):
         selector = [selector]
 
-    for s in selector:
-        tag = parsed.select_one(s)
+    for s in selector_stats.order(selector) if selector_stats else selector:
+        tag = compile_selector(s).select_one(parsed)
         if tag:
+            if selector_stats:
+                selector_stats.record(selector, s)
             return tag
     return None
 
 
+def compile_selector(selector: str) -> SoupSieve:
+    """
+    Compile the given CSS selector with `soupsieve <https://facelessuser.github.io/soupsieve/>`_, the selector
+    engine behind BeautifulSoup's ``select()``. Compiled selectors are kept in a registry shared by all entities, so
+    each selector is only compiled once, no matter how many times it is used.
+
+    :param selector: The CSS selector to compile.
+    :return: The compiled selector.
+    """
+    compiled = _compiled_selectors.get(selector)
+    if compiled is None:
+        compiled = soupsieve.compile(selector)
+        _compiled_selectors[selector] = compiled
+    return compiled
+
+
+def compile_selectors(selectors: Any) -> Dict[str, List[SoupSieve]]:
+    """
+    Compile each ``*_SELECTOR`` attribute (including lists of fallback selectors) of the given ``Selectors`` object
+    with :func:`compile_selector`.
+
+    :param selectors: The ``Selectors`` object whose selectors should be compiled.
+    :return: The compiled selectors, keyed by attribute name.
+    """
+    compiled_selectors = {}
+    for name in dir(selectors):
+        if not name.endswith("_SELECTOR"):
+            continue
+
+        value = getattr(selectors, name)
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+            continue
+
+        try:
+            compiled_selectors[name] = [compile_selector(s) for s in value]
+        except soupsieve.SelectorSyntaxError as e:
+            raise AmazonOrdersError(f"{name} is not a valid CSS selector: {e}") from e
+
+    return compiled_selectors
+
+
+def get_bs4_parser(bs4_parser: Optional[str] = None) -> str:
+    """
+    Resolve the given BeautifulSoup parser (for example, ``lxml`` or ``html5lib``) to one that is available. If
+    the requested parser's optional dependency is not installed, a warning will be logged (once) and Python's
+    built-in ``html.parser`` will be returned instead.
+
+    :param bs4_parser: The requested BeautifulSoup parser.
+    :return: The parser that should be passed to ``BeautifulSoup``.
+    """
+    if not bs4_parser or bs4_parser == DEFAULT_BS4_PARSER:
+        return DEFAULT_BS4_PARSER
+
+    if bs4_parser not in _resolved_bs4_parsers:
+        try:
+            BeautifulSoup("", bs4_parser)
+            _resolved_bs4_parsers[bs4_parser] = bs4_parser
+        except FeatureNotFound:
+            logger.warning(f"BeautifulSoup parser \"{bs4_parser}\" is not installed, "
+                           f"falling back to \"{DEFAULT_BS4_PARSER}\".")
+            _resolved_bs4_parsers[bs4_parser] = DEFAULT_BS4_PARSER
+
+    return _resolved_bs4_parsers[bs4_parser]
+
+
+def parse_html(markup: Union[str, bytes],
+               bs4_parser: Optional[str] = None,
+               **kwargs: Any) -> BeautifulSoup:
+    """
+    Parse the given markup in to a ``BeautifulSoup`` object using the given parser, falling back to ``html.parser``
+    when the requested parser is not installed. The returned object can be used with :func:`select` and
+    :func:`select_one` the same regardless of which parser built it.
+
+    :param markup: The markup to parse.
+    :param bs4_parser: The BeautifulSoup parser to use.
+    :param kwargs: Remaining ``kwargs`` will be passed to ``BeautifulSoup``.
+    :return: The parsed markup.
+    """
+    return BeautifulSoup(markup, get_bs4_parser(bs4_parser), **kwargs)
+
+
+def build_strainer(*selectors: Union[List[str], str]) -> Optional[SoupStrainer]:
+    """
+    Build a ``SoupStrainer`` that, when passed as ``parse_only`` to :func:`parse_html`, only materializes the
+    elements matched by the first compound of each of the given selectors (and everything inside those elements),
+    skipping the rest of the page.
+
+    This is only possible when the first compound of each selector names a class (for example, ``div.order-card``
+    or ``ul.a-pagination li a``). If any selector does not, ``None`` is returned, meaning the page must be fully
+    parsed.
+
+    :param selectors: The CSS selector(s) for the regions of the page to keep.
+    :return: The strainer, or ``None`` if one can't be built for the given selectors.
+    """
+    classes = []
+    for selector in [s for s_list in selectors for s in ([s_list] if isinstance(s_list, str) else s_list)]:
+        match = re.match(r"^[\w-]*\.([\w-]+)", selector.strip())
+        if not match:
+            return None
+        classes.append(re.escape(match.group(1)))
+
+    return SoupStrainer(attrs={"class": re.compile(r"(^|\s)({})(\s|$)".format("|".join(classes)))})
+
+
 def to_type(value: str) -> Union[int, float, bool, str, None]:
     """
     Attempt to convert ``value`` to its primitive type of ``int``, ``float``, or ``bool``.
@@ -94,3 +226,26 @@ def load_class(package: List, clazz: str) -> Callable:
     """
     constants_mod = importlib.import_module(".".join(package))
     return getattr(constants_mod, clazz)
+
+
+def atomic_write(path: str,
+                 data: str,
+                 temp_prefix: str = ".") -> None:
+    """
+    Write the given data to a file atomically. It's written to a temp file in the same directory, which is then
+    renamed over ``path``, so readers (including other processes) never see a partially written file. If the write
+    fails, the temp file is removed.
+
+    :param path: The path of the file to write.
+    :param data: The data to write.
+    :param temp_prefix: The prefix of the temp file's name.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=temp_prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import gc
+import glob
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+
+
+def _build_orders(config, pages, detach):
+    orders = []
+    for page in pages:
+        with open(page, "r", encoding="utf-8") as f:
+            parsed = util.parse_html(f.read(), config.bs4_parser)
+
+        for order_tag in util.select(parsed, config.selectors.ORDER_HISTORY_ENTITY_SELECTOR):
+            order = config.order_cls(order_tag, config)
+            if detach:
+                order.detach()
+            else:
+                # Parse every field, so both runs hold the same values
+                order.parse_lazy_fields()
+                for child in order.items + order.shipments:
+                    child.parse_lazy_fields()
+            orders.append(order)
+
+    return orders
+
+
+def benchmark_detach(args):
+    """
+    The purpose of this script is to compare the memory held by a list of Orders that are still attached to the
+    pages they were parsed from against a list of detached Orders, using the order history pages in tests/resources,
+    which are representative of real order history pages.
+
+    Each page is parsed and its Orders built, as when fetching history, and only the Orders are kept. Memory is
+    measured with ``tracemalloc``, after a garbage collection. Pass a number as the first argument to change the
+    number of times the pages are loaded, which is roughly the number of years of history (defaults to 3).
+    """
+    number = int(args[1]) if len(args) > 1 else 3
+
+    config_dir = tempfile.mkdtemp()
+    config = AmazonOrdersConfig(config_path=os.path.join(config_dir, "config.yml"),
+                                data={"output_dir": os.path.join(config_dir, "output"),
+                                      "cookie_jar_path": os.path.join(config_dir, "cookies.json")})
+    pages = sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "resources", "order-history-*.html"))) * number
+
+    print("{:<10} {:>8} {:>12} {:>12}".format("", "orders", "retained", "peak"))
+
+    for detach in [False, True]:
+        gc.collect()
+        tracemalloc.start()
+
+        orders = _build_orders(config, pages, detach)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+
+        tracemalloc.stop()
+
+        print("{:<10} {:>8} {:>10.1f}MB {:>10.1f}MB".format("detached" if detach else "attached",
+                                                            len(orders),
+                                                            retained / 1024 / 1024,
+                                                            peak / 1024 / 1024))
+
+        del orders
+
+
+if __name__ == "__main__":
+    benchmark_detach(sys.argv)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import glob
+import os
+import sys
+import timeit
+
+from amazonorders import util
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+
+BS4_PARSERS = ["html.parser", "lxml", "html5lib"]
+
+
+def benchmark_parsers(args):
+    """
+    The purpose of this script is to compare the per-page parse time of each BeautifulSoup parser
+    that ``bs4_parser`` can be configured to use, using the order pages in tests/resources, which are
+    representative of real order pages.
+
+    Parsers whose optional dependency is not installed are skipped. Pass a number as the first argument
+    to change the number of times each page is parsed (defaults to 5).
+    """
+    number = int(args[1]) if len(args) > 1 else 5
+
+    pages = sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "resources", "order-*.html")))
+    page_contents = {}
+    for page in pages:
+        with open(page, "r", encoding="utf-8") as f:
+            page_contents[os.path.basename(page)] = f.read()
+
+    available_parsers = [p for p in BS4_PARSERS if util.get_bs4_parser(p) == p]
+    skipped_parsers = [p for p in BS4_PARSERS if p not in available_parsers]
+    if skipped_parsers:
+        print(f"Skipping parsers that are not installed: {', '.join(skipped_parsers)}\n")
+
+    print("{:<45} {:>8} {}".format("page", "size", " ".join(f"{p:>12}" for p in available_parsers)))
+
+    totals = {p: 0.0 for p in available_parsers}
+    for page_name, content in page_contents.items():
+        timings = []
+        for bs4_parser in available_parsers:
+            elapsed = timeit.timeit(lambda: util.parse_html(content, bs4_parser), number=number) / number
+            totals[bs4_parser] += elapsed
+            timings.append(elapsed)
+
+        print("{:<45} {:>6}KB {}".format(page_name,
+                                         len(content.encode("utf-8")) // 1024,
+                                         " ".join(f"{t * 1000:>10.1f}ms" for t in timings)))
+
+    print("{:<45} {:>8} {}".format("mean", "",
+                                   " ".join(f"{totals[p] / len(page_contents) * 1000:>10.1f}ms"
+                                            for p in available_parsers)))
+
+
+if __name__ == "__main__":
+    benchmark_parsers(sys.argv)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import Response
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.orders import _build_history_page_strainer, _parse_history_page_html
+from amazonorders.pipeline import ParsePipeline
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+
+
+def _build_response(content):
+    response = Response()
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+def _parse_in_thread(config, strainer, response):
+    parsed = _parse_history_page_html(response.text, config, strainer)
+    orders = [config.order_cls(order_tag, config)
+              for order_tag in util.select(parsed, config.selectors.ORDER_HISTORY_ENTITY_SELECTOR)]
+    for order in orders:
+        order.detach()
+    return orders
+
+
+def benchmark_pipeline(args):
+    """
+    The purpose of this script is to compare the throughput of parsing order history pages, and building their
+    Orders, on threads (which are serialized by the GIL) against a ``ParsePipeline`` of worker processes, using the
+    order history pages in tests/resources, which are representative of real order history pages.
+
+    Pass a number as the first argument to change the number of times the pages are parsed (defaults to 5), and a
+    number as the second argument to change the number of threads and processes (defaults to the number of CPUs).
+    """
+    number = int(args[1]) if len(args) > 1 else 5
+    workers = int(args[2]) if len(args) > 2 else os.cpu_count() or 1
+
+    config_dir = tempfile.mkdtemp()
+    config = AmazonOrdersConfig(config_path=os.path.join(config_dir, "config.yml"),
+                                data={"output_dir": os.path.join(config_dir, "output"),
+                                      "cookie_jar_path": os.path.join(config_dir, "cookies.json")})
+
+    responses = []
+    for page in sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "resources", "order-history-*.html"))):
+        with open(page, "rb") as f:
+            responses.append(_build_response(f.read()))
+    responses *= number
+
+    print(f"Parsing {len(responses)} pages with {workers} workers\n")
+    print("{:<10} {:>8} {:>10} {:>14}".format("", "orders", "elapsed", "pages/second"))
+
+    strainer = _build_history_page_strainer(config)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        order_count = sum(len(orders) for orders in executor.map(lambda r: _parse_in_thread(config, strainer, r),
+                                                                 responses))
+        elapsed = time.perf_counter() - start
+    print("{:<10} {:>8} {:>9.2f}s {:>14.1f}".format("threads", order_count, elapsed, len(responses) / elapsed))
+
+    with ParsePipeline(config, max_processes=workers) as pipeline, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        # Start the workers before timing
+        pipeline.parse_history_page(responses[0])
+
+        start = time.perf_counter()
+        order_count = sum(len(orders) for orders, _ in executor.map(pipeline.parse_history_page, responses))
+        elapsed = time.perf_counter() - start
+    print("{:<10} {:>8} {:>9.2f}s {:>14.1f}".format("pipeline", order_count, elapsed, len(responses) / elapsed))
+
+
+if __name__ == "__main__":
+    benchmark_pipeline(sys.argv)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import glob
+import os
+import sys
+import tempfile
+import timeit
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+
+
+def benchmark_selectors(args):
+    """
+    The purpose of this script is to compare the time spent selecting with raw selector strings (which BeautifulSoup
+    passes through soupsieve's compile cache on every call) against the compiled selector registry, using the order
+    pages in tests/resources, which are representative of real order pages.
+
+    Every ``Selectors`` selector is run against every Order entity tag on each page, which is roughly the work that
+    building entities does. Pass a number as the first argument to change the number of times each page is
+    selected against (defaults to 5).
+    """
+    number = int(args[1]) if len(args) > 1 else 5
+
+    config_dir = tempfile.mkdtemp()
+    config = AmazonOrdersConfig(config_path=os.path.join(config_dir, "config.yml"),
+                                data={"output_dir": os.path.join(config_dir, "output"),
+                                      "cookie_jar_path": os.path.join(config_dir, "cookies.json")})
+    selectors = {}
+    for name, compiled_list in config.compiled_selectors.items():
+        value = getattr(config.selectors, name)
+        for s, compiled in zip([value] if isinstance(value, str) else value, compiled_list):
+            selectors[s] = compiled
+
+    print("{:<45} {:>8} {:>12} {:>12}".format("page", "selects", "raw", "compiled"))
+
+    raw_total = compiled_total = 0.0
+    pages = sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "resources", "order-*.html")))
+    for page in pages:
+        with open(page, "r", encoding="utf-8") as f:
+            parsed = util.parse_html(f.read(), config.bs4_parser)
+        entity_tags = (util.select(parsed, config.selectors.ORDER_HISTORY_ENTITY_SELECTOR) or
+                       util.select(parsed, config.selectors.ORDER_DETAILS_ENTITY_SELECTOR))
+
+        def select_raw():
+            for tag in entity_tags:
+                for s in selectors:
+                    tag.select(s)
+
+        def select_compiled():
+            for tag in entity_tags:
+                for compiled in selectors.values():
+                    compiled.select(tag)
+
+        raw = timeit.timeit(select_raw, number=number) / number
+        compiled = timeit.timeit(select_compiled, number=number) / number
+        raw_total += raw
+        compiled_total += compiled
+
+        print("{:<45} {:>8} {:>10.1f}ms {:>10.1f}ms".format(os.path.basename(page),
+                                                            len(entity_tags) * len(selectors),
+                                                            raw * 1000,
+                                                            compiled * 1000))
+
+    print("{:<45} {:>8} {:>10.1f}ms {:>10.1f}ms".format("mean", "",
+                                                        raw_total / len(pages) * 1000,
+                                                        compiled_total / len(pages) * 1000))
+
+
+if __name__ == "__main__":
+    benchmark_selectors(sys.argv)
@@ -1,9 +1,15 @@
 __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
+import gc
+import os
+import weakref
+
 from bs4 import BeautifulSoup
 
+from amazonorders import util
 from amazonorders.entity.order import Order
+from amazonorders.exception import AmazonOrdersEntityError
 from tests.unittestcase import UnitTestCase
 
 
@@ -343,3 +349,36 @@ href="/gp/buyagain/ref=ppx_od_dt_b_bia?ie=UTF8&amp;ats=eyJZXMiOiJCMDdZ%0AUUREOTR
         # self.assertEqual(order.refund_total, 5555.99)
         # self.assertEqual(order.subscription_discount, 6666.99)
         self.assertEqual(order.grand_total, 7777.99)
+
+    def test_order_number_required(self):
+        # GIVEN
+        html = "<div id=\"orderDetails\"><h1>Order Details</h1></div>"
+        parsed = BeautifulSoup(html, "html.parser")
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersEntityError):
+            Order(parsed, self.test_config)
+
+    def test_clone_not_kept_alive(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-10.html"), "r", encoding="utf-8") as f:
+            history_parsed = util.parse_html(f.read())
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-114-9460922-7737063.html"), "r",
+                  encoding="utf-8") as f:
+            details_parsed = util.parse_html(f.read())
+        clone = Order(util.select_one(history_parsed, self.test_config.selectors.ORDER_HISTORY_ENTITY_SELECTOR),
+                      self.test_config)
+        clone_ref = weakref.ref(clone)
+
+        # WHEN
+        order = Order(util.select_one(details_parsed, self.test_config.selectors.ORDER_DETAILS_ENTITY_SELECTOR),
+                      self.test_config, full_details=True, clone=clone)
+        order_number = clone.order_number
+        grand_total = clone.grand_total
+        del clone
+        gc.collect()
+
+        # THEN
+        self.assertIsNone(clone_ref())
+        self.assertEqual(order_number, order.order_number)
+        self.assertEqual(grand_total, order.grand_total)
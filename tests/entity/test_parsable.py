@@ -1,8 +1,13 @@
 __copyright__ = "Copyright (c) 2024 Jeff Sawatzky"
 __license__ = "MIT"
 
+import os
+import pickle
+from unittest.mock import patch
+
 from bs4 import BeautifulSoup
 
+from amazonorders import util
 from amazonorders.entity.parsable import Parsable
 from tests.unittestcase import UnitTestCase
 
@@ -24,3 +29,121 @@ class TestItem(UnitTestCase):
         self.assertEqual(parsable.to_currency("1,234.99"), 1234.99)
         self.assertEqual(parsable.to_currency("$1,234.99"), 1234.99)
         self.assertEqual(parsable.to_currency("not currency"), None)
+
+    def test_select_single_traversal(self):
+        # GIVEN
+        html = ("<div><span class='title'>Title</span><a class='link' href='/link'>Link</a>"
+                "<span class='other'>Other</span><span class='title'>Title 2</span></div>")
+        parsed = BeautifulSoup(html, "html.parser")
+
+        class SomeParsable(Parsable):
+            FIELD_SELECTOR_NAMES = ["FIELD_SOME_TITLE_SELECTOR", "FIELD_SOME_LINK_SELECTOR"]
+
+        self.test_config.selectors.FIELD_SOME_TITLE_SELECTOR = ["span.missing", "span.title"]
+        self.test_config.selectors.FIELD_SOME_LINK_SELECTOR = "a.link"
+
+        # WHEN
+        parsable = SomeParsable(parsed, self.test_config)
+        with patch("amazonorders.util.compile_selector", wraps=util.compile_selector) as compile_selector_mock:
+            title = parsable.simple_parse(self.test_config.selectors.FIELD_SOME_TITLE_SELECTOR)
+            link = parsable.simple_parse(self.test_config.selectors.FIELD_SOME_LINK_SELECTOR, attr_name="href")
+            titles = parsable.select(self.test_config.selectors.FIELD_SOME_TITLE_SELECTOR)
+            other = parsable.select_one("span.other")
+
+        # THEN
+        self.assertEqual("Title", title)
+        self.assertEqual(f"{self.test_config.constants.BASE_URL}/link", link)
+        self.assertEqual(["Title", "Title 2"], [t.text for t in titles])
+        self.assertEqual("Other", other.text)
+        # Each field selector, the combined selector, and the selector not in FIELD_SELECTOR_NAMES
+        self.assertEqual(["span.missing", "span.title", "a.link", "span.missing, span.title, a.link", "span.other"],
+                         [c.args[0] for c in compile_selector_mock.call_args_list])
+
+    def test_lazy_fields(self):
+        # GIVEN
+        html = "<div><span class='title'>Title</span><span class='price'>$12.50</span></div>"
+        parsed = BeautifulSoup(html, "html.parser")
+        parse_counts = {"title": 0, "price": 0}
+
+        class SomeParsable(Parsable):
+            def __init__(self, parsed, config):
+                super().__init__(parsed, config)
+
+                self.title = self.lazy(lambda: self._parse_title())
+                self.price = self.lazy(lambda: self._parse_price())
+                self.overridden = self.lazy(lambda: self._parse_title())
+                self.overridden = "Overridden"
+
+            def _parse_title(self):
+                parse_counts["title"] += 1
+                return self.simple_parse("span.title")
+
+            def _parse_price(self):
+                parse_counts["price"] += 1
+                return self.to_currency(self.simple_parse("span.price"))
+
+        # WHEN
+        parsable = SomeParsable(parsed, self.test_config)
+
+        # THEN
+        self.assertEqual({"title": 0, "price": 0}, parse_counts)
+        self.assertEqual("Title", parsable.title)
+        self.assertEqual("Title", parsable.title)
+        self.assertEqual({"title": 1, "price": 0}, parse_counts)
+        self.assertEqual("Overridden", parsable.overridden)
+        with self.assertRaises(AttributeError):
+            parsable.missing
+
+        # WHEN
+        state = parsable.__getstate__()
+
+        # THEN
+        self.assertEqual({"title": 1, "price": 1}, parse_counts)
+        self.assertEqual(12.5, state["price"])
+        self.assertNotIn("parsed", state)
+        self.assertNotIn("_lazy_fields", state)
+
+    def test_pickle_order_parses_lazy_fields(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-2961628-4757846.html"), "r",
+                  encoding="utf-8") as f:
+            parsed = util.parse_html(f.read())
+        order = self.test_config.order_cls(
+            util.select_one(parsed, self.test_config.selectors.ORDER_DETAILS_ENTITY_SELECTOR), self.test_config,
+            full_details=True)
+
+        # WHEN
+        unpickled = pickle.loads(pickle.dumps(order))
+
+        # THEN
+        self.assertEqual("112-2961628-4757846", unpickled.order_number)
+        self.assertEqual(order.grand_total, unpickled.grand_total)
+        self.assertEqual(order.subtotal, unpickled.subtotal)
+        self.assertEqual([i.title for i in order.items], [i.title for i in unpickled.items])
+        self.assertEqual(order.recipient.name, unpickled.recipient.name)
+        self.assertIsNone(unpickled.parsed)
+
+    def test_detach(self):
+        # GIVEN
+        html = "<div><span class='title'>Title</span><div class='child'><span class='title'>Child</span></div></div>"
+        parsed = BeautifulSoup(html, "html.parser")
+
+        class SomeParsable(Parsable):
+            def __init__(self, parsed, config):
+                super().__init__(parsed, config)
+
+                self.title = self.lazy(lambda: self.simple_parse("span.title"))
+                self.children = self.lazy(lambda: [SomeParsable(t, self.config) for t in self.select("div.child")])
+
+        parsable = SomeParsable(parsed.div, self.test_config)
+
+        # WHEN
+        parsable.detach()
+
+        # THEN
+        self.assertIsNone(parsable.parsed)
+        self.assertEqual("Title", parsable.title)
+        self.assertEqual(1, len(parsable.children))
+        self.assertIsNone(parsable.children[0].parsed)
+        self.assertEqual("Child", parsable.children[0].title)
+        self.assertEqual([], parsable.select("span.title"))
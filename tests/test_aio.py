@@ -0,0 +1,200 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import asyncio
+import datetime
+import os
+from unittest.mock import Mock, patch
+
+from amazonorders.aio import AsyncAmazonOrders, AsyncAmazonSession, AsyncAmazonTransactions
+from amazonorders.exception import AmazonOrdersError, AmazonOrdersNotFoundError
+from tests.unittestcase import UnitTestCase
+from tests.util.standinserver import StandInServer
+
+
+class TestAio(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.server = StandInServer()
+        self.server.start()
+        self.server.configure(self.test_config)
+
+        self.amazon_session = AsyncAmazonSession("some-username",
+                                                 "some-password",
+                                                 config=self.test_config)
+        self.amazon_orders = AsyncAmazonOrders(self.amazon_session)
+        self.amazon_transactions = AsyncAmazonTransactions(self.amazon_session)
+
+    def tearDown(self):
+        asyncio.run(self.amazon_session.close())
+        self.server.stop()
+
+        super().tearDown()
+
+    def given_landing_and_history_exist(self, year, start_index):
+        landing = self.server.add("GET", "/gp/css/order-history", "order-history-2023-10.html")
+        optional_start_index = f"&startIndex={start_index}" if start_index else ""
+        history = self.server.add("GET", f"/your-orders/orders?timeFilter=year-{year}{optional_start_index}",
+                                  f"order-history-{year}-{start_index}.html")
+        return landing, history
+
+    def test_get_orders_unauthenticated(self):
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            asyncio.run(self.amazon_orders.get_order_history())
+
+    def test_get_order_history_full_details(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        landing, history = self.given_landing_and_history_exist(2020, 40)
+        details = self.server.add("GET", "/gp/your-account/order-details*",
+                                  "order-details-114-9460922-7737063.html")
+
+        # WHEN
+        orders = asyncio.run(self.amazon_orders.get_order_history(year=2020, start_index=40, full_details=True))
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual(1, self.server.call_counts[landing])
+        self.assertEqual(1, self.server.call_counts[history])
+        self.assertEqual(10, self.server.call_counts[details])
+
+    def test_get_order_history_paginated(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        landing, history = self.given_landing_and_history_exist(2010, 0)
+        next_page = self.server.add("GET", "/your-orders/orders?timeFilter=year-2010"
+                                           "&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                                    "order-history-2010-10.html")
+
+        # WHEN
+        orders = asyncio.run(self.amazon_orders.get_order_history(year=2010))
+
+        # THEN
+        self.assertEqual(12, len(orders))
+        self.assertEqual(1, self.server.call_counts[landing])
+        self.assertEqual(1, self.server.call_counts[history])
+        self.assertEqual(1, self.server.call_counts[next_page])
+
+    def test_get_order(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        details = self.server.add("GET", f"/gp/your-account/order-details?orderID={order_id}",
+                                  f"order-details-{order_id}.html",
+                                  headers={"Set-Cookie": "session-token=some-token; Path=/"})
+
+        # WHEN
+        order = asyncio.run(self.amazon_orders.get_order(order_id))
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assertEqual(1, self.server.call_counts[details])
+        self.assertEqual("some-token", self.amazon_session.amazon_session.session.cookies.get("session-token"))
+        self.assertEqual(1, self.amazon_session.amazon_session.cookie_store.write_count)
+
+    def test_cookies(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        cookies = self.amazon_session.amazon_session.session.cookies
+        cookies.set("session-token", "some-token", domain="127.0.0.1", path="/")
+        cookies.set("x-main", "some-main", domain="127.0.0.1", path="/")
+        cookies.set("other-token", "other-token", domain=".example.com", path="/")
+        cookies.set("other-path", "other-path", domain="127.0.0.1", path="/some-other-path")
+        redirect = self.server.add("GET", "/redirect", status=302,
+                                   headers={"Location": "/landing",
+                                            "Set-Cookie": "x-main=; Max-Age=0; Path=/"})
+        landing = self.server.add("GET", "/landing", "order-history-2023-10.html",
+                                  headers={"Set-Cookie": "ubid-main=some-ubid; Max-Age=3600; Path=/"})
+
+        # WHEN
+        response = asyncio.run(self.amazon_session.get(f"{self.server.base_url}/redirect"))
+
+        # THEN
+        self.assertEqual(f"{self.server.base_url}/landing", response.response.url)
+        self.assertEqual(1, len(response.response.history))
+        self.assertEqual("session-token=some-token; x-main=some-main",
+                         self.server.request_headers[redirect][0]["Cookie"])
+        # The cookie deleted by the redirect isn't sent on
+        self.assertEqual("session-token=some-token", self.server.request_headers[landing][0]["Cookie"])
+        self.assertIsNone(cookies.get("x-main"))
+        ubid_main = next(c for c in cookies if c.name == "ubid-main")
+        self.assertIsNotNone(ubid_main.expires)
+
+    def test_get_order_cached_and_captured(self):
+        # GIVEN
+        asyncio.run(self.amazon_session.close())
+        self.test_config.update_config("cache_dir", os.path.join(os.path.dirname(self.test_config.cookie_jar_path),
+                                                                 "cache"), save=False)
+        self.amazon_session = AsyncAmazonSession("some-username",
+                                                 "some-password",
+                                                 debug=True,
+                                                 config=self.test_config)
+        self.amazon_orders = AsyncAmazonOrders(self.amazon_session)
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        details = self.server.add("GET", f"/gp/your-account/order-details?orderID={order_id}",
+                                  f"order-details-{order_id}.html")
+
+        # WHEN
+        asyncio.run(self.amazon_orders.get_order(order_id))
+        order = asyncio.run(self.amazon_orders.get_order(order_id))
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assertEqual(1, self.server.call_counts[details])
+        response_cache = self.amazon_session.amazon_session.response_cache
+        self.assertEqual(1, response_cache.hits)
+        self.assertEqual(1, response_cache.misses)
+        page_capture = self.amazon_session.amazon_session.page_capture
+        page_capture.flush()
+        # Like the synchronous session, only the response that wasn't cached is captured
+        self.assertEqual(["order-details_0.html"],
+                         sorted(f for f in os.listdir(self.test_config.output_dir) if f.startswith("order-details")))
+
+    def test_close(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        details = self.server.add("GET", f"/gp/your-account/order-details?orderID={order_id}",
+                                  f"order-details-{order_id}.html")
+        asyncio.run(self.amazon_orders.get_order(order_id))
+        executor = self.amazon_session.executor
+
+        # WHEN
+        asyncio.run(self.amazon_session.close())
+
+        # THEN
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+        self.assertIsNot(executor, self.amazon_session.executor)
+        order = asyncio.run(self.amazon_orders.get_order(order_id))
+        self.assertEqual(order_id, order.order_number)
+        self.assertEqual(2, self.server.call_counts[details])
+
+    def test_get_order_not_found(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.server.add("GET", "/gp/your-account/order-details?orderID=1234-1234",
+                        status=302, headers={"Location": "/gp/css/order-history"})
+        self.server.add("GET", "/gp/css/order-history", "order-history-2023-10.html")
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersNotFoundError):
+            asyncio.run(self.amazon_orders.get_order("1234-1234"))
+
+    @patch("amazonorders.aio.datetime", wraps=datetime)
+    def test_get_transactions(self, mock_get_today: Mock):
+        # GIVEN
+        mock_get_today.date.today.return_value = datetime.date(2024, 10, 11)
+        self.amazon_session.is_authenticated = True
+        landing = self.server.add("GET", "/cpe/yourpayments/transactions", "get-transactions.html")
+
+        # WHEN
+        transactions = asyncio.run(self.amazon_transactions.get_transactions(days=1))
+
+        # THEN
+        self.assertEqual(1, len(transactions))
+        self.assertEqual(1, self.server.call_counts[landing])
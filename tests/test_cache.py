@@ -0,0 +1,94 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import time
+from unittest.mock import patch
+
+from requests import Response
+
+from amazonorders.cache import ResponseCache, normalize_url
+from tests.unittestcase import UnitTestCase
+
+
+class TestCache(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.cache_dir = os.path.join(os.path.dirname(self.test_config.cookie_jar_path), "cache")
+        self.details_url = f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID=112-0069846-3552220"
+
+    def build_response(self, url, text):
+        response = Response()
+        response.url = url
+        response.status_code = 200
+        response.encoding = "utf-8"
+        response._content = text.encode("utf-8")
+        return response
+
+    def test_normalize_url(self):
+        # WHEN
+        normalized_url = normalize_url("https://WWW.amazon.com/gp/your-account/order-details/"
+                                       "ref=ppx_yo_dt_b_order_details_o00?orderID=112-0069846-3552220&ie=UTF8#top")
+
+        # THEN
+        self.assertEqual("https://www.amazon.com/gp/your-account/order-details?orderID=112-0069846-3552220",
+                         normalized_url)
+
+    def test_get_put(self):
+        # GIVEN
+        cache = ResponseCache(self.cache_dir, {"order_details": 60}, 1024 * 1024)
+
+        # WHEN
+        self.assertIsNone(cache.get(self.details_url, "order_details"))
+        cache.put(self.details_url, self.build_response(self.details_url, "<html>details</html>"))
+        response = cache.get(f"{self.details_url}&ref_=some-ref", "order_details")
+
+        # THEN
+        self.assertEqual(self.details_url, response.url)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("<html>details</html>", response.text)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertIsNone(cache.get(self.details_url, "order_details", namespace="other-username"))
+
+        # WHEN
+        reloaded_cache = ResponseCache(self.cache_dir, {"order_details": 60}, 1024 * 1024)
+
+        # THEN
+        self.assertEqual("<html>details</html>", reloaded_cache.get(self.details_url, "order_details").text)
+
+    def test_get_expired(self):
+        # GIVEN
+        cache = ResponseCache(self.cache_dir, {"order_details": 60, "order_history": 0}, 1024 * 1024)
+        cache.put(self.details_url, self.build_response(self.details_url, "<html>details</html>"))
+
+        # WHEN
+        with patch("amazonorders.cache.time.time", return_value=time.time() + 61):
+            response = cache.get(self.details_url, "order_details")
+
+        # THEN
+        self.assertIsNone(response)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0, cache.size)
+        self.assertFalse(cache.is_cacheable("order_history"))
+        self.assertFalse(cache.is_cacheable(None))
+
+    def test_put_evicts_least_recently_used(self):
+        # GIVEN
+        text = "x" * 1000
+        cache = ResponseCache(self.cache_dir, {"order_details": 60}, 2500)
+        urls = [f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID={i}" for i in range(3)]
+        cache.put(urls[0], self.build_response(urls[0], text))
+        cache.put(urls[1], self.build_response(urls[1], text))
+        cache.get(urls[0], "order_details")
+
+        # WHEN
+        cache.put(urls[2], self.build_response(urls[2], text))
+
+        # THEN
+        self.assertLessEqual(cache.size, 2500)
+        self.assertIsNotNone(cache.get(urls[0], "order_details"))
+        self.assertIsNone(cache.get(urls[1], "order_details"))
+        self.assertIsNotNone(cache.get(urls[2], "order_details"))
@@ -0,0 +1,70 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import subprocess
+import sys
+
+from amazonorders.captcha import CaptchaSolver
+from tests.unittestcase import UnitTestCase
+
+
+class TestCaptcha(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(os.path.join(self.RESOURCES_DIR, "captcha_easy.jpg"), "rb") as f:
+            self.easy_image = f.read()
+        with open(os.path.join(self.RESOURCES_DIR, "captcha_hard.jpg"), "rb") as f:
+            self.hard_image = f.read()
+
+    def test_solve(self):
+        # GIVEN
+        with CaptchaSolver() as captcha_solver:
+            # WHEN
+            solution = captcha_solver.solve(self.easy_image)
+            cached_solution = captcha_solver.solve(self.easy_image)
+
+        # THEN
+        self.assertEqual("FBJRAC", solution)
+        self.assertEqual("FBJRAC", cached_solution)
+        self.assertEqual(1, captcha_solver.solve_count)
+        self.assertEqual(1, captcha_solver.cache_hit_count)
+
+    def test_solve_not_solved(self):
+        # GIVEN
+        captcha_solver = CaptchaSolver(max_processes=0)
+
+        # WHEN
+        solution = captcha_solver.solve(self.hard_image)
+        captcha_solver.solve(self.hard_image)
+
+        # THEN
+        self.assertIsNone(solution)
+        self.assertEqual(2, captcha_solver.solve_count)
+        self.assertEqual(0, captcha_solver.cache_hit_count)
+
+    def test_cache_size(self):
+        # GIVEN
+        captcha_solver = CaptchaSolver(max_processes=0, cache_size=1)
+        other_image = self.easy_image + b"\0"
+
+        # WHEN
+        captcha_solver.solve(self.easy_image)
+        captcha_solver.solve(other_image)
+        captcha_solver.solve(self.easy_image)
+
+        # THEN
+        self.assertEqual(3, captcha_solver.solve_count)
+        self.assertEqual(0, captcha_solver.cache_hit_count)
+
+    def test_captcha_stack_imported_lazily(self):
+        # WHEN
+        output = subprocess.check_output([sys.executable, "-c",
+                                          "import sys, amazonorders.session; "
+                                          "print(any(m.split('.')[0] in ('PIL', 'amazoncaptcha') "
+                                          "for m in sys.modules))"],
+                                         cwd=os.path.dirname(os.path.dirname(self.RESOURCES_DIR)))
+
+        # THEN
+        self.assertEqual("False", output.decode().strip())
@@ -0,0 +1,113 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import gzip
+import os
+
+import responses
+
+from amazonorders.capture import PageCapture
+from amazonorders.session import AmazonSession
+from tests.unittestcase import UnitTestCase
+
+
+class TestCapture(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.output_dir = self.test_config.output_dir
+        self.details_url = f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID=112-0069846-3552220"
+
+    def test_capture(self):
+        # GIVEN
+        with open(os.path.join(self.output_dir, "order-details_0.html"), "w") as f:
+            f.write("<html>Existing</html>")
+        with open(os.path.join(self.output_dir, "order-details_3.html"), "w") as f:
+            f.write("<html>Existing</html>")
+        page_capture = PageCapture(self.output_dir)
+
+        # WHEN
+        page_capture.capture(self.details_url, "<html>Order 1</html>")
+        page_capture.capture(self.details_url, "<html>Order 2</html>")
+        page_capture.capture(self.test_config.constants.BASE_URL, "<html>Index</html>")
+        page_capture.close()
+
+        # THEN
+        self.assertEqual(3, page_capture.write_count)
+        with open(os.path.join(self.output_dir, "order-details_4.html"), "r") as f:
+            self.assertEqual("<html>Order 1</html>", f.read())
+        with open(os.path.join(self.output_dir, "order-details_5.html"), "r") as f:
+            self.assertEqual("<html>Order 2</html>", f.read())
+        with open(os.path.join(self.output_dir, "index_0.html"), "r") as f:
+            self.assertEqual("<html>Index</html>", f.read())
+
+    def test_capture_dedupe(self):
+        # GIVEN
+        page_capture = PageCapture(self.output_dir, dedupe=True)
+
+        # WHEN
+        page_capture.capture(self.details_url, "<html>Order</html>")
+        page_capture.capture(self.details_url, "<html>Order</html>")
+        page_capture.capture(self.details_url, "<html>Other Order</html>")
+        page_capture.close()
+
+        # THEN
+        self.assertEqual(2, page_capture.write_count)
+        self.assertEqual(1, page_capture.duplicate_count)
+        self.assertEqual(["order-details_0.html", "order-details_1.html"], sorted(os.listdir(self.output_dir)))
+
+    def test_capture_compress(self):
+        # GIVEN
+        page_capture = PageCapture(self.output_dir, compress=True)
+        content = "<html>{}</html>".format("Order " * 1000)
+
+        # WHEN
+        page_capture.capture(self.details_url, content)
+        page_capture.close()
+
+        # THEN
+        path = os.path.join(self.output_dir, "order-details_0.html.gz")
+        self.assertLess(os.path.getsize(path), len(content))
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(content, f.read())
+
+    def test_capture_max_size(self):
+        # GIVEN
+        page_capture = PageCapture(self.output_dir, dedupe=True, max_size=250)
+
+        # WHEN
+        for i in range(5):
+            page_capture.capture(self.details_url, "<html>{}</html>".format(str(i) * 100))
+        page_capture.close()
+
+        # THEN
+        self.assertEqual(5, page_capture.write_count)
+        self.assertEqual(3, page_capture.evicted_count)
+        self.assertEqual(["order-details_3.html", "order-details_4.html"], sorted(os.listdir(self.output_dir)))
+        self.assertEqual(226, page_capture.size)
+
+        # WHEN
+        page_capture.capture(self.details_url, "<html>{}</html>".format("0" * 100))
+        page_capture.close()
+
+        # THEN
+        self.assertEqual(6, page_capture.write_count)
+        self.assertEqual(0, page_capture.duplicate_count)
+
+    @responses.activate
+    def test_session_debug(self):
+        # GIVEN
+        amazon_session = AmazonSession("some-username",
+                                       "some-password",
+                                       debug=True,
+                                       config=self.test_config)
+        responses.add(responses.GET, self.details_url, body="<html>Order</html>", status=200)
+
+        # WHEN
+        amazon_session.get(self.details_url)
+        amazon_session.get(self.details_url)
+        amazon_session.page_capture.flush()
+
+        # THEN
+        self.assertEqual(["order-details_0.html", "order-details_1.html"], sorted(os.listdir(self.output_dir)))
+        self.assertEqual(0, amazon_session.page_capture.duplicate_count)
@@ -60,6 +60,56 @@ class TestCli(UnitTestCase):
         self.assertIn("Order #113-4970960-6452217", response.output)
         self.assertIn("Order #112-9733602-9062669", response.output)
 
+    @responses.activate
+    def test_history_command_year_range(self):
+        # GIVEN
+        self.given_login_responses_success()
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_any_order_history_exists("order-history-2010-10.html")
+
+        # WHEN
+        response = self.runner.invoke(amazon_orders_cli,
+                                      ["--config-path", self.test_config.config_path,
+                                       "--username", "some-username", "--password",
+                                       "some-password", "history", "--year-range", "2009", "2010"])
+
+        # THEN
+        self.assertEqual(0, response.exit_code)
+        self.assert_login_responses_success()
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(2, resp2.call_count)
+        self.assertIn("Order History for 2009-2010", response.output)
+        self.assertIn("4 orders parsed", response.output)
+
+    @responses.activate
+    def test_sync_command(self):
+        # GIVEN
+        self.given_login_responses_success()
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_any_order_history_exists("order-history-2010-10.html")
+
+        # WHEN
+        response = self.runner.invoke(amazon_orders_cli,
+                                      ["--config-path", self.test_config.config_path,
+                                       "--username", "some-username", "--password",
+                                       "some-password", "sync"])
+
+        # THEN
+        self.assertEqual(0, response.exit_code)
+        self.assert_login_responses_success()
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertIn("2 new orders synced, 2 orders stored", response.output)
+
+    def test_selector_stats_command(self):
+        # WHEN
+        response = self.runner.invoke(amazon_orders_cli,
+                                      ["--config-path", self.test_config.config_path, "selector-stats"])
+
+        # THEN
+        self.assertEqual(0, response.exit_code)
+        self.assertIn("No selector stats have been recorded", response.output)
+
     @responses.activate
     def test_order_command(self):
         # GIVEN
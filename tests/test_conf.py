@@ -2,6 +2,7 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import os
+import pickle
 import shutil
 from unittest import TestCase
 
@@ -46,17 +47,41 @@ class TestConf(TestCase):
         config.save()
 
         # THEN
+        test_store_path = os.path.join(conf.DEFAULT_CONFIG_DIR, "orders.db")
         self.assertTrue(os.path.exists(config_path))
         with open(config.config_path, "r") as f:
-            self.assertEqual("""constants_class: amazonorders.constants.Constants
+            self.assertEqual("""adaptive_selectors: false
+bs4_parser: html.parser
+cache_dir: null
+cache_max_size: 104857600
+cache_ttl:
+  order_details: 3600
+  order_history: 300
+capture_compress: false
+capture_dedupe: false
+capture_max_size: null
+connect_timeout: 10
+constants_class: amazonorders.constants.Constants
+cookie_flush_interval: 0
 cookie_jar_path: {}
+currency_as_decimal: false
+detach_entities: false
 item_class: amazonorders.entity.item.Item
 max_auth_attempts: 10
+max_retries: 3
+max_workers: 4
 order_class: amazonorders.entity.order.Order
 output_dir: {}
+persist_selector_stats: false
+rate_limit: null
+read_timeout: 30
+restrict_history_parse: true
+retry_backoff: 0.5
 selectors_class: amazonorders.selectors.Selectors
+session_freshness: 0
 shipment_class: amazonorders.entity.shipment.Shipment
-""".format(self.test_cookie_jar_path, self.test_output_dir), f.read())
+store_path: {}
+""".format(self.test_cookie_jar_path, self.test_output_dir, test_store_path), f.read())
 
     def test_override_default(self):
         # GIVEN
@@ -99,3 +124,21 @@ output_dir: {}
 
         # THEN
         self.assertEqual(7, config.max_auth_attempts)
+
+    def test_pickle(self):
+        # GIVEN
+        config = AmazonOrdersConfig(data={
+            "output_dir": self.test_output_dir,
+            "cookie_jar_path": self.test_cookie_jar_path,
+            "max_workers": 2
+        })
+
+        # WHEN
+        data = pickle.dumps(config)
+        unpickled_config = pickle.loads(data)
+
+        # THEN
+        self.assertNotIn(b"SelectorStats", data)
+        self.assertEqual(config.config_path, unpickled_config.config_path)
+        self.assertEqual(config._data, unpickled_config._data)
+        self.assertEqual(2, unpickled_config.max_workers)
@@ -0,0 +1,182 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import gc
+import json
+import os
+import time
+import weakref
+
+from requests.cookies import RequestsCookieJar
+
+from amazonorders import cookies
+from amazonorders.cookies import CookieStore
+from tests.unittestcase import UnitTestCase
+
+
+class TestCookies(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.cookie_jar = RequestsCookieJar()
+        self.cookie_jar.set("session-token", "some-token")
+
+    def test_save_only_when_changed(self):
+        # GIVEN
+        cookie_store = CookieStore(self.test_config.cookie_jar_path)
+
+        # WHEN
+        self.assertTrue(cookie_store.save(self.cookie_jar))
+        self.assertFalse(cookie_store.save(self.cookie_jar))
+
+        # THEN
+        self.assertEqual(1, cookie_store.write_count)
+        self.assertEqual({"session-token": "some-token"}, self._read_cookie_values())
+        self.assertFalse([f for f in os.listdir(os.path.dirname(self.test_config.cookie_jar_path))
+                          if f.startswith(".cookies-")])
+
+        # WHEN
+        self.cookie_jar.set("x-main", "some-main")
+
+        # THEN
+        self.assertTrue(cookie_store.save(self.cookie_jar))
+        self.assertEqual(2, cookie_store.write_count)
+
+    def test_load_then_save_unchanged(self):
+        # GIVEN
+        CookieStore(self.test_config.cookie_jar_path).save(self.cookie_jar)
+        cookie_store = CookieStore(self.test_config.cookie_jar_path)
+        cookie_jar = RequestsCookieJar()
+
+        # WHEN
+        cookie_store.load(cookie_jar)
+
+        # THEN
+        self.assertEqual("some-token", cookie_jar.get("session-token"))
+        self.assertFalse(cookie_store.save(cookie_jar))
+        self.assertEqual(0, cookie_store.write_count)
+
+    def test_flush_interval_coalesces_writes(self):
+        # GIVEN
+        cookie_store = CookieStore(self.test_config.cookie_jar_path, flush_interval=60)
+
+        # WHEN
+        cookie_store.save(self.cookie_jar)
+        self.cookie_jar.set("x-main", "some-main")
+        cookie_store.save(self.cookie_jar)
+
+        # THEN
+        self.assertEqual(0, cookie_store.write_count)
+        self.assertFalse(os.path.exists(self.test_config.cookie_jar_path))
+
+        # WHEN
+        cookie_store.flush()
+
+        # THEN
+        self.assertEqual(1, cookie_store.write_count)
+        self.assertEqual({"session-token": "some-token", "x-main": "some-main"}, self._read_cookie_values())
+
+    def test_flush_interval_flushed_at_exit(self):
+        # GIVEN
+        cookie_store = CookieStore(self.test_config.cookie_jar_path, flush_interval=60)
+        cookie_store.save(self.cookie_jar)
+
+        # WHEN
+        cookies._flush_at_exit()
+
+        # THEN
+        self.assertEqual(1, cookie_store.write_count)
+        self.assertEqual({"session-token": "some-token"}, self._read_cookie_values())
+
+        # WHEN
+        cookie_store_ref = weakref.ref(cookie_store)
+        del cookie_store
+        gc.collect()
+
+        # THEN
+        # Once its changes are written, the store isn't kept alive to be flushed at exit
+        self.assertIsNone(cookie_store_ref())
+
+    def test_clear(self):
+        # GIVEN
+        cookie_store = CookieStore(self.test_config.cookie_jar_path)
+        cookie_store.save(self.cookie_jar)
+
+        # WHEN
+        cookie_store.clear()
+
+        # THEN
+        self.assertFalse(os.path.exists(self.test_config.cookie_jar_path))
+        self.assertTrue(cookie_store.save(self.cookie_jar))
+
+    def test_metadata_persisted(self):
+        # GIVEN
+        expires = int(time.time()) + 3600
+        self.cookie_jar.set("x-main", "some-main", domain=".amazon.com", path="/gp", expires=expires, secure=True)
+        self.cookie_jar.set("expired", "some-value", domain=".amazon.com", expires=int(time.time()) - 1)
+        CookieStore(self.test_config.cookie_jar_path).save(self.cookie_jar)
+        cookie_jar = RequestsCookieJar()
+
+        # WHEN
+        CookieStore(self.test_config.cookie_jar_path).load(cookie_jar)
+
+        # THEN
+        self.assertEqual({"session-token", "x-main"}, {c.name for c in cookie_jar})
+        cookie = [c for c in cookie_jar if c.name == "x-main"][0]
+        self.assertEqual(".amazon.com", cookie.domain)
+        self.assertEqual("/gp", cookie.path)
+        self.assertEqual(expires, cookie.expires)
+        self.assertTrue(cookie.secure)
+
+    def test_load_legacy_format(self):
+        # GIVEN
+        with open(self.test_config.cookie_jar_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"session-token": "some-token", "x-main": "some-main"}))
+        cookie_store = CookieStore(self.test_config.cookie_jar_path)
+        cookie_jar = RequestsCookieJar()
+
+        # WHEN
+        cookie_store.load(cookie_jar)
+
+        # THEN
+        self.assertEqual("some-token", cookie_jar.get("session-token"))
+        self.assertEqual("some-main", cookie_jar.get("x-main"))
+        self.assertFalse(cookie_store.save(cookie_jar))
+
+        # WHEN
+        cookie_jar.set("ubid-main", "some-ubid")
+        cookie_store.save(cookie_jar)
+
+        # THEN
+        with open(self.test_config.cookie_jar_path, "r", encoding="utf-8") as f:
+            self.assertEqual(2, json.loads(f.read())["version"])
+
+    def test_changes_merged_between_stores(self):
+        # GIVEN
+        CookieStore(self.test_config.cookie_jar_path).save(self.cookie_jar)
+        cookie_store_1 = CookieStore(self.test_config.cookie_jar_path)
+        cookie_jar_1 = RequestsCookieJar()
+        cookie_store_1.load(cookie_jar_1)
+        cookie_store_2 = CookieStore(self.test_config.cookie_jar_path)
+        cookie_jar_2 = RequestsCookieJar()
+        cookie_store_2.load(cookie_jar_2)
+
+        # WHEN
+        cookie_jar_1.set("session-token", "new-token")
+        cookie_store_1.save(cookie_jar_1)
+        cookie_jar_2.set("x-main", "some-main")
+        cookie_store_2.save(cookie_jar_2)
+
+        # THEN
+        self.assertEqual("new-token", cookie_jar_2.get("session-token"))
+        self.assertEqual({"session-token": "new-token", "x-main": "some-main"}, self._read_cookie_values())
+
+        # WHEN
+        self.assertFalse(cookie_store_1.save(cookie_jar_1))
+
+        # THEN
+        self.assertEqual("some-main", cookie_jar_1.get("x-main"))
+
+    def _read_cookie_values(self):
+        with open(self.test_config.cookie_jar_path, "r", encoding="utf-8") as f:
+            return {c["name"]: c["value"] for c in json.loads(f.read())["cookies"]}
@@ -0,0 +1,51 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+from decimal import Decimal
+
+from amazonorders.currency import CurrencyParser, get_currency_separators
+from tests.testcase import TestCase
+
+
+class TestCurrency(TestCase):
+    def test_parse(self):
+        # GIVEN
+        currency_parser = CurrencyParser("en_US")
+
+        # WHEN
+        values = currency_parser.parse_many(["$1,234.99", "1,234.99", "$12", "-CA$12.34", "+CA$12.34", "USD 5.00",
+                                             12.5, "", None, "not currency", "$0.00 - $5.00"])
+
+        # THEN
+        self.assertEqual([1234.99, 1234.99, 12, -12.34, 12.34, 5.0, 12.5, None, None, None, None], values)
+        self.assertIsInstance(values[2], int)
+        self.assertIsInstance(values[5], float)
+
+    def test_parse_comma_decimal_locale(self):
+        # GIVEN
+        de_parser = CurrencyParser("de_DE")
+        fr_parser = CurrencyParser("fr_FR")
+
+        # WHEN
+        de_values = de_parser.parse_many(["1.234,99 €", "EUR 12,50", "-3,00 €", "7 €"])
+        fr_values = fr_parser.parse_many(["1\u202f234,99 €", "1 234,99 €", "12,50\u00a0€"])
+
+        # THEN
+        self.assertEqual([1234.99, 12.5, -3.0, 7], de_values)
+        self.assertEqual([1234.99, 1234.99, 12.5], fr_values)
+
+    def test_parse_decimal(self):
+        # GIVEN
+        currency_parser = CurrencyParser("en_US", use_decimal=True)
+
+        # WHEN
+        values = currency_parser.parse_many(["$1,234.99", "$0.10", "-$12", "not currency"])
+
+        # THEN
+        self.assertEqual([Decimal("1234.99"), Decimal("0.10"), Decimal("-12"), None], values)
+        self.assertEqual(Decimal("1235.09"), values[0] + values[1])
+
+    def test_get_currency_separators(self):
+        self.assertEqual((",", "."), get_currency_separators("de_AT"))
+        self.assertEqual((".", ","), get_currency_separators("en_GB"))
+        self.assertEqual((".", ","), get_currency_separators("xx_XX"))
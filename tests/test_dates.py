@@ -0,0 +1,91 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import pickle
+
+from amazonorders.dates import DateParser
+from tests.testcase import TestCase
+
+
+class TestDates(TestCase):
+    def test_parse(self):
+        # GIVEN
+        date_parser = DateParser("en_US")
+
+        values = ["Order placed\n\n\n      October 27, 2020",
+                  "Return window closed on Nov 11, 2020",
+                  "Delivered Sept. 3, 2023",
+                  "3 October 2023",
+                  "2023-10-03"]
+
+        # WHEN
+        dates = [date_parser.parse(value, fuzzy=True) for value in values]
+
+        # THEN
+        self.assertEqual([datetime.date(2020, 10, 27), datetime.date(2020, 11, 11), datetime.date(2023, 9, 3),
+                          datetime.date(2023, 10, 3), datetime.date(2023, 10, 3)], dates)
+        self.assertEqual(0, date_parser.fallbacks)
+
+    def test_parse_locale(self):
+        # GIVEN
+        de_parser = DateParser("de_DE")
+        fr_parser = DateParser("fr_FR")
+        es_parser = DateParser("es_ES")
+
+        # WHEN
+        de_date = de_parser.parse("Bestellung aufgegeben 3. Oktober 2023")
+        fr_date = fr_parser.parse("Commande effectuée le 3 février 2023")
+        es_date = es_parser.parse("Pedido realizado el 3 de octubre de 2023")
+        en_date = de_parser.parse("October 3, 2023")
+
+        # THEN
+        self.assertEqual(datetime.date(2023, 10, 3), de_date)
+        self.assertEqual(datetime.date(2023, 2, 3), fr_date)
+        self.assertEqual(datetime.date(2023, 10, 3), es_date)
+        self.assertEqual(datetime.date(2023, 10, 3), en_date)
+        self.assertEqual(0, de_parser.fallbacks + fr_parser.fallbacks + es_parser.fallbacks)
+
+    def test_parse_fallback(self):
+        # GIVEN
+        date_parser = DateParser("en_US")
+
+        # WHEN
+        fallback_date = date_parser.parse("10/03/2023")
+        with self.assertRaises(ValueError):
+            date_parser.parse("Return eligibility", fuzzy=True)
+        with self.assertRaises(ValueError):
+            date_parser.parse("Return eligibility", fuzzy=True)
+        with self.assertRaises(ValueError):
+            date_parser.parse("February 30, 2023", fuzzy=True)
+
+        # THEN
+        self.assertEqual(datetime.date(2023, 10, 3), fallback_date)
+        self.assertEqual(3, date_parser.fallbacks)
+        self.assertEqual(1, date_parser.cache_info().hits)
+
+    def test_parse_memoized(self):
+        # GIVEN
+        date_parser = DateParser("en_US", cache_size=2)
+
+        # WHEN
+        for value in ["October 3, 2023", "October 3, 2023", "Nov 11, 2020", "Jan 1, 2021", "October 3, 2023"]:
+            date_parser.parse(value)
+
+        # THEN
+        cache_info = date_parser.cache_info()
+        self.assertEqual(1, cache_info.hits)
+        self.assertEqual(4, cache_info.misses)
+        self.assertEqual(2, cache_info.currsize)
+
+    def test_pickle(self):
+        # GIVEN
+        date_parser = DateParser("de_DE")
+        date_parser.parse("10/03/2023")
+
+        # WHEN
+        unpickled = pickle.loads(pickle.dumps(date_parser))
+
+        # THEN
+        self.assertEqual(1, unpickled.fallbacks)
+        self.assertEqual(datetime.date(2023, 10, 3), unpickled.parse("3. Oktober 2023"))
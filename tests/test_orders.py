@@ -2,12 +2,17 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import os
+import re
+import threading
+import time
 import unittest
 
 import responses
 
-from amazonorders.exception import AmazonOrdersError
-from amazonorders.orders import AmazonOrders
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.exception import AmazonOrdersError, AmazonOrdersNotFoundError
+from amazonorders.orders import AmazonOrders, HISTORY_PAGE_PREFETCH
 from amazonorders.session import AmazonSession
 from tests.unittestcase import UnitTestCase
 
@@ -51,6 +56,31 @@ class TestOrders(UnitTestCase):
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
 
+    @responses.activate
+    def test_get_order_history_landing_visited_once_when_fresh(self):
+        # GIVEN
+        config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                    data={"output_dir": self.test_config.output_dir,
+                                          "cookie_jar_path": self.test_config.cookie_jar_path,
+                                          "session_freshness": 3600})
+        amazon_session = AmazonSession("some-username",
+                                       "some-password",
+                                       config=config)
+        amazon_session.is_authenticated = True
+        amazon_session.session_state.mark_validated()
+        amazon_orders = AmazonOrders(amazon_session)
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(2018, 0)
+
+        # WHEN
+        amazon_orders.get_order_history(year=2018, start_index=0)
+        orders = amazon_orders.get_order_history(year=2018, start_index=0)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(2, resp2.call_count)
+
     @responses.activate
     def test_get_order_history_2024_data_component(self):
         # GIVEN
@@ -103,6 +133,258 @@ class TestOrders(UnitTestCase):
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(1, resp3.call_count)
 
+    @responses.activate
+    def test_iter_order_history(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2010
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, 0)
+        with open(os.path.join(self.RESOURCES_DIR, f"order-history-{year}-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp3 = responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_HISTORY_URL}?timeFilter=year-{year}"
+                "&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        orders = self.amazon_orders.iter_order_history(year=year)
+
+        # THEN
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(0, resp2.call_count)
+        first_order = next(orders)
+        self.assertEqual(1, resp2.call_count)
+        remaining_orders = list(orders)
+        self.assertEqual(11, len(remaining_orders))
+        self.assertEqual([o.order_number for o in self.amazon_orders.get_order_history(year=year)],
+                         [o.order_number for o in [first_order] + remaining_orders])
+        self.assertEqual(2, resp3.call_count)
+
+    @responses.activate
+    def test_get_order_history_fetches_remaining_pages_concurrently(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2018
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, 0)
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-10.html"), "r",
+                  encoding="utf-8") as f:
+            body = f.read()
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def remaining_page_callback(request):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return 200, {}, body
+
+        resp3 = responses.add_callback(
+            responses.GET,
+            re.compile(f"{self.test_config.constants.ORDER_HISTORY_URL}\\?timeFilter=year-{year}"
+                       "&startIndex=[1-9][0-9]*&.*"),
+            callback=remaining_page_callback,
+        )
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year)
+
+        # THEN
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(8, resp3.call_count)
+        self.assertGreater(in_flight[1], HISTORY_PAGE_PREFETCH)
+        self.assertEqual([f"startIndex={i}" for i in range(10, 90, 10)],
+                         sorted([re.search(r"startIndex=\d+", c.request.url).group(0) for c in resp3.calls],
+                                key=lambda s: int(s.split("=")[1])))
+        self.assertEqual(10 + 8 * 2, len(orders))
+
+    @responses.activate
+    def test_iter_order_history_closed_early(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2018
+        self.given_order_history_landing_exists()
+        resp1 = self.given_order_history_exists(year, 0)
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp2 = responses.add(
+                responses.GET,
+                re.compile(f"{self.test_config.constants.ORDER_HISTORY_URL}\\?timeFilter=year-{year}"
+                           "&startIndex=[1-9][0-9]*&.*"),
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        orders = self.amazon_orders.iter_order_history(year=year)
+        next(orders)
+        orders.close()
+
+        # THEN
+        self.assertEqual(1, resp1.call_count)
+        self.assertLessEqual(resp2.call_count, HISTORY_PAGE_PREFETCH)
+
+    @responses.activate
+    def test_get_order_history_restricted_parse_fallback(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders._history_page_strainer = util.build_strainer("div.not-an-order-card")
+        year = 2010
+        start_index = 10
+        self.given_order_history_landing_exists()
+        resp = self.given_order_history_exists(year, start_index)
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index)
+
+        # THEN
+        self.assertEqual(1, resp.call_count)
+        self.assertEqual(2, len(orders))
+
+    @responses.activate
+    def test_get_order_history_range(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        resp1 = self.given_order_history_landing_exists()
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp2 = responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_HISTORY_URL}?timeFilter=year-2009",
+                body=f.read(),
+                status=200,
+            )
+        resp3 = self.given_order_history_exists(2010, 0)
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp4 = responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_HISTORY_URL}?timeFilter=year-2010"
+                "&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history_range(2009, 2010)
+
+        # THEN
+        self.assertEqual(14, len(orders))
+        # Each year is sorted by date, and the years are in order
+        dates_2009 = [o.order_placed_date for o in orders[:2]]
+        dates_2010 = [o.order_placed_date for o in orders[2:]]
+        self.assertEqual(sorted(dates_2009), dates_2009)
+        self.assertEqual(sorted(dates_2010), dates_2010)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(1, resp3.call_count)
+        self.assertEqual(1, resp4.call_count)
+
+    def test_get_order_history_range_invalid(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.amazon_orders.get_order_history_range(2020, 2019)
+
+    def test_iter_order_history_range_validated_eagerly(self):
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.amazon_orders.iter_order_history_range(2019, 2020)
+
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.amazon_orders.iter_order_history_range(2020, 2019)
+
+    @responses.activate
+    def test_get_order_history_range_requests_capped(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.config.update_config("max_workers", 2, save=False)
+        self.given_order_history_landing_exists()
+        bodies = {}
+        for name in ["order-history-2010-10.html", "order-details-114-9460922-7737063.html"]:
+            with open(os.path.join(self.RESOURCES_DIR, name), "r", encoding="utf-8") as f:
+                bodies[name] = f.read()
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def callback(name):
+            def counting_callback(request):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                time.sleep(0.02)
+                with lock:
+                    in_flight[0] -= 1
+                return 200, {}, bodies[name]
+            return counting_callback
+
+        resp = responses.add_callback(
+            responses.GET,
+            re.compile(f"{self.test_config.constants.ORDER_HISTORY_URL}\\?timeFilter=year-.*"),
+            callback=callback("order-history-2010-10.html"),
+        )
+        resp_details = responses.add_callback(
+            responses.GET,
+            re.compile(f"{self.test_config.constants.ORDER_DETAILS_URL}?.*"),
+            callback=callback("order-details-114-9460922-7737063.html"),
+        )
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history_range(2015, 2020, full_details=True)
+
+        # THEN
+        self.assertEqual(6 * 2, len(orders))
+        self.assertEqual(6, resp.call_count)
+        self.assertEqual(6 * 2, resp_details.call_count)
+        self.assertLessEqual(in_flight[1], 2)
+
+    @responses.activate
+    def test_iter_order_history_full_details_closed_early(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(2020, 40)
+        resp = self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+
+        # WHEN
+        orders = self.amazon_orders.iter_order_history(year=2020, start_index=40, full_details=True)
+        next(orders)
+        orders.close()
+
+        # THEN
+        # Only the Orders submitted ahead of the one yielded have their details fetched, not the whole page's 10
+        self.assertLessEqual(resp.call_count, self.test_config.max_workers + 1)
+
+    @responses.activate
+    def test_iter_order_history_range_closed_early(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.given_order_history_landing_exists()
+        resp = self.given_any_order_history_exists("order-history-2010-10.html")
+
+        # WHEN
+        orders = self.amazon_orders.iter_order_history_range(2001, 2020)
+        next(orders)
+        orders.close()
+
+        # THEN
+        # Only the years submitted ahead of the one yielded are fetched
+        self.assertLessEqual(resp.call_count, self.test_config.max_workers + 1)
+
     @responses.activate
     def test_get_order_history_full_details(self):
         # GIVEN
@@ -123,6 +405,50 @@ class TestOrders(UnitTestCase):
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(10, resp3.call_count)
 
+    @responses.activate
+    def test_get_order_history_full_details_detached(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2020
+        start_index = 40
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, start_index)
+        self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True,
+                                                      detach=True)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        for order in orders:
+            self.assertIsNone(order.parsed)
+            self.assertIsNone(order.recipient.parsed)
+            self.assertTrue(all(item.parsed is None for item in order.items))
+            self.assertTrue(all(shipment.parsed is None for shipment in order.shipments))
+            self.assertTrue(all(item.parsed is None for shipment in order.shipments for item in shipment.items))
+
+    @responses.activate
+    def test_get_order_history_full_details_preserves_order(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.test_config.update_config("max_workers", 5, save=False)
+        year = 2020
+        start_index = 40
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, start_index)
+        resp3 = self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+        history_orders = self.amazon_orders.get_order_history(year=year, start_index=start_index)
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+
+        # THEN
+        self.assertEqual([o.order_number for o in history_orders], [o.order_number for o in orders])
+        self.assertTrue(all(o.full_details for o in orders))
+        self.assertEqual(10, resp3.call_count)
+
     @responses.activate
     def test_get_order_history_multiple_items(self):
         # GIVEN
@@ -223,6 +549,95 @@ class TestOrders(UnitTestCase):
         # THEN
         self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
         self.assertEqual(1, resp1.call_count)
+        self.assertEqual({"div#orderDetails": 1},
+                         self.test_config.selector_stats.stats["ORDER_DETAILS_ENTITY_SELECTOR"])
+
+    @responses.activate
+    def test_get_order_detached(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.test_config.update_config("detach_entities", True, save=False)
+        order_id = "112-9685975-5907428"
+        with open(os.path.join(self.RESOURCES_DIR, f"order-details-{order_id}.html"), "r",
+                  encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID={order_id}",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        order = self.amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assertIsNone(order.parsed)
+        self.assertTrue(all(item.seller.parsed is None for item in order.items if item.seller))
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+
+    @responses.activate
+    def test_get_order_cached(self):
+        # GIVEN
+        self.test_config.update_config("cache_dir", os.path.join(os.path.dirname(self.test_config.cookie_jar_path),
+                                                                 "cache"), save=False)
+        self.amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=self.test_config)
+        self.amazon_orders = AmazonOrders(self.amazon_session)
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        with open(os.path.join(self.RESOURCES_DIR, f"order-details-{order_id}.html"), "r",
+                  encoding="utf-8") as f:
+            resp1 = responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID={order_id}",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        self.amazon_orders.get_order(order_id)
+        order = self.amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, self.amazon_session.response_cache.hits)
+        self.assertEqual(1, self.amazon_session.response_cache.misses)
+
+    @responses.activate
+    def test_get_order_cache_skips_redirect(self):
+        # GIVEN
+        self.test_config.update_config("cache_dir", os.path.join(os.path.dirname(self.test_config.cookie_jar_path),
+                                                                 "cache"), save=False)
+        self.amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=self.test_config)
+        self.amazon_orders = AmazonOrders(self.amazon_session)
+        self.amazon_session.is_authenticated = True
+        order_id = "1234-5678"
+        resp1 = responses.add(
+            responses.GET,
+            f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID={order_id}",
+            status=302,
+            headers={"Location": self.test_config.constants.SIGN_IN_REDIRECT_URL}
+        )
+        resp2 = responses.add(
+            responses.GET,
+            self.test_config.constants.SIGN_IN_REDIRECT_URL,
+            status=200,
+        )
+
+        # WHEN
+        for _ in range(2):
+            with self.assertRaises(AmazonOrdersNotFoundError):
+                self.amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assertEqual(2, resp1.call_count)
+        self.assertEqual(2, resp2.call_count)
+        self.assertEqual(0, self.amazon_session.response_cache.hits)
+        self.assertEqual(0, self.amazon_session.response_cache.size)
 
     @responses.activate
     def test_get_order_2024_data_component(self):
@@ -0,0 +1,147 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import os
+import pickle
+from unittest.mock import Mock, patch
+
+import responses
+
+from amazonorders import util
+from amazonorders.orders import AmazonOrders
+from amazonorders.pipeline import ParsePipeline, _dumps, _loads
+from amazonorders.session import AmazonSession
+from amazonorders.transactions import AmazonTransactions
+from tests.unittestcase import UnitTestCase
+
+
+class TestPipeline(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=self.test_config)
+        self.amazon_session.is_authenticated = True
+
+        self.pipeline = ParsePipeline(self.test_config, max_processes=2)
+        self.amazon_orders = AmazonOrders(self.amazon_session, pipeline=self.pipeline)
+        self.amazon_transactions = AmazonTransactions(self.amazon_session, pipeline=self.pipeline)
+
+    def tearDown(self):
+        self.pipeline.close()
+
+        super().tearDown()
+
+    def assert_detached(self, order):
+        self.assertIs(self.test_config, order.config)
+        self.assertIsNone(order.parsed)
+        self.assertTrue(all(item.parsed is None for item in order.items))
+        self.assertTrue(all(shipment.parsed is None for shipment in order.shipments))
+
+    @responses.activate
+    def test_get_order_history_paginated(self):
+        # GIVEN
+        year = 2010
+        self.given_order_history_landing_exists()
+        resp1 = self.given_order_history_exists(year, 0)
+        with open(os.path.join(self.RESOURCES_DIR, f"order-history-{year}-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp2 = responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_HISTORY_URL}?timeFilter=year-{year}"
+                "&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year)
+
+        # THEN
+        self.assertEqual(12, len(orders))
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        for order in orders:
+            self.assert_detached(order)
+
+    @responses.activate
+    def test_get_order_history_full_details(self):
+        # GIVEN
+        year = 2020
+        start_index = 40
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, start_index)
+        resp = self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual(10, resp.call_count)
+        for order in orders:
+            self.assert_detached(order)
+
+    @responses.activate
+    def test_get_order(self):
+        # GIVEN
+        order_id = "112-9685975-5907428"
+        with open(os.path.join(self.RESOURCES_DIR, f"order-details-{order_id}.html"), "r",
+                  encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                f"{self.test_config.constants.ORDER_DETAILS_URL}?orderID={order_id}",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        order = self.amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assert_detached(order)
+
+    @responses.activate
+    @patch("amazonorders.transactions.datetime", wraps=datetime)
+    def test_get_transactions(self, mock_get_today: Mock):
+        # GIVEN
+        mock_get_today.date.today.return_value = datetime.date(2024, 10, 11)
+        with open(os.path.join(self.RESOURCES_DIR, "get-transactions.html"), "r", encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                self.test_config.constants.TRANSACTION_HISTORY_LANDING_URL,
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        transactions = self.amazon_transactions.get_transactions(days=1)
+
+        # THEN
+        self.assertEqual(1, len(transactions))
+        self.assertIs(self.test_config, transactions[0].config)
+        self.assertIsNone(transactions[0].parsed)
+
+    def test_entities_pickled_without_config(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            parsed = util.parse_html(f.read())
+        order_details_tag = util.select_one(parsed, self.test_config.selectors.ORDER_DETAILS_ENTITY_SELECTOR)
+        order = self.test_config.order_cls(order_details_tag, self.test_config, full_details=True)
+        order.detach()
+
+        # WHEN
+        data = _dumps(order, self.test_config)
+        loaded_order = _loads(data, self.test_config)
+
+        # THEN
+        self.assertLess(len(data), len(pickle.dumps(order)))
+        self.assertNotIn(b"AmazonOrdersConfig", data)
+        self.assertIs(self.test_config, loaded_order.config)
+        self.assertIs(self.test_config, loaded_order.items[0].config)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(loaded_order, True)
@@ -0,0 +1,210 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import threading
+import time
+
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.pool import AmazonSessionPool
+from tests.unittestcase import UnitTestCase
+from tests.util.standinserver import StandInServer
+
+
+class TestPool(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.server = StandInServer()
+        self.server.start()
+
+        self.pool = AmazonSessionPool(self.test_config, max_workers=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+        super().tearDown()
+
+    def given_accounts(self, *names):
+        for name in names:
+            account = self.pool.add_account(name, f"{name}-username", "some-password")
+            self.server.configure(account.config)
+            account.amazon_session.is_authenticated = True
+
+    def test_get_order_history(self):
+        # GIVEN
+        self.given_accounts("account-1", "account-2", "account-3")
+        landing = self.server.add("GET", "/gp/css/order-history", "order-history-2023-10.html")
+        history = self.server.add("GET", "/your-orders/orders?timeFilter=year-2010", "order-history-2010-0.html")
+        next_page = self.server.add("GET", "/your-orders/orders?timeFilter=year-2010"
+                                           "&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                                    "order-history-2010-10.html")
+
+        # WHEN
+        orders = self.pool.get_order_history(year=2010)
+
+        # THEN
+        self.assertEqual(["account-1", "account-2", "account-3"], list(orders))
+        for account_orders in orders.values():
+            self.assertEqual(12, len(account_orders))
+        self.assertEqual(3, self.server.call_counts[landing])
+        self.assertEqual(3, self.server.call_counts[history])
+        self.assertEqual(3, self.server.call_counts[next_page])
+        stats = self.pool.stats
+        for name in orders:
+            self.assertEqual(1, stats[name]["jobs"])
+            self.assertEqual(12, stats[name]["entities"])
+            self.assertEqual(0, stats[name]["failed"])
+            self.assertGreater(stats[name]["throughput"], 0)
+
+    def test_isolated_cookie_jars(self):
+        # GIVEN
+        self.given_accounts("account-1", "account-2")
+        order_id = "112-9685975-5907428"
+        self.server.add("GET", f"/gp/your-account/order-details?orderID={order_id}",
+                        f"order-details-{order_id}.html",
+                        headers={"Set-Cookie": "session-token=some-token; Path=/"})
+
+        # WHEN
+        order = self.pool.submit_order("account-1", order_id).result()
+        self.pool.close()
+
+        # THEN
+        self.assertEqual(order_id, order.order_number)
+        account_1 = self.pool.accounts["account-1"].amazon_session
+        account_2 = self.pool.accounts["account-2"].amazon_session
+        self.assertNotEqual(account_1.config.cookie_jar_path, account_2.config.cookie_jar_path)
+        self.assertEqual(os.path.join(os.path.dirname(self.test_config.config_path), "accounts", "account-1",
+                                      "cookies.json"), account_1.config.cookie_jar_path)
+        self.assertEqual("some-token", account_1.session.cookies.get("session-token"))
+        self.assertIsNone(account_2.session.cookies.get("session-token"))
+        self.assertTrue(os.path.exists(account_1.config.cookie_jar_path))
+        self.assertFalse(os.path.exists(account_2.config.cookie_jar_path))
+
+    def test_shared_captcha_solver(self):
+        # GIVEN
+        self.given_accounts("account-1", "account-2")
+
+        # THEN
+        self.assertEqual(2, self.pool.captcha_solver.max_processes)
+        self.assertEqual("spawn", self.pool.captcha_solver.mp_context)
+        for account in self.pool.accounts.values():
+            self.assertIs(self.pool.captcha_solver, account.amazon_session.captcha_solver)
+
+    def test_fair_scheduling(self):
+        # GIVEN
+        self.pool.close()
+        self.pool = AmazonSessionPool(self.test_config, max_workers=1)
+        self.given_accounts("account-1", "account-2")
+        started = threading.Event()
+        release = threading.Event()
+        run_order = []
+
+        def job(account, block=False):
+            run_order.append(account.name)
+            if block:
+                started.set()
+                release.wait(5)
+
+        # WHEN
+        futures = [self.pool.submit("account-1", job, block=True)]
+        started.wait(5)
+        futures += [self.pool.submit("account-1", job), self.pool.submit("account-1", job),
+                    self.pool.submit("account-2", job)]
+        release.set()
+        for future in futures:
+            future.result()
+
+        # THEN
+        self.assertEqual(["account-1", "account-2", "account-1", "account-1"], run_order)
+        self.assertEqual(3, self.pool.stats["account-1"]["jobs"])
+        self.assertEqual(1, self.pool.stats["account-2"]["jobs"])
+
+    def test_concurrency_caps(self):
+        # GIVEN
+        self.given_accounts("account-1", "account-2", "account-3")
+        lock = threading.Lock()
+        running = {"total": 0}
+        max_running = {"total": 0}
+
+        def job(account):
+            with lock:
+                for key in ["total", account.name]:
+                    running[key] = running.get(key, 0) + 1
+                    max_running[key] = max(max_running.get(key, 0), running[key])
+            time.sleep(0.02)
+            with lock:
+                for key in ["total", account.name]:
+                    running[key] -= 1
+
+        # WHEN
+        futures = [self.pool.submit(name, job) for _ in range(3) for name in self.pool.accounts]
+        for future in futures:
+            future.result()
+
+        # THEN
+        self.assertEqual(2, max_running["total"])
+        for name in self.pool.accounts:
+            self.assertEqual(1, max_running[name])
+
+    def test_failed_job(self):
+        # GIVEN
+        self.given_accounts("account-1", "account-2")
+        self.pool.accounts["account-2"].amazon_session.is_authenticated = False
+        self.server.add("GET", "/cpe/yourpayments/transactions", "get-transactions.html")
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.pool.get_transactions(days=1)
+
+        # THEN
+        stats = self.pool.stats
+        self.assertEqual(1, stats["account-1"]["jobs"])
+        self.assertEqual(0, stats["account-1"]["failed"])
+        self.assertEqual(1, stats["account-2"]["jobs"])
+        self.assertEqual(1, stats["account-2"]["failed"])
+
+    def test_add_account_duplicate_name(self):
+        # GIVEN
+        self.given_accounts("account-1")
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.pool.add_account("account-1", "some-username", "some-password")
+
+    def test_close_with_cancelled_job(self):
+        # GIVEN
+        self.given_accounts("account-1")
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(account):
+            started.set()
+            release.wait()
+
+        running = self.pool.submit("account-1", block)
+        started.wait()
+        queued = self.pool.submit("account-1", lambda account: None)
+
+        # WHEN
+        self.assertTrue(queued.cancel())
+        errors = []
+
+        def close():
+            try:
+                self.pool.close()
+            except BaseException as e:
+                errors.append(e)
+
+        close_thread = threading.Thread(target=close)
+        close_thread.start()
+        time.sleep(0.1)
+        release.set()
+        close_thread.join()
+
+        # THEN
+        self.assertEqual([], errors)
+        self.assertIsNone(running.result())
+        self.assertTrue(queued.cancelled())
+        self.assertEqual(1, self.pool.stats["account-1"]["jobs"])
@@ -0,0 +1,79 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import pickle
+
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
+from amazonorders.selectorstats import SelectorStats
+from tests.unittestcase import UnitTestCase
+
+
+class TestSelectorStats(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.parsed = util.parse_html("<div class='order'><span>Order</span></div>"
+                                      "<div class='order'><span>Order</span></div>")
+
+    def test_select_records_stats(self):
+        # GIVEN
+        selector_stats = SelectorStats(self.test_config.selectors)
+        selector = self.test_config.selectors.ORDER_HISTORY_ENTITY_SELECTOR
+
+        # WHEN
+        tags = util.select(self.parsed, selector, selector_stats)
+        tag = util.select_one(self.parsed, selector, selector_stats)
+
+        # THEN
+        self.assertEqual(2, len(tags))
+        self.assertEqual(tags[0], tag)
+        self.assertEqual({"ORDER_HISTORY_ENTITY_SELECTOR": {"div.order": 2}}, selector_stats.stats)
+        self.assertEqual(selector, selector_stats.order(selector))
+
+    def test_order_adaptive(self):
+        # GIVEN
+        selector_stats = SelectorStats(self.test_config.selectors, adaptive=True)
+        selector = ["div.order-card", "div.order", "div.other"]
+
+        # WHEN
+        self.assertEqual(selector, selector_stats.order(selector))
+        util.select(self.parsed, selector, selector_stats)
+
+        # THEN
+        self.assertEqual(["div.order", "div.order-card", "div.other"], selector_stats.order(selector))
+        self.assertEqual({"div.order-card | div.order | div.other": {"div.order": 1}}, selector_stats.stats)
+
+    def test_persisted(self):
+        # GIVEN
+        config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                    data={"adaptive_selectors": True,
+                                          "persist_selector_stats": True})
+        stats_path = os.path.join(os.path.dirname(config.config_path), "config.selector-stats.json")
+        self.assertEqual(stats_path, config.selector_stats.stats_path)
+        selector = config.selectors.ORDER_HISTORY_ENTITY_SELECTOR
+
+        # WHEN
+        util.select(self.parsed, selector, config.selector_stats)
+        config.selector_stats.save()
+        reloaded_config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                             data={"adaptive_selectors": True,
+                                                   "persist_selector_stats": True})
+
+        # THEN
+        self.assertTrue(os.path.exists(stats_path))
+        self.assertEqual({"ORDER_HISTORY_ENTITY_SELECTOR": {"div.order": 1}}, reloaded_config.selector_stats.stats)
+        self.assertEqual(["div.order", "div.order-card"], reloaded_config.selector_stats.order(selector))
+
+    def test_pickle(self):
+        # GIVEN
+        selector_stats = SelectorStats(self.test_config.selectors)
+        selector_stats.record(self.test_config.selectors.ORDER_HISTORY_ENTITY_SELECTOR,
+                              self.test_config.selectors.ORDER_HISTORY_ENTITY_SELECTOR[1])
+
+        # WHEN
+        unpickled = pickle.loads(pickle.dumps(selector_stats))
+
+        # THEN
+        self.assertEqual(selector_stats.stats, unpickled.stats)
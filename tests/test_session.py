@@ -9,6 +9,8 @@ from unittest.mock import patch
 import responses
 from responses.matchers import query_string_matcher, urlencoded_params_matcher
 
+from amazonorders import util
+from amazonorders.conf import AmazonOrdersConfig
 from amazonorders.exception import AmazonOrdersAuthError
 from amazonorders.session import AmazonSession
 from tests.unittestcase import UnitTestCase
@@ -338,7 +340,7 @@ class TestSession(UnitTestCase):
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(1, resp3.call_count)
-        self.assertEqual(2, resp4.call_count)
+        self.assertEqual(1, resp4.call_count)
         self.assertEqual(1, resp5.call_count)
 
     @responses.activate
@@ -376,3 +378,177 @@ class TestSession(UnitTestCase):
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(1, resp3.call_count)
+
+    @responses.activate
+    def test_last_response_parsed_lazy(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "signin.html"), "r", encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                self.test_config.constants.SIGN_IN_URL,
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        with patch("amazonorders.util.parse_html", wraps=util.parse_html) as parse_html_mock:
+            self.amazon_session.get(self.test_config.constants.SIGN_IN_URL)
+
+            # THEN
+            self.assertEqual(0, parse_html_mock.call_count)
+
+            parsed = self.amazon_session.last_response_parsed
+
+            self.assertEqual(1, parse_html_mock.call_count)
+            self.assertIs(parsed, self.amazon_session.last_response_parsed)
+            self.assertEqual(1, parse_html_mock.call_count)
+            self.assertIsNotNone(util.select_one(parsed, self.test_config.selectors.SIGN_IN_FORM_SELECTOR))
+
+    @responses.activate
+    def test_cookies_persisted_only_when_changed(self):
+        # GIVEN
+        responses.add(
+            responses.GET,
+            self.test_config.constants.SIGN_IN_URL,
+            status=200,
+            headers={"Set-Cookie": "session-token=some-token; Domain=.amazon.com; Path=/"}
+        )
+
+        # WHEN
+        self.amazon_session.get(self.test_config.constants.SIGN_IN_URL)
+        self.amazon_session.get(self.test_config.constants.SIGN_IN_URL)
+
+        # THEN
+        self.assertEqual(1, self.amazon_session.cookie_store.write_count)
+        self.assertTrue(os.path.exists(self.test_config.cookie_jar_path))
+
+    @responses.activate
+    def test_login_skipped_when_fresh(self):
+        # GIVEN
+        config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                    data={"output_dir": self.test_config.output_dir,
+                                          "cookie_jar_path": self.test_config.cookie_jar_path,
+                                          "session_freshness": 3600})
+        self.given_login_responses_success()
+        amazon_session = AmazonSession("some-username",
+                                       "some-password",
+                                       config=config)
+        amazon_session.session.cookies.set("session-token", "some-token", domain=".amazon.com")
+        amazon_session.session.cookies.set("x-main", "some-main", domain=".amazon.com")
+        amazon_session.login()
+        amazon_session.cookie_store.save(amazon_session.session.cookies)
+        self.assertEqual(1, self.signin_response.call_count)
+
+        # WHEN
+        warm_amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=config)
+        warm_amazon_session.login()
+
+        # THEN
+        self.assertTrue(warm_amazon_session.is_authenticated)
+        self.assertEqual(1, self.signin_response.call_count)
+
+    @responses.activate
+    def test_revalidate_when_redirected_to_sign_in(self):
+        # GIVEN
+        config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                    data={"output_dir": self.test_config.output_dir,
+                                          "cookie_jar_path": self.test_config.cookie_jar_path,
+                                          "session_freshness": 3600})
+        amazon_session = AmazonSession("some-username",
+                                       "some-password",
+                                       config=config)
+        amazon_session.session.cookies.set("session-token", "stale-token", domain=".amazon.com")
+        amazon_session.session.cookies.set("x-main", "stale-main", domain=".amazon.com")
+        amazon_session.session_state.mark_validated()
+        amazon_session.login()
+        self.assertTrue(amazon_session.is_authenticated)
+        self.given_login_responses_success()
+        with open(os.path.join(self.RESOURCES_DIR, "signin.html"), "r", encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                config.constants.SIGN_IN_REDIRECT_URL,
+                body=f.read(),
+                status=200,
+            )
+        sign_out_response = responses.add(responses.GET, config.constants.SIGN_OUT_URL, status=200)
+        order_history_url = f"{config.constants.ORDER_HISTORY_URL}?timeFilter=year-2018"
+        redirect_response = responses.add(
+            responses.GET,
+            order_history_url,
+            status=302,
+            headers={"Location": config.constants.SIGN_IN_REDIRECT_URL}
+        )
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2018-0.html"), "r", encoding="utf-8") as f:
+            order_history_response = responses.add(
+                responses.GET,
+                order_history_url,
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        response = amazon_session.get(order_history_url)
+
+        # THEN
+        self.assertEqual(order_history_url, response.url)
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(amazon_session.is_authenticated)
+        self.assertTrue(amazon_session.session_state.is_fresh())
+        self.assertEqual(1, redirect_response.call_count)
+        self.assertEqual(1, order_history_response.call_count)
+        self.assertEqual(1, sign_out_response.call_count)
+        self.assert_login_responses_success()
+
+    @responses.activate
+    def test_revalidate_uses_cookies_refreshed_by_peer(self):
+        # GIVEN
+        config = AmazonOrdersConfig(config_path=self.test_config.config_path,
+                                    data={"output_dir": self.test_config.output_dir,
+                                          "cookie_jar_path": self.test_config.cookie_jar_path,
+                                          "session_freshness": 3600})
+        amazon_session = AmazonSession("some-username",
+                                       "some-password",
+                                       config=config)
+        amazon_session.session.cookies.set("session-token", "stale-token", domain=".amazon.com")
+        amazon_session.session.cookies.set("x-main", "stale-main", domain=".amazon.com")
+        amazon_session.cookie_store.save(amazon_session.session.cookies)
+        amazon_session.session_state.mark_validated()
+        amazon_session.login()
+        peer_amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=config)
+        peer_amazon_session.session.cookies.set("session-token", "new-token", domain=".amazon.com")
+        peer_amazon_session.session.cookies.set("x-main", "new-main", domain=".amazon.com")
+        peer_amazon_session.cookie_store.save(peer_amazon_session.session.cookies)
+        self.given_login_responses_success()
+        responses.add(responses.GET, config.constants.SIGN_IN_REDIRECT_URL, status=200)
+        sign_out_response = responses.add(responses.GET, config.constants.SIGN_OUT_URL, status=200)
+        order_history_url = f"{config.constants.ORDER_HISTORY_URL}?timeFilter=year-2018"
+        redirect_response = responses.add(
+            responses.GET,
+            order_history_url,
+            status=302,
+            headers={"Location": config.constants.SIGN_IN_REDIRECT_URL}
+        )
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2018-0.html"), "r", encoding="utf-8") as f:
+            order_history_response = responses.add(
+                responses.GET,
+                order_history_url,
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        response = amazon_session.get(order_history_url)
+
+        # THEN
+        self.assertEqual(order_history_url, response.url)
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(amazon_session.is_authenticated)
+        self.assertEqual("new-token", amazon_session.session.cookies.get("session-token"))
+        self.assertEqual(1, redirect_response.call_count)
+        self.assertEqual(1, order_history_response.call_count)
+        self.assertEqual(0, sign_out_response.call_count)
+        self.assertEqual(0, self.signin_response.call_count)
@@ -0,0 +1,78 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+from unittest.mock import patch
+
+from amazonorders.sessionstate import SessionState
+from tests.unittestcase import UnitTestCase
+
+
+class TestSessionState(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.state_path = os.path.join(os.path.dirname(self.test_config.cookie_jar_path), "cookies.session-state.json")
+        self.landing_url = self.test_config.constants.ORDER_HISTORY_LANDING_URL
+
+    def test_fresh(self):
+        # GIVEN
+        session_state = SessionState(self.state_path, freshness=60, username="some-username")
+        self.assertFalse(session_state.is_fresh())
+
+        # WHEN
+        session_state.mark_visited(self.landing_url)
+
+        # THEN
+        self.assertFalse(session_state.was_visited(self.landing_url))
+
+        # WHEN
+        session_state.mark_validated()
+        session_state.mark_visited(self.landing_url)
+
+        # THEN
+        self.assertTrue(session_state.is_fresh())
+        self.assertTrue(session_state.was_visited(self.landing_url))
+        self.assertFalse(session_state.was_visited(self.test_config.constants.TRANSACTION_HISTORY_LANDING_URL))
+
+        # WHEN
+        with patch("amazonorders.sessionstate.time.time", return_value=session_state.validated_at + 61):
+            # THEN
+            self.assertFalse(session_state.is_fresh())
+            self.assertFalse(session_state.was_visited(self.landing_url))
+
+        # WHEN
+        session_state.invalidate()
+
+        # THEN
+        self.assertFalse(session_state.is_fresh())
+        self.assertEqual({}, session_state.visited)
+
+    def test_persisted(self):
+        # GIVEN
+        session_state = SessionState(self.state_path, freshness=60, username="some-username")
+
+        # WHEN
+        session_state.mark_validated()
+        session_state.mark_visited(self.landing_url)
+
+        # THEN
+        self.assertTrue(os.path.exists(self.state_path))
+        reloaded_session_state = SessionState(self.state_path, freshness=60, username="some-username")
+        self.assertTrue(reloaded_session_state.is_fresh())
+        self.assertTrue(reloaded_session_state.was_visited(self.landing_url))
+        other_user_session_state = SessionState(self.state_path, freshness=60, username="other-username")
+        self.assertFalse(other_user_session_state.is_fresh())
+
+    def test_disabled(self):
+        # GIVEN
+        session_state = SessionState(self.state_path, username="some-username")
+
+        # WHEN
+        session_state.mark_validated()
+        session_state.mark_visited(self.landing_url)
+
+        # THEN
+        self.assertFalse(session_state.is_fresh())
+        self.assertFalse(session_state.was_visited(self.landing_url))
+        self.assertFalse(os.path.exists(self.state_path))
@@ -0,0 +1,182 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import os
+import sqlite3
+from decimal import Decimal
+
+from bs4 import BeautifulSoup
+
+import responses
+
+from amazonorders.currency import CurrencyParser
+from amazonorders.entity.transaction import Transaction
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.orders import AmazonOrders, HISTORY_PAGE_PREFETCH
+from amazonorders.session import AmazonSession
+from amazonorders.store import OrderStore
+from tests.unittestcase import UnitTestCase
+
+
+class TestStore(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.amazon_session = AmazonSession("some-username",
+                                            "some-password",
+                                            config=self.test_config)
+        self.amazon_orders = AmazonOrders(self.amazon_session)
+        self.store_path = os.path.join(os.path.dirname(self.test_config.cookie_jar_path), "orders.db")
+        self.order_store = OrderStore(self.store_path)
+
+    def tearDown(self):
+        self.order_store.close()
+
+        super().tearDown()
+
+    def count_rows(self, table):
+        with sqlite3.connect(self.store_path) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    @responses.activate
+    def test_save_orders(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(2010, 0)
+        orders = self.amazon_orders.get_order_history(year=2010, start_index=0)
+
+        # WHEN
+        self.order_store.save_orders(orders)
+        self.order_store.save_orders(orders)
+
+        # THEN
+        self.assertEqual(10, self.order_store.order_count())
+        self.assertEqual(10, self.count_rows("orders"))
+        self.assertEqual(sum(len(o.shipments) for o in orders), self.count_rows("shipments"))
+        self.assertEqual(sum(len(o.items) for o in orders), self.count_rows("items"))
+        self.assertEqual(len([o for o in orders if o.recipient]), self.count_rows("recipients"))
+        self.assertTrue(self.order_store.has_order(orders[0].order_number))
+        self.assertFalse(self.order_store.has_order("some-order-number"))
+        self.assertEqual(max(o.order_placed_date for o in orders), self.order_store.latest_order_placed_date())
+
+    @responses.activate
+    def test_save_orders_decimal_currency(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.test_config.currency_parser = CurrencyParser(use_decimal=True)
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(2010, 0)
+        orders = self.amazon_orders.get_order_history(year=2010, start_index=0)
+
+        # WHEN
+        self.order_store.save_orders(orders)
+
+        # THEN
+        self.assertIsInstance(orders[0].grand_total, Decimal)
+        with sqlite3.connect(self.store_path) as connection:
+            grand_total = connection.execute("SELECT grand_total FROM orders WHERE order_number = ?",
+                                             (orders[0].order_number,)).fetchone()[0]
+        self.assertEqual(float(orders[0].grand_total), grand_total)
+
+    def test_save_transactions(self):
+        # GIVEN
+        html = """
+<div class="a-section a-spacing-base apx-transactions-line-item-component-container">
+    <div class="a-row pmts-portal-component">
+        <div class="a-column a-span3 a-text-right a-span-last">
+            <span class="a-size-base-plus a-text-bold">-$12.34</span>
+        </div>
+    </div>
+    <div class="a-section a-spacing-none a-spacing-top-mini pmts-portal-component">
+        <div class="a-row">
+            <div class="a-column a-span12">
+                <a class="a-link-normal" href="https://www.amazon.com/gp/css/summary/edit.html?orderID=123-4567890-1234567">Order #123-4567890-1234567</a>
+            </div>
+        </div>
+    </div>
+</div>
+"""  # noqa
+        # Without a payment method, which is NULL in the store
+        transaction = Transaction(BeautifulSoup(html, "html.parser"), self.test_config, datetime.date(2024, 1, 1))
+        self.assertIsNone(transaction.payment_method)
+
+        # WHEN
+        self.order_store.save_transactions([transaction])
+        self.order_store.save_transactions([transaction])
+
+        # THEN
+        self.assertEqual(1, self.count_rows("transactions"))
+
+    @responses.activate
+    def test_sync(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = datetime.date.today().year
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_any_order_history_exists("order-history-2010-0.html")
+
+        # WHEN
+        new_orders = self.order_store.sync(self.amazon_orders, earliest_year=year)
+
+        # THEN
+        # The second page returns the same Orders as the first, so the sync stops there, having only fetched the
+        # pages prefetched while the first was checked
+        self.assertEqual(10, len(new_orders))
+        self.assertEqual(10, self.order_store.order_count())
+        self.assertEqual(1, resp1.call_count)
+        first_sync_call_count = resp2.call_count
+        self.assertLessEqual(first_sync_call_count, 1 + HISTORY_PAGE_PREFETCH)
+
+        # WHEN
+        new_orders = self.order_store.sync(self.amazon_orders)
+
+        # THEN
+        self.assertEqual(0, len(new_orders))
+        self.assertEqual(10, self.order_store.order_count())
+        self.assertEqual(2, resp1.call_count)
+        self.assertLessEqual(resp2.call_count, first_sync_call_count + 1 + HISTORY_PAGE_PREFETCH)
+
+    @responses.activate
+    def test_sync_full_details(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = datetime.date.today().year
+        self.given_order_history_landing_exists()
+        self.given_any_order_history_exists("order-history-2010-10.html")
+        resp = self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+
+        # WHEN
+        new_orders = self.order_store.sync(self.amazon_orders, earliest_year=year, full_details=True)
+
+        # THEN
+        self.assertEqual(2, len(new_orders))
+        self.assertTrue(all(o.full_details for o in new_orders))
+        self.assertIsNotNone(new_orders[0].payment_method)
+        self.assertEqual(2, self.order_store.order_count())
+        self.assertEqual(2, resp.call_count)
+
+    @responses.activate
+    def test_sync_reaches_earliest_year(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = datetime.date.today().year
+        self.given_order_history_landing_exists()
+        resp1 = self.given_any_order_history_exists("order-history-2010-10.html")
+
+        # WHEN
+        new_orders = self.order_store.sync(self.amazon_orders, earliest_year=year - 1)
+
+        # THEN
+        # The two Orders on the page are new the first year, and known the next
+        self.assertEqual(2, len(new_orders))
+        self.assertEqual(2, resp1.call_count)
+
+    def test_sync_invalid(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.order_store.sync(self.amazon_orders, earliest_year=datetime.date.today().year + 1)
@@ -0,0 +1,156 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+from unittest.mock import patch
+
+import responses
+from requests.exceptions import ConnectionError
+
+from amazonorders.transport import RateLimiter, Transport
+from tests.unittestcase import UnitTestCase
+
+
+class TestTransport(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.test_config.update_config("retry_backoff", 0, save=False)
+
+        self.transport = Transport(self.test_config)
+        self.session = self.transport.create_session()
+        self.url = f"{self.test_config.constants.BASE_URL}/some-page"
+
+    def test_create_session(self):
+        # WHEN
+        adapter = self.session.get_adapter(self.url)
+
+        # THEN
+        self.assertEqual(self.test_config.max_workers, adapter._pool_connections)
+        self.assertEqual(self.test_config.max_workers, adapter._pool_maxsize)
+        self.assertIs(adapter, self.session.get_adapter("http://www.amazon.com"))
+
+    @responses.activate
+    def test_request_retries_server_error(self):
+        # GIVEN
+        resp1 = responses.add(responses.GET, self.url, status=503)
+        resp2 = responses.add(responses.GET, self.url, status=200)
+
+        # WHEN
+        with patch.object(self.session, "request", wraps=self.session.request) as mock_request:
+            response = self.transport.request(self.session, "GET", self.url)
+
+        # THEN
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(1, self.transport.retries)
+        self.assertEqual((self.test_config.connect_timeout, self.test_config.read_timeout),
+                         mock_request.call_args.kwargs["timeout"])
+
+    @responses.activate
+    def test_request_gives_up_after_max_retries(self):
+        # GIVEN
+        resp = responses.add(responses.GET, self.url, status=500)
+
+        # WHEN
+        response = self.transport.request(self.session, "GET", self.url)
+
+        # THEN
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(self.test_config.max_retries + 1, resp.call_count)
+        self.assertEqual(self.test_config.max_retries, self.transport.retries)
+
+    @responses.activate
+    def test_request_post_not_retried(self):
+        # GIVEN
+        resp = responses.add(responses.POST, self.url, status=503)
+
+        # WHEN
+        response = self.transport.request(self.session, "POST", self.url)
+
+        # THEN
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(1, resp.call_count)
+        self.assertEqual(0, self.transport.retries)
+
+    @responses.activate
+    def test_request_retries_connection_error(self):
+        # GIVEN
+        resp1 = responses.add(responses.GET, self.url, body=ConnectionError())
+        resp2 = responses.add(responses.GET, self.url, status=200)
+
+        # WHEN
+        response = self.transport.request(self.session, "GET", self.url)
+
+        # THEN
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+
+    @responses.activate
+    def test_request_rate_limited(self):
+        # GIVEN
+        self.test_config.update_config("rate_limit", 5, save=False)
+        transport = Transport(self.test_config)
+        responses.add(responses.GET, self.url, status=503)
+        responses.add(responses.GET, self.url, status=200)
+
+        # WHEN
+        with patch("amazonorders.transport.time.sleep"):
+            transport.request(self.session, "GET", self.url)
+
+        # THEN
+        metrics = transport.metrics
+        self.assertEqual(2, metrics["requests"])
+        self.assertEqual(1, metrics["throttle_events"])
+        self.assertEqual(1, metrics["retries"])
+
+    def test_get_retry_delay(self):
+        # GIVEN
+        self.test_config.update_config("retry_backoff", 1, save=False)
+
+        # WHEN
+        delays = [self.transport.get_retry_delay(3) for _ in range(20)]
+        retry_after_delay = self.transport.get_retry_delay(0, "5")
+        capped_delay = self.transport.get_retry_delay(0, "3600")
+
+        # THEN
+        self.assertTrue(all(0 <= delay <= 8 for delay in delays))
+        self.assertGreaterEqual(retry_after_delay, 5)
+        self.assertEqual(60, capped_delay)
+
+
+class TestRateLimiter(UnitTestCase):
+    def test_record_adapts_rate(self):
+        # GIVEN
+        rate_limiter = RateLimiter(4, min_rate=1, max_rate=8, increase=1)
+
+        # WHEN
+        rate_limiter.record(200, 0.1)
+        rate_limiter.record(200, 0.1)
+        increased_rate = rate_limiter.rate
+        rate_limiter.record(503, 0.1)
+        decreased_rate = rate_limiter.rate
+        rate_limiter.record(200, 60)
+        rate_limiter.record(429, 0.1)
+        rate_limiter.record(429, 0.1)
+
+        # THEN
+        self.assertEqual(6, increased_rate)
+        self.assertEqual(3, decreased_rate)
+        self.assertEqual(1, rate_limiter.rate)
+        self.assertEqual(6, rate_limiter.requests)
+        self.assertEqual(4, rate_limiter.throttle_events)
+
+    def test_reserve(self):
+        # GIVEN
+        rate_limiter = RateLimiter(2)
+
+        # WHEN
+        delays = [rate_limiter.reserve() for _ in range(3)]
+
+        # THEN
+        self.assertEqual(0, delays[0])
+        self.assertAlmostEqual(0.5, delays[1], places=1)
+        self.assertAlmostEqual(1.0, delays[2], places=1)
+        self.assertAlmostEqual(1.5, rate_limiter.metrics["wait_time"], places=1)
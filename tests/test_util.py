@@ -1,6 +1,11 @@
 __copyright__ = "Copyright (c) 2024 Jeff Sawatzky"
 __license__ = "MIT"
 
+import os
+from unittest.mock import patch
+
+from amazonorders import util
+from amazonorders.exception import AmazonOrdersError
 from amazonorders.util import to_type
 from tests.unittestcase import UnitTestCase
 
@@ -22,3 +27,86 @@ class TestSession(UnitTestCase):
         self.assertEqual(to_type(""), None)
         self.assertEqual(to_type(" "), " ")
         self.assertEqual(to_type("None"), "None")
+
+    def test_get_bs4_parser(self):
+        self.assertEqual(util.get_bs4_parser(None), "html.parser")
+        self.assertEqual(util.get_bs4_parser("html.parser"), "html.parser")
+        self.assertEqual(util.get_bs4_parser("not-a-parser"), "html.parser")
+
+    def test_parse_html_fallback(self):
+        # WHEN
+        parsed = util.parse_html("<div class='order-card'><span>Order</span></div>", "not-a-parser")
+
+        # THEN
+        self.assertEqual("Order", util.select_one(parsed, ["div.order", "div.order-card"]).text)
+
+    def test_compile_selector(self):
+        # GIVEN
+        parsed = util.parse_html("<div><span class='a'>1</span><span class='b'>2</span></div>")
+
+        # WHEN
+        compiled = util.compile_selector("span.b")
+
+        # THEN
+        self.assertIs(compiled, util.compile_selector("span.b"))
+        self.assertEqual("2", compiled.select_one(parsed).text)
+        self.assertEqual("2", util.select_one(parsed, ["span.c", "span.b"]).text)
+        self.assertEqual(["1", "2"], [t.text for t in util.select(parsed, ["span.c", "span"])])
+
+    def test_compile_selectors(self):
+        # WHEN
+        compiled_selectors = util.compile_selectors(self.test_config.selectors)
+
+        # THEN
+        self.assertEqual(len(self.test_config.selectors.FIELD_ORDER_NUMBER_SELECTOR),
+                         len(compiled_selectors["FIELD_ORDER_NUMBER_SELECTOR"]))
+        self.assertIs(util.compile_selector(self.test_config.selectors.NEXT_PAGE_LINK_SELECTOR),
+                      compiled_selectors["NEXT_PAGE_LINK_SELECTOR"][0])
+        self.assertNotIn("MFA_DEVICE_SELECT_INPUT_SELECTOR_VALUE", compiled_selectors)
+
+    def test_compile_selectors_invalid(self):
+        # GIVEN
+        class InvalidSelectors:
+            FIELD_INVALID_SELECTOR = ["div", "div["]
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            util.compile_selectors(InvalidSelectors())
+
+    def test_build_strainer(self):
+        # GIVEN
+        markup = ("<div class='header'><span class='num-orders'>2 orders</span></div>"
+                  "<div class='a-box order-card'><span>Order</span></div>"
+                  "<ul class='a-pagination'><li class='a-last'><a href='/next'>Next</a></li></ul>")
+
+        # WHEN
+        strainer = util.build_strainer(["div.order-card", "div.order"], "ul.a-pagination li.a-last a")
+        parsed = util.parse_html(markup, parse_only=strainer)
+
+        # THEN
+        self.assertEqual("Order", util.select_one(parsed, "div.order-card").text)
+        self.assertEqual("/next", util.select_one(parsed, "ul.a-pagination li.a-last a")["href"])
+        self.assertIsNone(util.select_one(parsed, "div.header"))
+        self.assertIsNone(util.build_strainer("div.order-card", "[data-component='orderCard']"))
+
+    def test_atomic_write(self):
+        # GIVEN
+        path = os.path.join(self.test_config.output_dir, "some-file.json")
+        util.atomic_write(path, "old")
+
+        # WHEN
+        with patch("os.replace", side_effect=OSError("replace failed")):
+            with self.assertRaises(OSError):
+                util.atomic_write(path, "new")
+
+        # THEN
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual("old", f.read())
+        self.assertEqual(["some-file.json"], os.listdir(self.test_config.output_dir))
+
+        # WHEN
+        util.atomic_write(path, "new")
+
+        # THEN
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual("new", f.read())
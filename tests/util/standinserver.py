@@ -0,0 +1,110 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+RESOURCES_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "resources"))
+
+AMAZON_BASE_URL = b"https://www.amazon.com"
+
+
+class StandInServer:
+    """
+    A local HTTP server that stands in for Amazon, serving the HTML in ``tests/resources`` for registered routes, so
+    clients that don't go through ``requests`` (and so can't be mocked with ``responses``) can be tested.
+
+    A route is matched on its method, path, and query string. A route registered without a query string matches
+    any query string for that path, and a path ending in ``*`` matches any path with that prefix. Absolute links to
+    Amazon in served pages are rewritten to point at this server.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.call_counts = {}
+        self.request_headers = {}
+        self.server = None
+        self.server_thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, method, path, resource=None, status=200, headers=None):
+        split = urlsplit(path)
+        key = (method, split.path, split.query or None)
+        self.routes[key] = (resource, status, headers or {})
+        self.call_counts[key] = 0
+        self.request_headers[key] = []
+        return key
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                stand_in._handle(self, "GET")
+
+            def do_POST(self):  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                stand_in._handle(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def configure(self, config):
+        """
+        Point all of the URLs on the given config's ``constants`` at this server.
+        """
+        real_base_url = config.constants.BASE_URL
+        for name in dir(config.constants):
+            value = getattr(config.constants, name)
+            if name.isupper() and isinstance(value, str) and value.startswith(real_base_url):
+                setattr(config.constants, name, value.replace(real_base_url, self.base_url, 1))
+
+    def _handle(self, handler, method):
+        split = urlsplit(handler.path)
+        key = (method, split.path, split.query or None)
+        if key not in self.routes:
+            key = (method, split.path, None)
+        if key not in self.routes:
+            for route in self.routes:
+                if route[0] == method and route[1].endswith("*") and split.path.startswith(route[1][:-1]):
+                    key = route
+                    break
+
+        if key not in self.routes:
+            handler.send_response(404)
+            handler.end_headers()
+            return
+
+        with self._lock:
+            self.call_counts[key] += 1
+            self.request_headers[key].append(dict(handler.headers))
+
+        resource, status, headers = self.routes[key]
+        body = b""
+        if resource:
+            with open(os.path.join(RESOURCES_DIR, resource), "rb") as f:
+                body = f.read().replace(AMAZON_BASE_URL, self.base_url.encode("utf-8"))
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        for header, value in headers.items():
+            handler.send_header(header, value)
+        handler.end_headers()
+        handler.wfile.write(body)